@@ -0,0 +1,221 @@
+"""
+async_engine.py — asyncio load engine for high-concurrency small-object runs (ENGINE=async).
+
+One process keeps CONCURRENCY PUT/GET/DELETE loops in flight over a small
+HTTP/1.1 keep-alive client built on asyncio streams, with requests signed
+locally by sigv4.Signer. Results come back as the same per-worker objects
+benchmark.py reports for the threaded engine. uvloop is used if installed.
+"""
+
+import asyncio
+import resource
+import socket
+from collections import deque
+
+from histogram import now_ns
+from sigv4 import Signer, encode_path, encode_query
+
+READ_CHUNK = 256 * 1024
+WRITE_CHUNK = 1024 * 1024
+
+class S3ResponseError(Exception):
+    def __init__(self, method, path, status, body):
+        super().__init__(f"{method} {path} -> HTTP {status}: {body[:200]!r}")
+        self.status = status
+
+class AsyncS3Client:
+    def __init__(self, endpoint, access_key, secret_key, region="us-east-1", stats=None):
+        host, _, port = endpoint.partition(":")
+        self.host = host
+        self.port = int(port or 80)
+        self.netloc = endpoint
+        self.signer = Signer(access_key, secret_key, region)
+        self._idle = deque()
+        self.connections_opened = 0
+        # connpool.ConnStats: cuenta peticiones/connects; en modo "fresh" no se reutilizan conexiones
+        self.stats = stats
+        self.keepalive = stats is None or stats.mode == "keepalive"
+
+    async def _acquire(self, fresh=False):
+        """(reader, writer, reutilizada). `fresh` salta las conexiones ociosas."""
+        while self._idle and not fresh:
+            reader, writer = self._idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        self.connections_opened += 1
+        start = now_ns()
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        if self.stats is not None:
+            self.stats.connected(now_ns() - start)
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return reader, writer, False
+
+    async def request(self, method, bucket, key="", body=None, body_len=0, query=None):
+        """Envía una petición y vacía la respuesta.
+
+        Devuelve (status, bytes de cuerpo recibidos, timestamp del primer byte).
+        `body` puede ser un memoryview que se repite hasta completar `body_len`.
+        """
+        path = encode_path(bucket, key)
+        headers = {"content-length": body_len} if body is not None else {}
+        signed = self.signer.sign(method, self.netloc, path, query, headers)
+        # La misma codificación que firmó sigv4: si difieren, el servidor rechaza la firma
+        target = path + ("?" + encode_query(query) if query else "")
+        head = f"{method} {target} HTTP/1.1\r\n" + "".join(f"{k}: {v}\r\n" for k, v in signed.items()) + "\r\n"
+
+        reader, writer, reused = await self._acquire()
+        try:
+            status, nbytes, first_byte, err_body = await self._exchange(reader, writer, head, body, body_len)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # El servidor pudo cerrar la conexión keep-alive mientras estaba ociosa: un reintento en una nueva
+            if not reused:
+                raise
+            reader, writer, _ = await self._acquire(fresh=True)
+            status, nbytes, first_byte, err_body = await self._exchange(reader, writer, head, body, body_len)
+        if status >= 300 and not (method == "DELETE" and status == 404):
+            raise S3ResponseError(method, target, status, err_body)
+        return status, nbytes, first_byte
+
+    async def _exchange(self, reader, writer, head, body, body_len):
+        if self.stats is not None:
+            self.stats.request()
+        reusable = False
+        try:
+            writer.write(head.encode("latin-1"))
+            if body is not None:
+                sent = 0
+                while sent < body_len:
+                    n = min(body_len - sent, len(body), WRITE_CHUNK)
+                    writer.write(body[:n])
+                    sent += n
+                    await writer.drain()
+            else:
+                await writer.drain()
+
+            status, resp_headers = await _read_head(reader)
+            first_byte = now_ns()
+            keep_error = status >= 300
+            if resp_headers.get("transfer-encoding", "").lower() == "chunked":
+                nbytes, err_body = await _read_chunked(reader, keep_error)
+            else:
+                nbytes, err_body = await _read_exact(reader, int(resp_headers.get("content-length", 0)), keep_error)
+            reusable = self.keepalive and resp_headers.get("connection", "").lower() != "close"
+        finally:
+            if reusable:
+                self._idle.append((reader, writer))
+            else:
+                writer.close()
+        return status, nbytes, first_byte, err_body
+
+    async def put_object(self, bucket, key, view, size):
+        return await self.request("PUT", bucket, key, body=view, body_len=size)
+
+    async def get_object(self, bucket, key):
+        return await self.request("GET", bucket, key)
+
+    async def remove_object(self, bucket, key):
+        return await self.request("DELETE", bucket, key)
+
+    async def close(self):
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+async def _read_head(reader):
+    raw = await reader.readuntil(b"\r\n\r\n")
+    lines = raw.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            k, v = line.split(":", 1)
+            headers[k.strip().lower()] = v.strip()
+    return status, headers
+
+async def _read_exact(reader, length, keep):
+    kept = bytearray()
+    remaining = length
+    while remaining > 0:
+        data = await reader.read(min(remaining, READ_CHUNK))
+        if not data:
+            raise ConnectionError(f"connection closed with {remaining} bytes pending")
+        remaining -= len(data)
+        if keep:
+            kept += data
+    return length, bytes(kept)
+
+async def _read_chunked(reader, keep):
+    total = 0
+    kept = bytearray()
+    while True:
+        size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+        if size == 0:
+            await reader.readuntil(b"\r\n")
+            return total, bytes(kept)
+        n, data = await _read_exact(reader, size, keep)
+        kept += data
+        total += n
+        await reader.readexactly(2)
+
+def _raise_nofile(needed):
+    # Miles de conexiones simultáneas necesitan más descriptores que el default (1024)
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    want = needed + 256
+    if soft != resource.RLIM_INFINITY and soft < want:
+        new_soft = want if hard == resource.RLIM_INFINITY else min(want, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (new_soft, hard))
+
+async def _worker(client, bucket, worker_id, object_name, view, object_size, controller, result):
+    while True:
+        measured = controller.next(worker_id)
+        if measured is None:
+            break
+
+        iteration_start = start = now_ns()
+        await client.put_object(bucket, object_name, view, object_size)
+        put_ns = now_ns() - start
+
+        start = now_ns()
+        _, nbytes, first_byte = await client.get_object(bucket, object_name)
+        get_ns = now_ns() - start
+
+        delete_start = now_ns()
+        await client.remove_object(bucket, object_name)
+        delete_ns = now_ns() - delete_start
+
+        if measured:
+            result.record_iteration(put_ns, get_ns, first_byte - start, delete_ns, object_size, nbytes)
+            result.mark(iteration_start, now_ns())
+        controller.record(measured, object_size + nbytes, put_ns + get_ns)
+    return result
+
+async def _run(endpoint, access_key, secret_key, bucket, object_size, concurrency, controller,
+               payload, new_result, object_name_for, stats=None):
+    client = AsyncS3Client(endpoint, access_key, secret_key, stats=stats)
+    results = [new_result(w) for w in range(concurrency)]
+    start = now_ns()
+    try:
+        await asyncio.gather(*[
+            _worker(client, bucket, w, object_name_for(w), payload.view, object_size, controller, results[w])
+            for w in range(concurrency)
+        ])
+    finally:
+        await client.close()
+    wall = (now_ns() - start) / 1e9
+    print(f"Async engine: {client.connections_opened} connections opened for {concurrency} in-flight loops")
+    return results, wall
+
+def run_async_engine(endpoint, access_key, secret_key, bucket, object_size, concurrency, controller,
+                     payload, new_result, object_name_for, stats=None):
+    """Corre el loop PUT/GET/DELETE con `concurrency` corrutinas; devuelve (results, wall_seconds)."""
+    _raise_nofile(concurrency)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    return asyncio.run(_run(endpoint, access_key, secret_key, bucket, object_size, concurrency,
+                            controller, payload, new_result, object_name_for, stats))
@@ -1,38 +1,86 @@
 from minio import Minio
-import time, io, statistics, sys, os
-
-class FakeStream(io.RawIOBase):
-    def __init__(self, size):
-        self.remaining = size
-    def readable(self):
-        return True
-    def read(self, n=-1):
-        if self.remaining <= 0:
-            return b""
-        chunk = min(n, self.remaining)
-        self.remaining -= chunk
-        return b"x" * chunk
-    def readinto(self, b):
-        if self.remaining <= 0:
-            return 0
-        chunk = min(len(b), self.remaining)
-        b[:chunk] = b"x" * chunk
-        self.remaining -= chunk
-        return chunk
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from histogram import LatencyHistogram, now_ns
+from payload import payload_from_env, Verifier
+from units import parse_size, parse_size_list, parse_int_list, parse_duration
+from runcontrol import controller_from_env
+from results_store import disk_layout, open_default, histogram_row
+from telemetry import sampler_from_env, format_summary, telemetry_row
+import phases
+from connpool import pool_manager, stats_from_env
+from nulls3 import NullServer, NULL_VERSION, DEFAULT_PORT as NULL_PORT
+import atexit, json, resource, sys, os
+
+class WorkerResult:
+    def __init__(self, worker_id):
+        self.worker_id = worker_id
+        self.put = LatencyHistogram()
+        self.get = LatencyHistogram()
+        self.ttfb = LatencyHistogram()
+        self.delete = LatencyHistogram()
+        self.bytes_put = 0
+        self.bytes_get = 0
+        self.verified = 0
+        self.verify_failures = 0
+        self.verify_ns = 0
+        self.start_ns = None  # ventana propia del worker (iteraciones medidas)
+        self.end_ns = None
+
+    def ops(self):
+        return self.put.count + self.get.count + self.delete.count
+
+    def mark(self, start_ns, end_ns):
+        if self.start_ns is None:
+            self.start_ns = start_ns
+        self.end_ns = end_ns
+
+    def elapsed(self):
+        """Segundos desde la primera hasta la última iteración medida de este worker."""
+        return (self.end_ns - self.start_ns) / 1e9 if self.start_ns is not None else 0.0
+
+    def record_iteration(self, put_ns, get_ns, ttfb_ns, delete_ns, bytes_put, bytes_get):
+        self.put.record(put_ns)
+        self.get.record(get_ns)
+        if ttfb_ns is not None:
+            self.ttfb.record(ttfb_ns)
+        self.delete.record(delete_ns)
+        self.bytes_put += bytes_put
+        self.bytes_get += bytes_get
+
+    def record_verify(self, check, measured=True):
+        # Un fallo en el warmup también cuenta; el costo del CRC solo en iteraciones medidas, como r.get
+        if not check.ok():
+            self.verify_failures += 1
+        if measured:
+            self.verified += 1
+            self.verify_ns += check.ns
 
 # Flush output line by line for GitHub Actions
 sys.stdout.reconfigure(line_buffering=True)
 
-client = Minio("localhost:9000", access_key="minioadmin", secret_key="minioadmin", secure=False)
-
+endpoint = os.environ.get("MINIO_ENDPOINT", "localhost:9000")
+access_key = os.environ.get("MINIO_ACCESS_KEY", "minioadmin")
+secret_key = os.environ.get("MINIO_SECRET_KEY", "minioadmin")
 bucket = "bench-loop"
 version = os.environ.get("MINIO_VERSION", "unknown")
 size_str = os.environ.get("OBJECT_SIZE", "1GB").upper()
 mode = os.environ.get("MODE", "single-disk").lower()  # <- "multi-disk" or "single-disk"
+concurrency = max(1, int(os.environ.get("CONCURRENCY", "1")))  # <- N workers en paralelo
+get_mode = os.environ.get("GET_MODE", "stream").lower()  # <- "stream" o "full" (response.read())
+get_chunk = int(os.environ.get("GET_CHUNK_SIZE", str(1024 * 1024)))
+engine = os.environ.get("ENGINE", "sync").lower()  # <- "sync" (threads) o "async" (asyncio)
+sweep = os.environ.get("SWEEP", "").lower()  # <- "multipart" (part_size x partes) o "sizes" (tamaño de objeto)
+workload = os.environ.get("WORKLOAD", "loop").lower()  # <- "loop" (PUT/GET/DELETE) o "mixed"
+verify = os.environ.get("VERIFY", "").lower() in ("1", "true", "yes", "on")  # <- CRC32 de cada GET
+null_s3 = os.environ.get("NULL_S3", "").lower() in ("1", "true", "yes", "on")  # <- contra nulls3.py (techo del harness)
+
+MIB = 1024 * 1024
 
 # Size in bytes
 size_map = {"128KB": 128 * 1024, "1MB": 1 * 1024 * 1024, "1GB": 1 * 1024 * 1024 * 1024}
-object_size = size_map.get(size_str, 1 * 1024 * 1024)
+# Cualquier otro tamaño ("4KiB", "64MiB", "5GB") se acepta tal cual, con iteraciones automáticas
+object_size = size_map.get(size_str) or parse_size(size_str)
 
 # Iteration strategy based on mode
 if mode == "multi-disk":
@@ -40,37 +88,420 @@ if mode == "multi-disk":
 else:
     iteration_map = {"128KB": 100, "1MB": 50, "1GB": 10}
 
-total_iterations = iteration_map.get(size_str, 1)
-object_name = f"testfile-{size_str}"
+if size_str in iteration_map:
+    total_iterations = iteration_map[size_str]
+else:
+    from sizesweep import auto_iterations
+    total_iterations = auto_iterations(object_size, 0.5 if mode == "multi-disk" else 1.0)
+# RUN_DURATION / RUN_TARGET_CI activan warmup + parada por intervalo de confianza
+controller = controller_from_env(os.environ, total_iterations)
+
+# Buffer de subida preparado una sola vez y compartido por todos los workers
+payload = payload_from_env(os.environ, object_size)
+
+# Muestreo /proc del proceso de MinIO (TELEMETRY_PID, MINIO_PID o /tmp/minio_pid.txt)
+telemetry = sampler_from_env(os.environ)
 
-print(f"\nFile Size: {size_str}")
-print(f"MinIO Version: {version}")
-print(f"Running {total_iterations} iterations in mode: {mode}\n")
+# PROFILE_PHASES=1: desglose sign/connect/send/wait/receive; PROFILE_CPROFILE=<fracción>: cProfile muestreado
+profile_phases = phases.enabled(os.environ)
+profiler = phases.profiler_from_env(os.environ)
 
-if not client.bucket_exists(bucket):
-    client.make_bucket(bucket)
+# CONNECTIONS=keepalive (default) reutiliza conexiones; fresh abre una por petición
+conn_stats = stats_from_env(os.environ)
+shared_http = None  # pool compartido por los workers, del tamaño de CONCURRENCY
 
-upload_times, download_times = [], []
-for i in range(total_iterations):
-    # Upload
-    start = time.time()
-    stream = io.BufferedReader(FakeStream(object_size))
-    client.put_object(bucket, object_name, stream, object_size)
-    upload_times.append(time.time() - start)
+def make_client(pool_size=None):
+    """Cliente sobre el pool compartido (tamaño CONCURRENCY) o uno propio de `pool_size`."""
+    global shared_http
+    if pool_size:
+        http_client = pool_manager(pool_size, conn_stats)
+    else:
+        if shared_http is None:
+            shared_http = pool_manager(concurrency, conn_stats)
+        http_client = shared_http
+    client_cls = Minio
+    if profile_phases:
+        phases.instrument(http_client)
+        client_cls = phases.ProfiledMinio
+    return client_cls(endpoint, access_key=access_key, secret_key=secret_key, secure=False,
+                      http_client=http_client)
 
-    # Download
-    start = time.time()
+def object_name_for(worker_id):
+    # Cada worker usa su propia llave para no pisar los objetos de los demás
+    # (distributed.py numera los workers de todos los procesos de forma global)
+    if concurrency == 1 and worker_id == 0:
+        return f"testfile-{size_str}"
+    return f"testfile-{size_str}-w{worker_id}"
+
+def drain(response, view, check=None):
+    """Vacía la respuesta en trozos fijos sobre un buffer reutilizable. Devuelve los bytes leídos."""
+    total = 0
+    while True:
+        n = response.readinto(view)
+        if not n:
+            break
+        if check is not None:
+            check.update(view[:n])
+        total += n
+    return total
+
+def download(client, object_name, view, check=None):
+    """Devuelve (bytes, timestamp de TTFB)."""
     response = client.get_object(bucket, object_name)
-    _ = response.read()
-    response.close()
-    download_times.append(time.time() - start)
+    # TTFB = llegada de los headers (get_object no precarga el cuerpo), como en async_engine.py.
+    # El primer readinto bloquea hasta llenar GET_CHUNK_SIZE: con objetos <= 1MiB sería el GET entero
+    first_byte = now_ns()
+    try:
+        if get_mode == "full":
+            data = response.read()
+            nbytes = len(data)
+            if check is not None:
+                check.update(data)
+        else:
+            nbytes = drain(response, view, check)
+    finally:
+        response.close()
+        response.release_conn()
+    return nbytes, first_byte
+
+def peak_rss_mib():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KiB, macOS bytes
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+
+def run_worker(worker_id, controller):
+    client = make_client()
+    object_name = object_name_for(worker_id)
+    prefix = f"[w{worker_id}] " if concurrency > 1 else ""
+    result = WorkerResult(worker_id)
+    # Buffer de descarga por worker, reutilizado en todas las iteraciones
+    view = memoryview(bytearray(get_chunk))
+    i = 0
+    while True:
+        measured = controller.next(worker_id)
+        if measured is None:
+            break
+
+        iteration_start = now_ns()
+        with profiler.maybe() if profiler else nullcontext():
+            # Upload
+            start = now_ns()
+            client.put_object(bucket, object_name, payload.stream(object_size), object_size)
+            upload_ns = now_ns() - start
+
+            # Download (con VERIFY=1 el CRC32 se calcula mientras llegan los trozos)
+            check = Verifier(payload, object_size) if verify else None
+            start = now_ns()
+            nbytes, first_byte = download(client, object_name, view, check)
+            download_ns = now_ns() - start
+            ttfb_ns = first_byte - start if first_byte is not None else None
+
+            # 🧹 Clean up
+            start = now_ns()
+            client.remove_object(bucket, object_name)
+            delete_ns = now_ns() - start
+
+        # Las iteraciones de warmup se ejecutan pero no se registran
+        if measured:
+            result.record_iteration(upload_ns, download_ns, ttfb_ns, delete_ns, object_size, nbytes)
+            result.mark(iteration_start, now_ns())
+        if check is not None:
+            result.record_verify(check, measured)
+            if not check.ok():
+                print(f"{prefix}VERIFY FAILED for {object_name}: {check.describe()}")
+        controller.record(measured, object_size + nbytes, upload_ns + download_ns)
+
+        print(f"{prefix}{controller.label(i, measured)} PUT: {upload_ns/1e6:.1f}ms, GET: {download_ns/1e6:.1f}ms")
+        i += 1
+    return result
+
+def mibps(nbytes, wall):
+    # Bytes / wall medido, igual que las ops/s (no el tiempo dentro de cada operación)
+    return (nbytes / MIB) / wall if wall > 0 else 0.0
+
+def merged(results, op):
+    hist = LatencyHistogram()
+    for r in results:
+        hist.merge(getattr(r, op))
+    return hist
+
+def verify_line(results):
+    verified = sum(r.verified for r in results)
+    failures = sum(r.verify_failures for r in results)
+    crc_ns = sum(r.verify_ns for r in results)
+    get_ns = sum(r.get.total for r in results)
+    nbytes = verified * object_size
+    rate = nbytes / MIB / (crc_ns / 1e9) if crc_ns else 0.0
+    status = "all OK" if not failures else f"{failures} FAILED"
+    return (f"Verify: {verified} downloads checked, {status}; crc32 {crc_ns/1e6:.1f}ms total "
+            f"({crc_ns / get_ns * 100 if get_ns else 0:.2f}% of GET time, {rate:.0f} MiB/s)")
+
+def report(results, wall):
+    put, get, delete = merged(results, "put"), merged(results, "get"), merged(results, "delete")
+
+    print(f"\nAverage PUT: {put.mean()/1e6:.1f}ms")
+    print(f"Average GET: {get.mean()/1e6:.1f}ms")
+
+    print("\nLatency:")
+    print(f"  PUT:    {put.format()}")
+    print(f"  GET:    {get.format()}")
+    print(f"  TTFB:   {merged(results, 'ttfb').format()}")
+    print(f"  DELETE: {delete.format()}")
+    print(f"\nPeak RSS: {peak_rss_mib():.1f} MiB (GET mode: {get_mode})")
+    if controller.summary():
+        print(controller.summary())
+    print(conn_stats.line())
+    if verify:
+        print(verify_line(results))
+    if profile_phases:
+        phases.report()
+    if profiler:
+        profiler.dump()
+
+    if concurrency == 1:
+        return
+
+    put_mibps, get_mibps = aggregate_mibps(results, wall)
+    total_ops = sum(r.ops() for r in results)
+    print(f"\nAggregate ({concurrency} workers, {wall:.2f}s wall):")
+    print(f"  PUT: {put.count} ops, {put.count/wall:.1f} ops/s, {put_mibps:.1f} MiB/s")
+    print(f"  GET: {get.count} ops, {get.count/wall:.1f} ops/s, {get_mibps:.1f} MiB/s")
+    print(f"  Total: {total_ops} ops, {total_ops/wall:.1f} ops/s (PUT+GET+DELETE)")
+
+    if len(results) > 64:
+        # Con miles de workers (ENGINE=async) solo se muestran los extremos
+        by_rate = sorted(results, key=lambda r: mibps(r.bytes_put, r.elapsed()))
+        print(f"\nPer-worker: {len(results)} workers, showing slowest and fastest 3 by PUT MiB/s")
+        results = by_rate[:3] + by_rate[-3:]
+    else:
+        print("\nPer-worker:")
+    for r in results:
+        # Cada worker sobre su propio tiempo: el wall global daría el mismo número a todos
+        print(f"  w{r.worker_id}: PUT {mibps(r.bytes_put, r.elapsed()):.1f} MiB/s "
+              f"(p50 {r.put.percentile(50)/1e6:.1f}ms, p99 {r.put.percentile(99)/1e6:.1f}ms), "
+              f"GET {mibps(r.bytes_get, r.elapsed()):.1f} MiB/s "
+              f"(p50 {r.get.percentile(50)/1e6:.1f}ms, p99 {r.get.percentile(99)/1e6:.1f}ms)")
+
+def save_run(rows, run_mode, **params):
+    """Guarda la corrida en el results store (RESULTS_DB)."""
+    store = open_default()
+    if store is None:
+        return
+    try:
+        if conn_stats.requests:
+            rows = rows + [conn_stats.row()]
+        run_id = store.record_run(
+            rows, tool="benchmark.py", minio_version=version, mode=run_mode,
+            disk_layout=disk_layout(os.environ),
+            object_size=object_size, concurrency=concurrency, engine=engine,
+            session_id=os.environ.get("BENCH_SESSION"),
+            params={"payload": payload.mode, "get_mode": get_mode, "connections": conn_stats.mode, **params},
+        )
+    finally:
+        store.close()
+    print(f"\nSaved run {run_id} to {store.path}")
+
+def finish_telemetry(bytes_put, bytes_get, window=None):
+    """Para el sampler y devuelve la fila SERVER ([] si no hay telemetría)."""
+    if telemetry is None:
+        return []
+    telemetry.stop()
+    summary = telemetry.summary(bytes_put, bytes_put + bytes_get, window)
+    if summary is None:
+        return []
+    print("\n" + format_summary(summary))
+    return [telemetry_row(telemetry, summary)]
+
+def aggregate_mibps(results, wall):
+    return (mibps(sum(r.bytes_put for r in results), wall), mibps(sum(r.bytes_get for r in results), wall))
+
+def harness_ceiling():
+    """Techo medido con nulls3.py para este engine / concurrencia / tamaño, o None."""
+    store = open_default()
+    if store is None:
+        return None
+    try:
+        return store.ceiling(object_size, concurrency, engine)
+    finally:
+        store.close()
+
+def report_ceiling(results, wall, ceiling):
+    if version == NULL_VERSION:
+        return
+    if not ceiling:
+        print(f"\nHarness ceiling: not calibrated for engine {engine}, {concurrency} workers, {size_str} "
+              f"(python nulls3.py calibrate --engines {engine} --concurrency {concurrency} --object-size {size_str})")
+        return
+    print(f"\nHarness ceiling (null S3, engine {engine}, {concurrency} workers, {size_str}):")
+    for op, got in zip(("PUT", "GET"), aggregate_mibps(results, wall)):
+        top = (ceiling.get(op) or (None,))[0]
+        if not top:
+            continue
+        share = got / top * 100
+        # Cerca del techo el número mide al cliente, no a MinIO
+        note = "  <- client-bound, MinIO may be faster" if share >= 70 else ""
+        print(f"  {op}: {got:.1f} MiB/s of {top:.1f} MiB/s ceiling ({share:.0f}%){note}")
+
+def save_loop(results, wall, extra_rows=(), ceiling=None):
+    put_mibps, get_mibps = aggregate_mibps(results, wall)
+    rows = [
+        histogram_row("PUT", merged(results, "put"), wall, put_mibps),
+        histogram_row("GET", merged(results, "get"), wall, get_mibps),
+        histogram_row("GET-TTFB", merged(results, "ttfb"), wall),
+        histogram_row("DELETE", merged(results, "delete"), wall),
+        *(phases.rows() if profile_phases else []),
+        *extra_rows,
+    ]
+    if verify:
+        crc_ns = sum(r.verify_ns for r in results)
+        rows.append({"operation": "VERIFY", "ops": sum(r.verified for r in results),
+                     "errors": sum(r.verify_failures for r in results),
+                     "mibps": sum(r.verified for r in results) * object_size / MIB / (crc_ns / 1e9) if crc_ns else None,
+                     "mean_ms": crc_ns / 1e6 / max(1, sum(r.verified for r in results)),
+                     "extra": json.dumps({"crc_seconds": crc_ns / 1e9,
+                                          "get_seconds": sum(r.get.total for r in results) / 1e9})})
+    params = {"ceiling_mibps": {op: v[0] for op, v in ceiling.items() if op in ("PUT", "GET")}} if ceiling else {}
+    save_run(rows, "loop", run_control=controller.describe(), summary=controller.summary(), **params)
+
+def main():
+    global endpoint, version, telemetry
+    if null_s3:
+        # El servidor nulo corre en otros procesos y se apaga al salir
+        null = NullServer(int(os.environ.get("NULL_S3_PORT", str(NULL_PORT))),
+                          int(os.environ.get("NULL_S3_PROCESSES", "2")), object_size)
+        atexit.register(null.stop)
+        endpoint, version, telemetry = null.endpoint, NULL_VERSION, None
+    print(f"\nFile Size: {size_str}")
+    print(f"MinIO Version: {version}")
+    print(f"Running {controller.describe()} in mode: {mode}")
+    print(f"Payload: {payload.mode}")
+    if concurrency > 1:
+        print(f"Concurrency: {concurrency} workers")
+    if engine != "sync":
+        print(f"Engine: {engine}")
+    print(f"Connections: {conn_stats.mode}")
+    if telemetry:
+        print(f"Telemetry: MinIO pid {telemetry.pid}, every {telemetry.interval:g}s")
+    if verify and engine != "sync":
+        # async_engine.py descarta el cuerpo sin verificarlo: un "all OK" con 0 descargas engañaría
+        sys.exit("VERIFY=1 needs ENGINE=sync (the async engine does not verify downloads)")
+    if verify:
+        # El CRC esperado se calcula antes de medir, una sola vez por tamaño
+        start = now_ns()
+        expected = payload.crc32(object_size)
+        print(f"Verify: crc32 of every GET against the {payload.mode} payload "
+              f"(expected {expected:08x}, computed in {(now_ns() - start)/1e6:.1f}ms)")
+    print()
+
+    client = make_client()
+    if not client.bucket_exists(bucket):
+        client.make_bucket(bucket)
+    if telemetry:
+        telemetry.start()
+
+    if sweep == "multipart":
+        from sweep import run_multipart_sweep
+        cells = run_multipart_sweep(
+            make_client, os.environ, bucket, object_size,
+            part_sizes=parse_size_list(os.environ.get("SWEEP_PART_SIZES", "5MiB,8MiB,16MiB,32MiB,64MiB")),
+            parallels=parse_int_list(os.environ.get("SWEEP_PARALLEL", "1,2,4,8")),
+            iterations=int(os.environ.get("SWEEP_ITERATIONS", "3")),
+        )
+        server = finish_telemetry(sum(hist.count for _, hist in cells.values()) * object_size, 0)
+        save_run([histogram_row("PUT", hist, mibps=rate, extra={"part_size": part, "parallel": parallel})
+                  for (part, parallel), (rate, hist) in cells.items()] + server, "sweep-multipart")
+        return
+
+    if sweep == "sizes":
+        from sizesweep import parse_sizes, run_size_sweep, size_rows
+        sizes = parse_sizes(os.environ.get("SWEEP_SIZES", "4KiB:1GiB:x4"))
+        points = run_size_sweep(
+            make_client, bucket, sizes, payload_from_env(os.environ, max(sizes)), download, concurrency,
+            budget=parse_duration(os.environ.get("SWEEP_SIZE_TIME", "5s")),
+            min_iter=int(os.environ.get("SWEEP_MIN_ITERATIONS", "3")),
+            max_iter=int(os.environ.get("SWEEP_MAX_ITERATIONS", "10000")),
+            chunk_size=get_chunk,
+        )
+        server = finish_telemetry(sum(p.size * p.put.count for p in points),
+                                  sum(p.size * p.get.count for p in points))
+        save_run(size_rows(points, histogram_row) + server, "sweep-sizes",
+                 sweep_sizes=os.environ.get("SWEEP_SIZES", "4KiB:1GiB:x4"))
+        return
+
+    if workload == "mixed":
+        from mixed import run_mixed, parse_weights, DEFAULT_WEIGHTS
+        totals, wall = run_mixed(
+            make_client, bucket, object_size, payload, download, concurrency,
+            object_count=int(os.environ.get("MIXED_OBJECTS", "100")),
+            weights=parse_weights(os.environ.get("MIXED_WEIGHTS", DEFAULT_WEIGHTS)),
+            duration=parse_duration(os.environ.get("MIXED_DURATION", "30s")),
+            chunk_size=get_chunk,
+        )
+        server = finish_telemetry(totals["put"].bytes, totals["get"].bytes)
+        save_run([histogram_row(op.upper(), s.hist, wall, s.bytes / MIB / wall if s.bytes else None, s.errors)
+                  for op, s in totals.items() if s.hist.count or s.errors] + server,
+                 "mixed", weights=os.environ.get("MIXED_WEIGHTS", DEFAULT_WEIGHTS))
+        return
+
+    if workload == "openloop":
+        from openloop import run_openloop, openloop_rows
+        op = os.environ.get("OPEN_OP", "put").lower()
+        rates = [float(r) for r in os.environ.get("OPEN_RATES", "10,20,40,80").split(",") if r.strip()]
+        slo = os.environ.get("OPEN_SLO_P99")
+        steps = run_openloop(
+            make_client, bucket, op, rates, os.environ.get("OPEN_ARRIVALS", "constant").lower(),
+            parse_duration(os.environ.get("OPEN_STEP_TIME", "10s")),
+            int(os.environ.get("OPEN_WORKERS", str(max(64, concurrency)))),
+            payload, object_size, download, get_chunk,
+            grace=parse_duration(os.environ["OPEN_GRACE"]) if os.environ.get("OPEN_GRACE") else None,
+            slo_p99_ms=float(slo) if slo else None,
+        )
+        sent = sum(s.bytes for s in steps)
+        server = finish_telemetry(sent if op == "put" else 0, sent if op == "get" else 0)
+        save_run(openloop_rows(steps, op, histogram_row) + server, "openloop",
+                 open_op=op, open_rates=rates, open_arrivals=os.environ.get("OPEN_ARRIVALS", "constant").lower())
+        return
+
+    if workload == "namespace":
+        from namespace import run_namespace, namespace_rows
+        ns_size = parse_size(os.environ.get("NS_OBJECT_SIZE", "0"))
+        results = run_namespace(
+            make_client, bucket, parse_int_list(os.environ.get("NS_OBJECTS", "1000,10000")),
+            payload, ns_size, concurrency,
+            depth=int(os.environ.get("NS_DEPTH", "2")),
+            fanout=int(os.environ.get("NS_FANOUT", "10")),
+            samples=int(os.environ.get("NS_SAMPLES", "1000")),
+            populate_workers=int(os.environ.get("NS_POPULATE_WORKERS", "32")),
+            keep=os.environ.get("NS_KEEP") == "1",
+        )
+        server = finish_telemetry(max((r.objects for r in results), default=0) * ns_size, 0)
+        save_run(namespace_rows(results, histogram_row) + server, "namespace",
+                 ns_objects=os.environ.get("NS_OBJECTS", "1000,10000"),
+                 ns_depth=int(os.environ.get("NS_DEPTH", "2")), ns_fanout=int(os.environ.get("NS_FANOUT", "10")))
+        return
 
-    # 🧹 Clean up
-    client.remove_object(bucket, object_name)
+    if engine == "async":
+        from async_engine import run_async_engine
+        results, wall = run_async_engine(
+            endpoint, access_key, secret_key, bucket, object_size, concurrency, controller,
+            payload, WorkerResult, object_name_for, conn_stats,
+        )
+    else:
+        start = now_ns()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [pool.submit(run_worker, w, controller) for w in range(concurrency)]
+            results = [f.result() for f in futures]
+        wall = (now_ns() - start) / 1e9
 
-    upload_ms = upload_times[-1] * 1000
-    download_ms = download_times[-1] * 1000
-    print(f"[{i+1}/{total_iterations}] PUT: {upload_ms:.1f}ms, GET: {download_ms:.1f}ms")
+    wall = controller.measured_wall(wall)
+    report(results, wall)
+    ceiling = harness_ceiling()
+    report_ceiling(results, wall, ceiling)
+    server = finish_telemetry(sum(r.bytes_put for r in results), sum(r.bytes_get for r in results),
+                              controller.measured_window())
+    save_loop(results, wall, server, ceiling)
+    if verify and any(r.verify_failures for r in results):
+        sys.exit("Integrity verification failed")
 
-print(f"\nAverage PUT: {statistics.mean(upload_times)*1000:.1f}ms")
-print(f"Average GET: {statistics.mean(download_times)*1000:.1f}ms")
+if __name__ == "__main__":
+    main()
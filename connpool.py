@@ -0,0 +1,98 @@
+"""
+connpool.py — explicit HTTP connection pools for the benchmark clients.
+
+CONNECTIONS selects how clients treat TCP connections:
+  keepalive  (default) connections go back to the pool and are reused
+  fresh      every request opens a new connection that is closed afterwards,
+             like short-lived Lambda-style clients
+
+The pools count requests and TCP connects (with connect latency), so the
+report can show the reuse rate and what connection setup costs.
+"""
+
+import threading
+
+import urllib3
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from histogram import LatencyHistogram, now_ns
+
+MODES = ("keepalive", "fresh")
+
+class ConnStats:
+    def __init__(self, mode="keepalive"):
+        if mode not in MODES:
+            raise ValueError(f"CONNECTIONS must be one of {', '.join(MODES)}, got {mode!r}")
+        self.mode = mode
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connects = 0
+        self.connect_hist = LatencyHistogram()
+
+    def request(self):
+        with self._lock:
+            self.requests += 1
+
+    def connected(self, elapsed_ns):
+        with self._lock:
+            self.connects += 1
+            self.connect_hist.record(elapsed_ns)
+
+    def reuse_rate(self):
+        requests = self.requests
+        return max(0.0, 1 - self.connects / requests) if requests else 0.0
+
+    def line(self):
+        return (f"Connections ({self.mode}): {self.requests} requests over {self.connects} TCP connections, "
+                f"{self.reuse_rate()*100:.1f}% reused; connect {self.connect_hist.format()}")
+
+    def row(self):
+        """Fila CONNECT para el results store."""
+        from results_store import histogram_row
+        return histogram_row("CONNECT", self.connect_hist, extra={
+            "mode": self.mode, "requests": self.requests, "connects": self.connects,
+            "reuse_rate": self.reuse_rate(),
+        })
+
+def _counting(conn_cls, stats):
+    class CountingConnection(conn_cls):
+        def connect(self):
+            start = now_ns()
+            super().connect()
+            stats.connected(now_ns() - start)
+    CountingConnection.__name__ = "Counting" + conn_cls.__name__
+    return CountingConnection
+
+def _pool_class(pool_cls, conn_cls, stats, fresh):
+    class CountingPool(pool_cls):
+        ConnectionCls = _counting(conn_cls, stats)
+
+        def _make_request(self, *args, **kwargs):
+            stats.request()
+            return super()._make_request(*args, **kwargs)
+
+        def _put_conn(self, conn):
+            if fresh and conn is not None:
+                # Vuelve al pool cerrada: la próxima petición hace un connect() nuevo
+                conn.close()
+            return super()._put_conn(conn)
+    CountingPool.__name__ = "Counting" + pool_cls.__name__
+    return CountingPool
+
+def pool_manager(maxsize, stats, mode=None):
+    """urllib3.PoolManager con los defaults del SDK, `maxsize` conexiones por host y contadores."""
+    fresh = (mode or stats.mode) == "fresh"
+    http = urllib3.PoolManager(
+        timeout=urllib3.Timeout(connect=300, read=300),
+        maxsize=maxsize,
+        retries=urllib3.Retry(total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+    )
+    http.pool_classes_by_scheme = {
+        "http": _pool_class(HTTPConnectionPool, HTTPConnection, stats, fresh),
+        "https": _pool_class(HTTPSConnectionPool, HTTPSConnection, stats, fresh),
+    }
+    return http
+
+def stats_from_env(env):
+    return ConnStats(env.get("CONNECTIONS", "keepalive").lower())
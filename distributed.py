@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+distributed.py — coordinator/worker load driver: the PUT/GET/DELETE loop of
+benchmark.py fanned out over many processes, so load scales with cores
+instead of stopping at one interpreter's GIL.
+
+  python3 distributed.py --processes 8                        # 8 local processes
+  python3 distributed.py serve [--listen 0.0.0.0:7762]        # on every load host
+  python3 distributed.py --hosts 10.0.0.2,10.0.0.3 --processes 4   # 4 per host
+
+Each process runs CONCURRENCY worker threads with the usual env vars
+(OBJECT_SIZE, RUN_DURATION, PAYLOAD, CONNECTIONS...; MINIO_ENDPOINT must be
+reachable from every host). Protocol, newline-delimited JSON over TCP:
+
+  coordinator -> host   {"type": "job", "env": {...}, "processes": N, "base": first worker id}
+  host -> coordinator   {"type": "ready"}          every process imported, connected, bucket exists
+  coordinator -> host   {"type": "start", "start_in": s}
+  host -> coordinator   {"type": "results", "results": [...]}   histograms as LatencyHistogram.to_dict()
+
+"start" goes to every host back to back and each converts `start_in` to its
+own clock, so the start does not depend on clock sync between hosts (skew is
+the one-way network latency). Local processes use the same code without
+the socket.
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import telemetry
+from histogram import LatencyHistogram
+
+DEFAULT_PORT = 7762
+SCRIPT = Path(__file__).resolve()
+# Variables que viajan a los procesos: lo que benchmark.py lee del entorno
+ENV_PREFIXES = ("MINIO_", "OBJECT_SIZE", "MODE", "CONCURRENCY", "GET_", "PAYLOAD", "RUN_", "CONNECTIONS", "VERIFY")
+OPS = ("put", "get", "ttfb", "delete")
+
+def _send(f, msg):
+    f.write(json.dumps(msg).encode() + b"\n")
+    f.flush()
+
+def _recv(f):
+    line = f.readline()
+    if not line:
+        raise ConnectionError("peer closed the connection")
+    msg = json.loads(line)
+    if msg.get("type") == "error":
+        raise RuntimeError(msg["error"])
+    return msg
+
+def job_env(env=os.environ):
+    out = {k: v for k, v in env.items() if k.startswith(ENV_PREFIXES)}
+    # Telemetría y results store los maneja el coordinador, no cada proceso
+    out["TELEMETRY"] = "off"
+    return out
+
+# --- proceso de carga -------------------------------------------------------
+
+def _wait_until(deadline):
+    while True:
+        left = deadline - time.time()
+        if left <= 0:
+            return
+        time.sleep(left - 0.002 if left > 0.005 else 0)
+
+def run_process():
+    """Un proceso de carga: lee el job por stdin, contesta por stdout (JSON por línea)."""
+    proto = os.fdopen(os.dup(1), "wb")
+    # Los prints de benchmark.py no deben mezclarse con el protocolo
+    sink = os.open(os.devnull, os.O_WRONLY) if not os.environ.get("DIST_VERBOSE") else 2
+    os.dup2(sink, 1)
+    try:
+        job = _recv(sys.stdin.buffer)
+        os.environ.update(job["env"])
+        import benchmark
+        from minio.error import S3Error
+
+        client = benchmark.make_client()
+        try:
+            if not client.bucket_exists(benchmark.bucket):
+                client.make_bucket(benchmark.bucket)
+        except S3Error as e:
+            # Otro proceso lo creó entre el exists y el make
+            if e.code not in ("BucketAlreadyOwnedByYou", "BucketAlreadyExists"):
+                raise
+        _send(proto, {"type": "ready"})
+
+        start_at = _recv(sys.stdin.buffer)["start_at"]
+        _wait_until(start_at)
+        started = time.time()
+        ids = [job["base"] + w for w in range(benchmark.concurrency)]
+        with ThreadPoolExecutor(max_workers=len(ids)) as pool:
+            results = list(pool.map(lambda w: benchmark.run_worker(w, benchmark.controller), ids))
+        ended = time.time()
+        wall = benchmark.controller.measured_wall(ended - started)
+        _send(proto, {
+            "type": "result",
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "late_ms": (started - start_at) * 1000,
+            "wall": wall,
+            "connections": {"requests": benchmark.conn_stats.requests,
+                            "connects": benchmark.conn_stats.connects},
+            "workers": [{"worker_id": r.worker_id, "bytes_put": r.bytes_put, "bytes_get": r.bytes_get,
+                         "verified": r.verified, "verify_failures": r.verify_failures,
+                         **{op: getattr(r, op).to_dict() for op in OPS}} for r in results],
+        })
+    except Exception as e:
+        _send(proto, {"type": "error", "error": f"{socket.gethostname()} pid {os.getpid()}: {e!r}"})
+        return 1
+    return 0
+
+# --- grupos de procesos (locales o remotos) ---------------------------------
+
+class ProcessGroup:
+    """N procesos de carga en esta máquina."""
+    def __init__(self, env, processes, base, per_process):
+        self.procs = []
+        for i in range(processes):
+            p = subprocess.Popen([sys.executable, str(SCRIPT), "process"], cwd=SCRIPT.parent,
+                                 stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+            _send(p.stdin, {"type": "job", "env": env, "base": base + i * per_process})
+            self.procs.append(p)
+
+    def wait_ready(self):
+        for p in self.procs:
+            _recv(p.stdout)
+
+    def start(self, start_in):
+        start_at = time.time() + start_in
+        for p in self.procs:
+            _send(p.stdin, {"type": "start", "start_at": start_at})
+
+    def results(self):
+        try:
+            return [_recv(p.stdout) for p in self.procs]
+        finally:
+            self.close()
+
+    def close(self):
+        for p in self.procs:
+            if p.poll() is None:
+                p.kill()
+            p.wait()
+
+class RemoteGroup:
+    """Procesos de carga en otro host, a través de `distributed.py serve`."""
+    def __init__(self, address, env, processes, base):
+        host, _, port = address.partition(":")
+        self.address = address
+        self.sock = socket.create_connection((host, int(port or DEFAULT_PORT)), timeout=30)
+        self.sock.settimeout(None)
+        self.f = self.sock.makefile("rwb")
+        _send(self.f, {"type": "job", "env": env, "processes": processes, "base": base})
+
+    def wait_ready(self):
+        _recv(self.f)
+
+    def start(self, start_in):
+        _send(self.f, {"type": "start", "start_in": start_in})
+
+    def results(self):
+        try:
+            return _recv(self.f)["results"]
+        finally:
+            self.close()
+
+    def close(self):
+        self.f.close()
+        self.sock.close()
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        group = None
+        try:
+            job = _recv(self.rfile)
+            per_process = int(job["env"].get("CONCURRENCY", "1"))
+            print(f"Job from {self.client_address[0]}: {job['processes']} processes x {per_process} workers")
+            group = ProcessGroup(job["env"], job["processes"], job["base"], per_process)
+            group.wait_ready()
+            _send(self.wfile, {"type": "ready"})
+            group.start(_recv(self.rfile)["start_in"])
+            _send(self.wfile, {"type": "results", "results": group.results()})
+        except Exception as e:
+            print(f"Job failed: {e!r}", file=sys.stderr)
+            try:
+                _send(self.wfile, {"type": "error", "error": f"{socket.gethostname()}: {e!r}"})
+            except OSError:
+                pass
+        finally:
+            if group is not None:
+                group.close()
+
+def serve(listen):
+    host, _, port = listen.rpartition(":")
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    with socketserver.ThreadingTCPServer((host or "0.0.0.0", int(port)), _JobHandler) as server:
+        print(f"Load worker listening on {host or '0.0.0.0'}:{port}")
+        server.serve_forever()
+
+# --- coordinador ------------------------------------------------------------
+
+class Aggregate:
+    def __init__(self, results):
+        self.results = results
+        self.workers = [w for r in results for w in r["workers"]]
+        self.hists = {op: LatencyHistogram() for op in OPS}
+        for w in self.workers:
+            for op in OPS:
+                self.hists[op].merge(LatencyHistogram.from_dict(w[op]))
+        self.wall = max(r["wall"] for r in results)
+        self.late_ms = [r["late_ms"] for r in results]
+
+    def mibps(self, op):
+        # Igual que benchmark.py: bytes de todos los workers / wall
+        key = "bytes_put" if op == "put" else "bytes_get"
+        total = sum(w[key] for w in self.workers)
+        return total / 1048576 / self.wall if self.wall > 0 else 0.0
+
+    def report(self):
+        put, get = self.hists["put"], self.hists["get"]
+        hosts = sorted({r["host"] for r in self.results})
+        print(f"\nDistributed run: {len(self.results)} processes on {len(hosts)} host(s), "
+              f"{len(self.workers)} workers, {self.wall:.2f}s wall")
+        print(f"Start skew: processes began {min(self.late_ms):.1f}..{max(self.late_ms):.1f}ms after the start time")
+        print("\nLatency:")
+        for op in OPS:
+            print(f"  {op.upper():<7} {self.hists[op].format()}")
+        print("\nAggregate:")
+        print(f"  PUT: {put.count} ops, {put.count/self.wall:.1f} ops/s, {self.mibps('put'):.1f} MiB/s")
+        print(f"  GET: {get.count} ops, {get.count/self.wall:.1f} ops/s, {self.mibps('get'):.1f} MiB/s")
+        verified = sum(w["verified"] for w in self.workers)
+        if verified:
+            failures = sum(w["verify_failures"] for w in self.workers)
+            print(f"  Verify: {verified} downloads checked, {'all OK' if not failures else f'{failures} FAILED'}")
+        print("\nPer-process:")
+        for r in self.results:
+            one = Aggregate([r])
+            print(f"  {r['host']} pid {r['pid']}: {len(r['workers'])} workers, "
+                  f"PUT {one.mibps('put'):.1f} MiB/s, GET {one.mibps('get'):.1f} MiB/s, "
+                  f"{r['connections']['connects']} connects / {r['connections']['requests']} requests")
+
+    def rows(self):
+        from results_store import histogram_row
+        return [
+            histogram_row("PUT", self.hists["put"], self.wall, self.mibps("put")),
+            histogram_row("GET", self.hists["get"], self.wall, self.mibps("get")),
+            histogram_row("GET-TTFB", self.hists["ttfb"], self.wall),
+            histogram_row("DELETE", self.hists["delete"], self.wall),
+        ]
+
+def coordinate(processes, hosts=(), start_delay=1.0, env=os.environ):
+    jenv = job_env(env)
+    per_process = int(jenv.get("CONCURRENCY", "1"))
+    groups = []
+    try:
+        if hosts:
+            for i, host in enumerate(hosts):
+                groups.append(RemoteGroup(host, jenv, processes, i * processes * per_process))
+        else:
+            groups.append(ProcessGroup(jenv, processes, 0, per_process))
+        for g in groups:
+            g.wait_ready()
+        print(f"{len(groups) * processes} processes ready, starting in {start_delay:g}s")
+        for g in groups:
+            g.start(start_delay)
+        results = []
+        for g in groups:
+            results.extend(g.results())
+    finally:
+        for g in groups:
+            g.close()
+    return Aggregate(results)
+
+def save(agg, processes, hosts, extra_rows=(), env=os.environ):
+    from results_store import disk_layout, open_default
+    from units import parse_size
+    store = open_default()
+    if store is None:
+        return
+    try:
+        run_id = store.record_run(
+            agg.rows() + list(extra_rows), tool="distributed.py", minio_version=env.get("MINIO_VERSION", "unknown"),
+            mode="distributed", disk_layout=disk_layout(env),
+            object_size=parse_size(env.get("OBJECT_SIZE", "1GB")),
+            concurrency=len(agg.workers), session_id=env.get("BENCH_SESSION"),
+            params={"processes": len(agg.results), "processes_per_host": processes,
+                    "hosts": list(hosts) or ["local"], "object_size": env.get("OBJECT_SIZE", "1GB"),
+                    "connections": env.get("CONNECTIONS", "keepalive")},
+        )
+    finally:
+        store.close()
+    print(f"\nSaved run {run_id} to {store.path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-process / multi-host load driver for benchmark.py.")
+    parser.add_argument("role", nargs="?", default="run", choices=("run", "serve", "process"),
+                        help="run: coordinate (default); serve: accept jobs on this host; process: internal")
+    parser.add_argument("--processes", type=int, default=int(os.environ.get("DIST_PROCESSES", os.cpu_count() or 1)),
+                        help="Processes per host (default: $DIST_PROCESSES or CPU count)")
+    parser.add_argument("--hosts", default=os.environ.get("DIST_HOSTS", ""),
+                        help=f"Comma-separated host[:port] running 'serve' (default port {DEFAULT_PORT}); empty = local")
+    parser.add_argument("--listen", default=f"0.0.0.0:{DEFAULT_PORT}", help="serve: address to listen on")
+    parser.add_argument("--start-delay", type=float, default=1.0,
+                        help="Seconds between 'everyone ready' and the synchronized start (default: 1)")
+    args = parser.parse_args()
+
+    if args.role == "process":
+        return run_process()
+    if args.role == "serve":
+        serve(args.listen)
+        return 0
+
+    sys.stdout.reconfigure(line_buffering=True)
+    hosts = [h.strip() for h in args.hosts.split(",") if h.strip()]
+    print(f"Coordinating {args.processes} processes x CONCURRENCY={os.environ.get('CONCURRENCY', '1')} "
+          f"on {', '.join(hosts) or 'this machine'}")
+    # Con procesos locales el MinIO observado puede ser el de esta máquina
+    sampler = None if hosts else telemetry.sampler_from_env()
+    if sampler:
+        sampler.start()
+    try:
+        agg = coordinate(args.processes, hosts, args.start_delay)
+    except (OSError, RuntimeError) as e:
+        print(f"Distributed run failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if sampler:
+            sampler.stop()
+    agg.report()
+    extra_rows = []
+    if sampler:
+        bytes_put = sum(w["bytes_put"] for w in agg.workers)
+        summary = sampler.summary(bytes_put, bytes_put + sum(w["bytes_get"] for w in agg.workers))
+        if summary:
+            print("\n" + telemetry.format_summary(summary))
+            extra_rows.append(telemetry.telemetry_row(sampler, summary))
+    save(agg, args.processes, hosts, extra_rows)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+histogram.py — fixed-memory latency histogram (HDR-style, log-linear buckets).
+
+Values are recorded as integer nanoseconds (use time.perf_counter_ns()).
+Each power of two is split into 2**SUB_BITS linear sub-buckets, so the
+relative error of any reported value is below 1 / 2**SUB_BITS (~0.8%).
+Memory is a flat list of counters sized from `max_value`, independent of
+how many samples are recorded, and histograms can be merged.
+"""
+
+import math
+import time
+
+SUB_BITS = 7
+SUB_COUNT = 1 << SUB_BITS
+DEFAULT_MAX_NS = 3600 * 1_000_000_000  # 1 hora
+
+def now_ns():
+    return time.perf_counter_ns()
+
+def _index(value):
+    if value < 2 * SUB_COUNT:
+        return value
+    shift = value.bit_length() - SUB_BITS - 1
+    return (shift + 1) * SUB_COUNT + (value >> shift) - SUB_COUNT
+
+def _bounds(index):
+    """Rango [lo, hi] de valores que caen en el bucket `index`."""
+    if index < 2 * SUB_COUNT:
+        return index, index
+    shift = index // SUB_COUNT - 1
+    top = index % SUB_COUNT + SUB_COUNT
+    return top << shift, ((top + 1) << shift) - 1
+
+class LatencyHistogram:
+    def __init__(self, max_value=DEFAULT_MAX_NS):
+        self.max_value = max_value
+        self.counts = [0] * (_index(max_value) + 1)
+        self.count = 0
+        self.total = 0
+        self.total_sq = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, value):
+        if value < 0:
+            value = 0
+        idx = _index(value) if value <= self.max_value else len(self.counts) - 1
+        self.counts[idx] += 1
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def record_since(self, start_ns):
+        """Registra now - start_ns y devuelve la duración en ns."""
+        elapsed = time.perf_counter_ns() - start_ns
+        self.record(elapsed)
+        return elapsed
+
+    def merge(self, other):
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+            self.max_value = other.max_value
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        return self
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def stddev(self):
+        if self.count < 2:
+            return 0.0
+        mean = self.total / self.count
+        var = self.total_sq / self.count - mean * mean
+        return math.sqrt(var) if var > 0 else 0.0
+
+    def percentile(self, p):
+        """Valor (ns) en el percentil p (0-100)."""
+        if not self.count:
+            return 0
+        target = max(1, math.ceil(self.count * p / 100.0))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if not c:
+                continue
+            seen += c
+            if seen >= target:
+                lo, hi = _bounds(i)
+                # Nunca reportar fuera del rango real observado
+                return min(max((lo + hi) // 2, self.min), self.max)
+        return self.max
+
+    def summary(self, percentiles=(50, 90, 99)):
+        """Resumen en milisegundos, listo para imprimir o guardar."""
+        out = {"count": self.count, "mean": self.mean() / 1e6, "stddev": self.stddev() / 1e6,
+               "min": (self.min or 0) / 1e6, "max": self.max / 1e6}
+        for p in percentiles:
+            out[f"p{p:g}"] = self.percentile(p) / 1e6
+        return out
+
+    def format(self, percentiles=(50, 90, 99)):
+        s = self.summary(percentiles)
+        pcts = " ".join(f"p{p:g}={s[f'p{p:g}']:.1f}ms" for p in percentiles)
+        return (f"n={s['count']} mean={s['mean']:.1f}ms stddev={s['stddev']:.1f}ms "
+                f"{pcts} max={s['max']:.1f}ms")
+
+    def to_dict(self):
+        """Forma compacta (solo buckets no vacíos) para serializar o enviar."""
+        return {"max_value": self.max_value, "count": self.count, "total": self.total,
+                "total_sq": self.total_sq, "min": self.min, "max": self.max,
+                "buckets": [[i, c] for i, c in enumerate(self.counts) if c]}
+
+    @classmethod
+    def from_dict(cls, d):
+        h = cls(d["max_value"])
+        for i, c in d["buckets"]:
+            h.counts[i] = c
+        h.count, h.total, h.total_sq = d["count"], d["total"], d["total_sq"]
+        h.min, h.max = d["min"], d["max"]
+        return h
@@ -0,0 +1,189 @@
+"""
+mixed.py — mixed workload (WORKLOAD=mixed), the harness' own take on `warp mixed`.
+
+A working set of objects is populated first; then every worker draws
+operations from the configured weights (GET/PUT/STAT/DELETE/LIST) until the
+duration runs out. PUT adds a new object to the working set and DELETE
+removes one, so GETs always target objects that are expected to exist.
+"""
+
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from minio.deleteobjects import DeleteObject
+from minio.error import S3Error
+
+from histogram import LatencyHistogram, now_ns
+from units import MIB, format_size
+
+OPS = ("get", "put", "stat", "delete", "list")
+DEFAULT_WEIGHTS = "get=70,put=20,stat=5,delete=5"
+PREFIX = "mixed/"
+LIST_LIMIT = 1000
+
+def parse_weights(text):
+    weights = dict.fromkeys(OPS, 0)
+    for item in str(text).split(","):
+        if not item.strip():
+            continue
+        op, _, value = item.partition("=")
+        op = op.strip().lower()
+        if op not in weights:
+            raise ValueError(f"unknown operation {op!r} in weights (expected {', '.join(OPS)})")
+        weights[op] = float(value)
+    if sum(weights.values()) <= 0:
+        raise ValueError("at least one operation weight must be positive")
+    return weights
+
+class KeySpace:
+    """Conjunto de llaves vivas compartido entre workers."""
+    def __init__(self):
+        self._keys = []
+        self._lock = threading.Lock()
+        self._next = 0
+
+    def new_key(self):
+        with self._lock:
+            self._next += 1
+            return f"{PREFIX}obj-{self._next:09d}"
+
+    def add(self, key):
+        with self._lock:
+            self._keys.append(key)
+
+    def pick(self, rng):
+        with self._lock:
+            return rng.choice(self._keys) if self._keys else None
+
+    def take(self, rng):
+        with self._lock:
+            if not self._keys:
+                return None
+            i = rng.randrange(len(self._keys))
+            self._keys[i], self._keys[-1] = self._keys[-1], self._keys[i]
+            return self._keys.pop()
+
+    def all(self):
+        with self._lock:
+            return list(self._keys)
+
+class OpStats:
+    def __init__(self):
+        self.hist = LatencyHistogram()
+        self.bytes = 0
+        self.errors = 0
+
+    def merge(self, other):
+        self.hist.merge(other.hist)
+        self.bytes += other.bytes
+        self.errors += other.errors
+
+def populate(make_client, bucket, keys, count, payload, object_size, concurrency):
+    print(f"Populating {count} objects of {format_size(object_size)} with {concurrency} workers...")
+    client = make_client(pool_size=concurrency)
+
+    def put_one(_):
+        key = keys.new_key()
+        client.put_object(bucket, key, payload.stream(object_size), object_size)
+        keys.add(key)
+
+    start = now_ns()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(put_one, range(count)))
+    secs = (now_ns() - start) / 1e9
+    print(f"Populated in {secs:.2f}s ({count / secs:.1f} objects/s)\n")
+
+def mixed_worker(worker_id, client, bucket, keys, weights, deadline_ns, payload, object_size, download, view, seed):
+    rng = random.Random(seed + worker_id)
+    ops = [op for op in OPS if weights[op] > 0]
+    cum, acc = [], 0.0
+    for op in ops:
+        acc += weights[op]
+        cum.append(acc)
+    stats = {op: OpStats() for op in OPS}
+
+    while now_ns() < deadline_ns:
+        op = rng.choices(ops, cum_weights=cum)[0]
+        s = stats[op]
+        start = now_ns()
+        try:
+            if op == "put":
+                key = keys.new_key()
+                client.put_object(bucket, key, payload.stream(object_size), object_size)
+                s.bytes += object_size
+                keys.add(key)
+            elif op == "get":
+                key = keys.pick(rng)
+                if key is None:
+                    continue
+                nbytes, _ = download(client, key, view)
+                s.bytes += nbytes
+            elif op == "stat":
+                key = keys.pick(rng)
+                if key is None:
+                    continue
+                client.stat_object(bucket, key)
+            elif op == "delete":
+                key = keys.take(rng)
+                if key is None:
+                    continue
+                client.remove_object(bucket, key)
+            else:
+                for _ in islice(client.list_objects(bucket, prefix=PREFIX, recursive=True), LIST_LIMIT):
+                    pass
+        except S3Error:
+            # p.ej. un GET sobre un objeto que otro worker acaba de borrar
+            s.errors += 1
+            continue
+        s.hist.record_since(start)
+    return stats
+
+def cleanup(client, bucket, keys):
+    errors = client.remove_objects(bucket, (DeleteObject(k) for k in keys.all()))
+    for err in errors:
+        print(f"cleanup: {err}")
+
+def run_mixed(make_client, bucket, object_size, payload, download, concurrency,
+              object_count, weights, duration, chunk_size, seed=0):
+    total = sum(weights.values())
+    mix = ", ".join(f"{op.upper()} {weights[op] / total * 100:.0f}%" for op in OPS if weights[op] > 0)
+    print(f"Mixed workload: {concurrency} workers, {duration:.0f}s, {mix}")
+
+    keys = KeySpace()
+    populate(make_client, bucket, keys, object_count, payload, object_size, concurrency)
+
+    client = make_client(pool_size=concurrency)
+    start = now_ns()
+    deadline = start + int(duration * 1e9)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [
+            pool.submit(mixed_worker, w, client, bucket, keys, weights, deadline, payload,
+                        object_size, download, memoryview(bytearray(chunk_size)), seed)
+            for w in range(concurrency)
+        ]
+        per_worker = [f.result() for f in futures]
+    wall = (now_ns() - start) / 1e9
+
+    totals = {op: OpStats() for op in OPS}
+    for stats in per_worker:
+        for op in OPS:
+            totals[op].merge(stats[op])
+    report_mixed(totals, wall)
+
+    cleanup(client, bucket, keys)
+    return totals, wall
+
+def report_mixed(totals, wall):
+    print(f"\nMixed results ({wall:.2f}s):")
+    all_ops = 0
+    for op in OPS:
+        s = totals[op]
+        if not s.hist.count and not s.errors:
+            continue
+        all_ops += s.hist.count
+        rate = f"{s.bytes / MIB / wall:8.1f} MiB/s" if s.bytes else " " * 14
+        print(f"  {op.upper():<6} {s.hist.count:>8} ops {s.hist.count / wall:9.1f} ops/s {rate} "
+              f"errors {s.errors:<4} {s.hist.format()}")
+    print(f"  Total: {all_ops} ops, {all_ops / wall:.1f} ops/s")
@@ -0,0 +1,191 @@
+"""
+namespace.py — namespace / metadata workload (WORKLOAD=namespace): LIST, pagination and STAT at scale.
+
+Objects are spread round-robin over a prefix tree of NS_DEPTH levels with
+NS_FANOUT children each (ns/p03/p07/obj-000000123). The bucket grows in
+stages (NS_OBJECTS="1000,10000,100000", cumulative) and after every stage:
+
+  LIST-RECURSIVE  the whole tree in one recursive listing: objects/s and cost per page
+  LIST-WALK       the same tree walked with delimiter "/", one listing per prefix
+  LIST-LEAF       non-recursive listing of a random leaf prefix (NS_SAMPLES times)
+  STAT            stat_object on random existing keys (NS_SAMPLES times, CONCURRENCY workers)
+
+S3 pages hold up to 1000 entries (objects + common prefixes); a page's cost is
+the time spent iterating its entries, which includes the request that
+fetched it and parsing its XML.
+"""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from minio.deleteobjects import DeleteObject
+
+from histogram import LatencyHistogram, now_ns
+from units import format_size
+
+ROOT = "ns/"
+PAGE_SIZE = 1000
+
+class PrefixTree:
+    def __init__(self, depth=2, fanout=10):
+        self.depth = depth
+        self.fanout = fanout
+        self.leaves = [ROOT]
+        for _ in range(depth):
+            self.leaves = [f"{p}p{i:02d}/" for p in self.leaves for i in range(fanout)]
+
+    def key(self, n):
+        return f"{self.leaves[n % len(self.leaves)]}obj-{n:09d}"
+
+    def describe(self):
+        return f"depth {self.depth} x fan-out {self.fanout} = {len(self.leaves)} leaf prefixes"
+
+def populate(client, bucket, tree, start, stop, payload, object_size, workers):
+    def put_one(n):
+        client.put_object(bucket, tree.key(n), payload.stream(object_size), object_size)
+
+    t0 = now_ns()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(put_one, range(start, stop)))
+    secs = (now_ns() - t0) / 1e9
+    print(f"Populated {stop - start} objects ({start} -> {stop}) in {secs:.2f}s "
+          f"({(stop - start) / secs:.1f} objects/s, {workers} workers)")
+    return secs
+
+def timed_listing(client, bucket, prefix, recursive, pages=None):
+    """Recorre un listado; devuelve (entradas, segundos). `pages` recibe el costo de cada página."""
+    entries = 0
+    start = page_start = now_ns()
+    for _ in client.list_objects(bucket, prefix=prefix, recursive=recursive):
+        entries += 1
+        if entries % PAGE_SIZE == 0 and pages is not None:
+            pages.record_since(page_start)
+            page_start = now_ns()
+    if pages is not None and entries % PAGE_SIZE:
+        pages.record_since(page_start)
+    return entries, (now_ns() - start) / 1e9
+
+def walk(client, bucket, prefix, calls):
+    """Listado con delimitador, bajando por cada prefijo común. Devuelve los objetos vistos."""
+    objects = 0
+    start = now_ns()
+    children = []
+    for obj in client.list_objects(bucket, prefix=prefix, recursive=False):
+        if obj.is_dir:
+            children.append(obj.object_name)
+        else:
+            objects += 1
+    calls.record_since(start)
+    for child in children:
+        objects += walk(client, bucket, child, calls)
+    return objects
+
+class StageResult:
+    def __init__(self, objects):
+        self.objects = objects
+        self.populate_secs = 0.0
+        self.pages = LatencyHistogram()
+        self.list_secs = 0.0
+        self.listed = 0
+        self.walk_calls = LatencyHistogram()
+        self.walk_secs = 0.0
+        self.leaf = LatencyHistogram()
+        self.stat = LatencyHistogram()
+
+    def list_rate(self):
+        return self.listed / self.list_secs if self.list_secs else 0.0
+
+def measure(client, bucket, tree, count, samples, concurrency, seed):
+    r = StageResult(count)
+    r.listed, r.list_secs = timed_listing(client, bucket, ROOT, True, r.pages)
+    if r.listed != count:
+        print(f"  warning: recursive LIST returned {r.listed} objects, expected {count}")
+
+    start = now_ns()
+    walked = walk(client, bucket, ROOT, r.walk_calls)
+    r.walk_secs = (now_ns() - start) / 1e9
+    if walked != count:
+        print(f"  warning: delimiter walk found {walked} objects, expected {count}")
+
+    rng = random.Random(seed)
+    for prefix in (rng.choice(tree.leaves) for _ in range(min(samples, 10 * len(tree.leaves)))):
+        start = now_ns()
+        timed_listing(client, bucket, prefix, False)
+        r.leaf.record_since(start)
+
+    keys = [tree.key(rng.randrange(count)) for _ in range(samples)]
+
+    def stat_chunk(chunk):
+        hist = LatencyHistogram()
+        for key in chunk:
+            start = now_ns()
+            client.stat_object(bucket, key)
+            hist.record_since(start)
+        return hist
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for hist in pool.map(stat_chunk, [keys[w::concurrency] for w in range(concurrency)]):
+            r.stat.merge(hist)
+    return r
+
+def run_namespace(make_client, bucket, stages, payload, object_size, concurrency,
+                  depth=2, fanout=10, samples=1000, populate_workers=32, keep=False, seed=0):
+    tree = PrefixTree(depth, fanout)
+    print(f"Namespace workload: {tree.describe()}, stages {', '.join(map(str, stages))} objects "
+          f"of {format_size(object_size) if object_size else '0 bytes'}, {samples} samples per stage\n")
+    workers = max(populate_workers, concurrency)
+    client = make_client(pool_size=workers)
+    results = []
+    have = 0
+    try:
+        for count in stages:
+            secs = populate(client, bucket, tree, have, count, payload, object_size, workers) if count > have else 0.0
+            have = max(have, count)
+            r = measure(client, bucket, tree, count, samples, concurrency, seed)
+            r.populate_secs = secs
+            results.append(r)
+            print(f"  {count:>9} objects: LIST {r.list_rate():9.0f} objects/s "
+                  f"(page p50 {r.pages.percentile(50)/1e6:.1f}ms), walk {r.walk_secs:.2f}s, "
+                  f"leaf LIST p50 {r.leaf.percentile(50)/1e6:.2f}ms, STAT p50 {r.stat.percentile(50)/1e6:.2f}ms\n")
+    finally:
+        if not keep:
+            cleanup(client, bucket, tree, have)
+    report_namespace(results)
+    return results
+
+def cleanup(client, bucket, tree, count):
+    # DeleteObjects en lotes de 1000 (lo hace el SDK)
+    errors = client.remove_objects(bucket, (DeleteObject(tree.key(n)) for n in range(count)))
+    for err in errors:
+        print(f"cleanup: {err}")
+
+def report_namespace(results):
+    print("\nNamespace results (latencies p50 / p99):")
+    print(f"{'objects':>10} {'LIST obj/s':>11} {'page':>17} {'walk':>8} {'walk call':>17} "
+          f"{'leaf LIST':>17} {'STAT':>17}")
+
+    def pair(hist):
+        return f"{hist.percentile(50)/1e6:6.2f}/{hist.percentile(99)/1e6:7.2f}ms"
+
+    for r in results:
+        print(f"{r.objects:>10} {r.list_rate():>11.0f} {pair(r.pages):>17} {r.walk_secs:>7.2f}s "
+              f"{pair(r.walk_calls):>17} {pair(r.leaf):>17} {pair(r.stat):>17}")
+    if len(results) > 1:
+        first, last = results[0], results[-1]
+        growth = last.objects / first.objects
+        stat_growth = last.stat.percentile(50) / first.stat.percentile(50) if first.stat.percentile(50) else 0.0
+        print(f"\nObjects x{growth:g}: STAT p50 x{stat_growth:.2f}, "
+              f"leaf LIST p50 x{last.leaf.percentile(50) / max(1, first.leaf.percentile(50)):.2f}, "
+              f"LIST throughput x{last.list_rate() / first.list_rate() if first.list_rate() else 0:.2f}")
+
+def namespace_rows(results, histogram_row):
+    """Filas <OP>@<objetos> (LIST-PAGE, LIST-WALK, LIST-LEAF, STAT) para el results store."""
+    rows = []
+    for r in results:
+        extra = {"objects": r.objects, "populate_seconds": r.populate_secs}
+        rows.append(histogram_row(f"LIST-PAGE@{r.objects}", r.pages, r.list_secs,
+                                  extra={**extra, "objects_per_sec": r.list_rate()}))
+        rows.append(histogram_row(f"LIST-WALK@{r.objects}", r.walk_calls, r.walk_secs, extra=extra))
+        rows.append(histogram_row(f"LIST-LEAF@{r.objects}", r.leaf, extra=extra))
+        rows.append(histogram_row(f"STAT@{r.objects}", r.stat, extra=extra))
+    return rows
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+nulls3.py — null S3 endpoint to calibrate the harness' own ceiling.
+
+Speaks just enough S3 for benchmark.py (both engines), mixed.py and the
+sweeps: PUT bodies are read and discarded (only the size is remembered),
+GET streams that many bytes from one static zero buffer, HEAD/DELETE/
+multipart/DeleteObjects answer with canned responses. No auth, no storage:
+whatever throughput a run reaches against it is the most the client side
+(SDK, payload, measurement loop) can do for that engine, concurrency and
+object size.
+
+It runs as separate process(es) sharing the port with SO_REUSEPORT, so it
+does not compete with the harness for the GIL. Sizes are remembered per
+process; a GET for a key the process did not see is served with
+--object-size bytes.
+
+  python3 nulls3.py --port 9100 [--processes 2] [--object-size 1MB]
+  python3 nulls3.py calibrate [--engines sync,async] [--concurrency 1,4,16] [--object-size 1MB]
+
+`calibrate` runs benchmark.py against it for every engine x concurrency and
+stores the runs under MinIO version "null-s3"; benchmark.py then prints
+every real result next to the matching ceiling (NULL_S3=1 runs a single
+benchmark against it).
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from units import parse_int_list, parse_size
+
+NULL_VERSION = "null-s3"
+DEFAULT_PORT = 9100
+SCRIPT = Path(__file__).resolve()
+_ZEROS = memoryview(bytes(1024 * 1024))
+_XML = b'<?xml version="1.0" encoding="UTF-8"?>\n'
+_FIXED = (b"ETag: \"00000000000000000000000000000000\"\r\n"
+          b"Last-Modified: Wed, 01 Jan 2020 00:00:00 GMT\r\n"
+          b"Server: nulls3\r\n")
+
+def _head(status, length, content_type=None):
+    out = [f"HTTP/1.1 {status}\r\nContent-Length: {length}\r\n".encode(), _FIXED]
+    if content_type:
+        out.append(f"Content-Type: {content_type}\r\n".encode())
+    out.append(b"\r\n")
+    return b"".join(out)
+
+def _xml(status, body):
+    body = _XML + body.encode()
+    return _head(status, len(body), "application/xml") + body
+
+class NullS3:
+    def __init__(self, default_size):
+        self.default_size = default_size
+        self.sizes = {}
+        self.uploads = {}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, target, _ = line.decode("latin-1").split(" ", 2)
+                length, close = 0, False
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = h.partition(b":")
+                    name = name.strip().lower()
+                    if name == b"content-length":
+                        length = int(value)
+                    elif name == b"connection" and value.strip().lower() == b"close":
+                        close = True
+                body = b""
+                if length:
+                    # Se lee y se descarta; solo se guarda lo necesario para multipart y DeleteObjects
+                    keep = method == "POST"
+                    chunks, left = [], length
+                    while left:
+                        data = await reader.read(min(left, 1 << 20))
+                        if not data:
+                            return
+                        left -= len(data)
+                        if keep:
+                            chunks.append(data)
+                    body = b"".join(chunks)
+                await self.respond(writer, method, target, length, body)
+                if close:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, method, target, length, body):
+        u = urlsplit(target)
+        bucket, _, key = unquote(u.path).lstrip("/").partition("/")
+        q = parse_qs(u.query, keep_blank_values=True)
+        if method == "PUT":
+            if key and "uploadId" in q:
+                self.uploads.setdefault(q["uploadId"][0], 0)
+                self.uploads[q["uploadId"][0]] += length
+            elif key:
+                self.sizes[(bucket, key)] = length
+            writer.write(_head("200 OK", 0))
+        elif method == "GET" and not key:
+            if "location" in q:
+                writer.write(_xml("200 OK", "<LocationConstraint></LocationConstraint>"))
+            else:
+                writer.write(_xml("200 OK", f"<ListBucketResult><Name>{bucket}</Name>"
+                                            "<IsTruncated>false</IsTruncated></ListBucketResult>"))
+        elif method == "GET":
+            size = self.sizes.get((bucket, key), self.default_size)
+            writer.write(_head("200 OK", size, "application/octet-stream"))
+            while size:
+                n = min(size, len(_ZEROS))
+                writer.write(_ZEROS[:n])
+                size -= n
+                await writer.drain()
+        elif method == "HEAD":
+            size = self.sizes.get((bucket, key), self.default_size) if key else 0
+            writer.write(_head("200 OK", size))
+        elif method == "DELETE":
+            self.sizes.pop((bucket, key), None)
+            writer.write(_head("204 No Content", 0))
+        elif method == "POST":
+            if "uploads" in q:
+                upload_id = os.urandom(8).hex()
+                self.uploads[upload_id] = 0
+                writer.write(_xml("200 OK", f"<InitiateMultipartUploadResult><Bucket>{bucket}</Bucket>"
+                                            f"<Key>{key}</Key><UploadId>{upload_id}</UploadId>"
+                                            "</InitiateMultipartUploadResult>"))
+            elif "uploadId" in q:
+                self.sizes[(bucket, key)] = self.uploads.pop(q["uploadId"][0], 0)
+                writer.write(_xml("200 OK", f"<CompleteMultipartUploadResult><Bucket>{bucket}</Bucket>"
+                                            f"<Key>{key}</Key><ETag>\"0-1\"</ETag>"
+                                            "</CompleteMultipartUploadResult>"))
+            else:
+                writer.write(_xml("200 OK", "<DeleteResult></DeleteResult>"))
+        else:
+            writer.write(_head("405 Method Not Allowed", 0))
+        await writer.drain()
+
+async def _serve(host, port, default_size):
+    null = NullS3(default_size)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if hasattr(socket, "SO_REUSEPORT"):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    server = await asyncio.start_server(null.handle, sock=sock, backlog=4096)
+    async with server:
+        await server.serve_forever()
+
+def serve(host="127.0.0.1", port=DEFAULT_PORT, default_size=1024 * 1024):
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    asyncio.run(_serve(host, port, default_size))
+
+class NullServer:
+    """Procesos del servidor nulo en segundo plano; usar como context manager o llamar stop()."""
+    def __init__(self, port=DEFAULT_PORT, processes=1, default_size=1024 * 1024, host="127.0.0.1"):
+        self.endpoint = f"{host}:{port}"
+        self.procs = [subprocess.Popen([sys.executable, str(SCRIPT), "serve", "--host", host, "--port", str(port),
+                                        "--processes", "1", "--object-size", str(default_size)])
+                      for _ in range(processes)]
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection((host, port), timeout=0.2).close()
+                return
+            except OSError:
+                time.sleep(0.02)
+        self.stop()
+        raise RuntimeError(f"null S3 server did not start on {self.endpoint}")
+
+    def stop(self):
+        for p in self.procs:
+            p.terminate()
+        for p in self.procs:
+            p.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def calibrate(engines, concurrencies, object_size, port, processes, env=os.environ):
+    """Corre benchmark.py contra el servidor nulo para cada engine x concurrencia."""
+    with NullServer(port, processes, parse_size(object_size)) as server:
+        for engine in engines:
+            for c in concurrencies:
+                print(f"\n=== Ceiling: engine {engine}, concurrency {c}, {object_size} ===")
+                run_env = {**env, "MINIO_ENDPOINT": server.endpoint, "MINIO_VERSION": NULL_VERSION,
+                           "ENGINE": engine, "CONCURRENCY": str(c), "OBJECT_SIZE": object_size,
+                           "TELEMETRY": "off", "NULL_S3": ""}
+                subprocess.run([sys.executable, str(SCRIPT.parent / "benchmark.py")], env=run_env, check=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Null S3 endpoint and harness ceiling calibration.")
+    parser.add_argument("role", nargs="?", default="serve", choices=("serve", "calibrate"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--processes", type=int, default=int(os.environ.get("NULL_S3_PROCESSES", "2")),
+                        help="Server processes sharing the port (default: $NULL_S3_PROCESSES or 2)")
+    parser.add_argument("--object-size", default=os.environ.get("OBJECT_SIZE", "1MB"),
+                        help="Size served for keys this process has not seen (default: $OBJECT_SIZE or 1MB)")
+    parser.add_argument("--engines", default="sync,async", help="calibrate: engines (default: sync,async)")
+    parser.add_argument("--concurrency", default="1,4,16", help="calibrate: concurrency levels (default: 1,4,16)")
+    args = parser.parse_args()
+
+    if args.role == "calibrate":
+        try:
+            calibrate([e.strip() for e in args.engines.split(",") if e.strip()],
+                      parse_int_list(args.concurrency), args.object_size, args.port, args.processes)
+        except (RuntimeError, subprocess.CalledProcessError) as e:
+            print(f"Calibration failed: {e}", file=sys.stderr)
+            return 1
+        return 0
+    if args.processes > 1:
+        with NullServer(args.port, args.processes, parse_size(args.object_size), args.host):
+            print(f"Null S3 listening on {args.host}:{args.port} ({args.processes} processes)")
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                return 0
+    serve(args.host, args.port, parse_size(args.object_size))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+openloop.py — open-loop load (WORKLOAD=openloop): requests at a fixed arrival rate.
+
+The closed loop (and `warp put --concurrent N`) sends the next request only
+when the previous one is done, so a server stall also stalls the client and
+the stall never shows up in the latencies (coordinated omission). Here every
+request has an intended start time from a schedule, constant (every 1/rate)
+or Poisson (exponential gaps, seeded), and latency is measured from that
+intended start: time spent queued behind a slow server counts.
+
+Workers take the next intended time from the shared schedule, sleep until
+it comes and run the request; if all of them are busy the request starts
+late and the lateness is part of its latency. Requests whose intended time
+is still unserved OPEN_GRACE after the step ends are counted as missed.
+
+OPEN_RATES steps through increasing rates (e.g. "20,40,80,160") and the
+report points at the knee: the first rate the server could not sustain
+(fewer than 95% of the scheduled requests completed) or where p99 jumped
+(x3 over the lowest p99).
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from minio.error import S3Error
+from urllib3.exceptions import HTTPError
+
+from histogram import LatencyHistogram, now_ns
+
+ARRIVALS = ("constant", "poisson")
+OPS = ("put", "get")
+
+class Schedule:
+    """Tiempos de inicio previstos (ns), compartidos por todos los workers."""
+    def __init__(self, rate, arrivals="constant", start_ns=None, duration=10.0, seed=0):
+        if arrivals not in ARRIVALS:
+            raise ValueError(f"OPEN_ARRIVALS must be one of {', '.join(ARRIVALS)}, got {arrivals!r}")
+        self.rate = rate
+        self.poisson = arrivals == "poisson"
+        self.start = start_ns if start_ns is not None else now_ns()
+        self.end = self.start + int(duration * 1e9)
+        self._rng = random.Random(seed)
+        self._next = float(self.start)
+        self._lock = threading.Lock()
+        self.issued = 0
+
+    def next(self):
+        """Próximo inicio previsto, o None si ya cae fuera del paso."""
+        with self._lock:
+            t = self._next
+            if t >= self.end:
+                return None
+            gap = self._rng.expovariate(self.rate) if self.poisson else 1.0 / self.rate
+            self._next += gap * 1e9
+            self.issued += 1
+            return int(t)
+
+def _sleep_until(t_ns):
+    left = t_ns - now_ns()
+    if left > 0:
+        time.sleep(left / 1e9)
+
+class StepResult:
+    def __init__(self, rate):
+        self.rate = rate
+        self.latency = LatencyHistogram()  # desde el inicio previsto
+        self.service = LatencyHistogram()  # desde el inicio real
+        self.late = LatencyHistogram()     # inicio real - previsto
+        self.errors = 0
+        self.missed = 0
+        self.bytes = 0
+        self.wall = 0.0
+        self.issued = 0  # con llegadas Poisson no es exactamente rate * duración
+
+    def merge(self, other):
+        self.latency.merge(other.latency)
+        self.service.merge(other.service)
+        self.late.merge(other.late)
+        self.errors += other.errors
+        self.missed += other.missed
+        self.bytes += other.bytes
+
+    def achieved(self):
+        return self.latency.count / self.wall if self.wall else 0.0
+
+    def sustained(self):
+        return self.latency.count >= 0.95 * self.issued and not self.missed
+
+def _open_worker(worker_id, client, bucket, op, schedule, grace_ns, payload, object_size, download, view):
+    r = StepResult(schedule.rate)
+    object_name = f"openloop-w{worker_id}" if op == "put" else "openloop-get"
+    while True:
+        intended = schedule.next()
+        if intended is None:
+            break
+        _sleep_until(intended)
+        start = now_ns()
+        if start > schedule.end + grace_ns:
+            # El servidor va tan atrasado que este pedido ya no cuenta como carga del paso
+            r.missed += 1
+            continue
+        try:
+            if op == "put":
+                client.put_object(bucket, object_name, payload.stream(object_size), object_size)
+                r.bytes += object_size
+            else:
+                nbytes, _ = download(client, object_name, view)
+                r.bytes += nbytes
+        except (S3Error, HTTPError):
+            # Timeouts y 503 SlowDown bajo sobrecarga cuentan como errores del paso
+            r.errors += 1
+            continue
+        end = now_ns()
+        r.latency.record(end - intended)
+        r.service.record(end - start)
+        r.late.record(start - intended)
+    return r
+
+def run_step(client, bucket, op, rate, arrivals, duration, workers, grace, payload, object_size,
+             download, chunk_size, seed=0):
+    schedule = Schedule(rate, arrivals, now_ns() + 50_000_000, duration, seed)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_open_worker, w, client, bucket, op, schedule, int(grace * 1e9), payload,
+                               object_size, download, memoryview(bytearray(chunk_size)))
+                   for w in range(workers)]
+        per_worker = [f.result() for f in futures]
+    total = StepResult(rate)
+    for r in per_worker:
+        total.merge(r)
+    total.wall = duration
+    total.issued = schedule.issued
+    return total
+
+def find_knee(steps):
+    """Primer paso no sostenible: < 95% de lo emitido completado, errores/perdidos, o p99 x3 sobre el mínimo."""
+    best_p99 = None
+    for i, s in enumerate(steps):
+        p99 = s.latency.percentile(99)
+        if not s.sustained() or s.errors:
+            return i, f"completed {s.latency.count} of {s.issued} scheduled requests"
+        if best_p99 and p99 > 3 * best_p99:
+            return i, f"p99 {p99/1e6:.1f}ms is x{p99 / best_p99:.1f} the lowest"
+        best_p99 = min(best_p99, p99) if best_p99 else p99
+    return None, None
+
+def run_openloop(make_client, bucket, op, rates, arrivals, duration, workers, payload, object_size,
+                 download, chunk_size, grace=None, slo_p99_ms=None, seed=0):
+    if op not in OPS:
+        raise ValueError(f"OPEN_OP must be one of {', '.join(OPS)}, got {op!r}")
+    grace = min(duration, 5.0) if grace is None else grace
+    print(f"Open-loop {op.upper()}: {arrivals} arrivals, rates {', '.join(f'{r:g}' for r in rates)} ops/s, "
+          f"{duration:g}s per step, up to {workers} requests in flight\n")
+    client = make_client(pool_size=workers)
+    if op == "get":
+        client.put_object(bucket, "openloop-get", payload.stream(object_size), object_size)
+    steps = []
+    try:
+        for i, rate in enumerate(rates):
+            s = run_step(client, bucket, op, rate, arrivals, duration, workers, grace, payload,
+                         object_size, download, chunk_size, seed + i)
+            steps.append(s)
+            print(f"  {rate:>8g} ops/s target: {s.achieved():8.1f} achieved, latency p50 "
+                  f"{s.latency.percentile(50)/1e6:7.1f}ms p99 {s.latency.percentile(99)/1e6:7.1f}ms "
+                  f"(service p99 {s.service.percentile(99)/1e6:.1f}ms), missed {s.missed}, errors {s.errors}")
+    finally:
+        if op == "get":
+            client.remove_object(bucket, "openloop-get")
+        else:
+            for w in range(workers):
+                client.remove_object(bucket, f"openloop-w{w}")
+    report_openloop(steps, slo_p99_ms)
+    return steps
+
+def report_openloop(steps, slo_p99_ms=None):
+    print("\nLatency vs. offered load (latency from intended start; service = from actual start):")
+    print(f"{'target':>9} {'achieved':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'p99.9':>9} "
+          f"{'svc p99':>9} {'late p99':>9} {'missed':>7} {'errors':>7}")
+    for s in steps:
+        lat = s.latency
+        print(f"{s.rate:>9g} {s.achieved():>9.1f} {lat.percentile(50)/1e6:>7.1f}ms "
+              f"{lat.percentile(90)/1e6:>7.1f}ms {lat.percentile(99)/1e6:>7.1f}ms "
+              f"{lat.percentile(99.9)/1e6:>7.1f}ms {s.service.percentile(99)/1e6:>7.1f}ms "
+              f"{s.late.percentile(99)/1e6:>7.1f}ms {s.missed:>7} {s.errors:>7}")
+    knee, reason = find_knee(steps)
+    if knee is None:
+        print(f"\nNo knee up to {steps[-1].rate:g} ops/s: every step was sustained")
+    elif knee == 0:
+        print(f"\nKnee below {steps[0].rate:g} ops/s ({reason}): start the steps lower")
+    else:
+        print(f"\nKnee between {steps[knee - 1].rate:g} and {steps[knee].rate:g} ops/s ({reason})")
+    if slo_p99_ms:
+        ok = [s.rate for s in steps if s.latency.percentile(99) / 1e6 <= slo_p99_ms
+              and s.sustained()]
+        print(f"Highest rate meeting p99 <= {slo_p99_ms:g}ms: " + (f"{max(ok):g} ops/s" if ok else "none"))
+
+def openloop_rows(steps, op, histogram_row):
+    """Filas <OP>@<rate>ops (latencia desde el inicio previsto) y <OP>-SERVICE@<rate>ops."""
+    rows = []
+    name = op.upper()
+    for s in steps:
+        extra = {"target_rate": s.rate, "achieved_rate": s.achieved(), "missed": s.missed,
+                 "late_p99_ms": s.late.percentile(99) / 1e6}
+        mibps = s.bytes / 1048576 / s.wall if s.wall else None
+        rows.append(histogram_row(f"{name}@{s.rate:g}ops", s.latency, s.wall, mibps, s.errors + s.missed, extra))
+        rows.append(histogram_row(f"{name}-SERVICE@{s.rate:g}ops", s.service, s.wall))
+    return rows
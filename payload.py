@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+payload.py — upload payloads prepared once and served without per-read allocations.
+
+Modes:
+  constant      one repeated byte (the old FakeStream behaviour, trivially compressible)
+  random        incompressible pseudo-random bytes (seeded, reproducible)
+  compressible  random/zero mix that compresses roughly `ratio`:1
+
+The buffer is built once per Payload. PayloadStream.readinto() copies straight
+from a memoryview slice of it, and PayloadStream.read(n) hands back the same
+immutable bytes object for every call of a given size, which is what
+minio.put_object() asks for (it reads exactly one part per call).
+
+Content is a pure function of the offset (data[offset % capacity]), so a
+download can be checked as it streams: Verifier keeps a running zlib.crc32
+over the received chunks and compares it with Payload.crc32(size) (VERIFY=1
+in benchmark.py).
+
+Self-benchmark:
+  python3 payload.py [--size 1GiB] [--capacity 5MiB]
+"""
+
+import argparse
+import io
+import random
+import time
+import zlib
+
+from units import MIB, parse_size
+
+MODES = ("constant", "random", "compressible")
+BLOCK = 4096
+
+def _build(mode, capacity, ratio, seed):
+    if mode == "constant":
+        return b"x" * capacity
+    rng = random.Random(seed)
+    if mode == "random":
+        return rng.randbytes(capacity)
+    if mode == "compressible":
+        # Cada bloque de 4KiB: 1/ratio aleatorio y el resto ceros
+        ratio = max(1.0, float(ratio))
+        noisy = max(1, int(BLOCK / ratio))
+        # Varios bloques distintos para que no se deduplique todo a uno solo
+        blocks = [rng.randbytes(noisy) + bytes(BLOCK - noisy) for _ in range(16)]
+        out = bytearray()
+        while len(out) < capacity:
+            out += blocks[len(out) // BLOCK % len(blocks)]
+        return bytes(out[:capacity])
+    raise ValueError(f"unknown payload mode {mode!r} (expected one of {', '.join(MODES)})")
+
+class Payload:
+    def __init__(self, capacity, mode="random", ratio=2.0, seed=0):
+        self.capacity = max(1, int(capacity))
+        self.mode = mode
+        self.data = _build(mode, self.capacity, ratio, seed)
+        self.view = memoryview(self.data)
+        self._exact = {len(self.data): self.data}
+        self._crc = {}
+
+    def chunk(self, n):
+        """bytes de largo n; se crea una sola vez por tamaño y luego se reutiliza."""
+        b = self._exact.get(n)
+        if b is None:
+            b = self._exact.setdefault(n, bytes(self.view[:n]))
+        return b
+
+    def stream(self, size):
+        return PayloadStream(self, size)
+
+    def crc32(self, size):
+        """CRC32 de un stream de `size` bytes (se calcula una vez por tamaño)."""
+        crc = self._crc.get(size)
+        if crc is None:
+            crc, full = 0, self.capacity
+            for _ in range(size // full):
+                crc = zlib.crc32(self.view, crc)
+            crc = self._crc.setdefault(size, zlib.crc32(self.view[:size % full], crc))
+        return crc
+
+class PayloadStream(io.RawIOBase):
+    """Stream de `size` bytes respaldado por un Payload compartido (thread-safe para lectura).
+
+    El byte en la posición o es siempre data[o % capacity], lea quien lea y
+    en trozos del tamaño que sea: así el contenido subido es verificable.
+    """
+    def __init__(self, payload, size):
+        self.payload = payload
+        self.remaining = size
+        self.pos = 0
+    def readable(self):
+        return True
+    def read(self, n=-1):
+        if self.remaining <= 0:
+            return b""
+        if n is None or n < 0:
+            n = self.remaining
+        n = min(n, self.remaining, self.payload.capacity - self.pos)
+        self.remaining -= n
+        if self.pos == 0:
+            # El caso de put_object: una parte entera por llamada, sin copiar
+            out = self.payload.chunk(n)
+        else:
+            out = bytes(self.payload.view[self.pos:self.pos + n])
+        self.pos = (self.pos + n) % self.payload.capacity
+        return out
+    def readinto(self, b):
+        if self.remaining <= 0:
+            return 0
+        n = min(len(b), self.remaining, self.payload.capacity - self.pos)
+        memoryview(b)[:n] = self.payload.view[self.pos:self.pos + n]
+        self.pos = (self.pos + n) % self.payload.capacity
+        self.remaining -= n
+        return n
+
+class Verifier:
+    """CRC32 incremental de una descarga, trozo a trozo, contra el del payload subido."""
+    def __init__(self, payload, size):
+        self.size = size
+        self.expected = payload.crc32(size)
+        self.crc = 0
+        self.nbytes = 0
+        self.ns = 0
+
+    def update(self, chunk):
+        start = time.perf_counter_ns()
+        self.crc = zlib.crc32(chunk, self.crc)
+        self.ns += time.perf_counter_ns() - start
+        self.nbytes += len(chunk)
+
+    def ok(self):
+        return self.nbytes == self.size and self.crc == self.expected
+
+    def describe(self):
+        if self.nbytes != self.size:
+            return f"truncated: got {self.nbytes} of {self.size} bytes"
+        return f"corrupt: crc32 {self.crc:08x}, expected {self.expected:08x}"
+
+def payload_from_env(env, object_size, part_size=0):
+    """Construye el Payload según PAYLOAD / PAYLOAD_RATIO / PAYLOAD_SEED.
+
+    La capacidad es el tamaño de parte que usará minio.put_object, así cada
+    read() del SDK se sirve del mismo buffer.
+    """
+    from minio.helpers import get_part_info
+    capacity, _ = get_part_info(object_size, part_size)
+    return Payload(
+        capacity,
+        mode=env.get("PAYLOAD", "random").lower(),
+        ratio=float(env.get("PAYLOAD_RATIO", "2.0")),
+        seed=int(env.get("PAYLOAD_SEED", "0")),
+    )
+
+class _LegacyFakeStream(io.RawIOBase):
+    # Copia del FakeStream original, solo para comparar en el self-benchmark
+    def __init__(self, size):
+        self.remaining = size
+    def readable(self):
+        return True
+    def read(self, n=-1):
+        if self.remaining <= 0:
+            return b""
+        chunk = min(n, self.remaining)
+        self.remaining -= chunk
+        return b"x" * chunk
+
+def _drain(stream, chunk):
+    start = time.perf_counter()
+    total = 0
+    while True:
+        data = stream.read(chunk)
+        if not data:
+            break
+        total += len(data)
+    return total, time.perf_counter() - start
+
+def self_benchmark(size, capacity, line_rate_mibps):
+    print(f"Streaming {size / MIB:.0f} MiB per mode in {capacity / MIB:.1f} MiB reads "
+          f"(reference network path: {line_rate_mibps:.0f} MiB/s)\n")
+    total, secs = _drain(_LegacyFakeStream(size), capacity)
+    legacy = total / MIB / secs
+    print(f"  {'legacy FakeStream':<18} {legacy:10.0f} MiB/s")
+    for mode in MODES:
+        t0 = time.perf_counter()
+        p = Payload(capacity, mode=mode)
+        setup = time.perf_counter() - t0
+        total, secs = _drain(p.stream(size), capacity)
+        rate = total / MIB / secs
+        sample = p.data[:min(len(p.data), 4 * MIB)]
+        ratio = len(sample) / len(zlib.compress(sample, 1))
+        print(f"  {mode:<18} {rate:10.0f} MiB/s  setup {setup*1000:6.1f}ms  "
+              f"zlib ratio {ratio:6.2f}:1  {rate / line_rate_mibps:8.0f}x network  "
+              f"{rate / legacy:6.0f}x legacy")
+    p = Payload(capacity)
+    check = Verifier(p, size)
+    stream, buf = p.stream(size), bytearray(MIB)
+    while True:
+        n = stream.readinto(buf)
+        if not n:
+            break
+        check.update(memoryview(buf)[:n])
+    rate = size / MIB / (check.ns / 1e9)
+    print(f"\n  crc32 verify (1MiB chunks) {rate:10.0f} MiB/s  {rate / line_rate_mibps:8.1f}x network  "
+          f"{'ok' if check.ok() else 'MISMATCH'}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Self-benchmark of the payload generator.")
+    parser.add_argument("--size", default="1GiB", help="Bytes streamed per mode (default: 1GiB)")
+    parser.add_argument("--capacity", default="5MiB", help="Read/part size (default: 5MiB, SDK default part)")
+    parser.add_argument("--line-rate", type=float, default=1192.0,
+                        help="Network path to compare against, MiB/s (default: 10GbE = 1192)")
+    args = parser.parse_args()
+    self_benchmark(parse_size(args.size), parse_size(args.capacity), args.line_rate)
+
+if __name__ == "__main__":
+    main()
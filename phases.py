@@ -0,0 +1,279 @@
+"""
+phases.py — opt-in client-side breakdown of every SDK request (PROFILE_PHASES=1).
+
+Each request made through the `minio` client is split into:
+  prepare  building headers, including the body SHA-256 the SDK computes over plain HTTP
+  sign     SigV4 signing (minio.api.sign_v4_s3)
+  pool     waiting for a connection from the urllib3 pool
+  connect  opening a new TCP connection (0 when a keep-alive connection is reused)
+  send     serialising and writing request line, headers and body (http.client)
+  wait     server time until the response headers arrive
+  receive  reading the body until the connection goes back to the pool
+  other    whatever is left of the request (SDK/urllib3 bookkeeping)
+
+The hooks are a Minio subclass, subclasses of the client's urllib3 pool and
+connection classes, and a wrapper around minio.api.sign_v4_s3. Histograms
+are per thread and merged in the report, so the hot path takes no locks.
+
+PROFILE_CPROFILE=<rate> additionally runs that fraction of benchmark
+iterations under cProfile (one iteration at a time across workers) and
+writes the stats to PROFILE_OUTPUT (default bench.prof).
+"""
+
+import cProfile
+import io
+import pstats
+import random
+import threading
+from contextlib import contextmanager
+
+import minio.api
+from minio import Minio
+
+from histogram import LatencyHistogram, now_ns
+
+PHASES = ("prepare", "sign", "pool", "connect", "send", "wait", "receive", "other")
+
+_local = threading.local()
+_registry = []  # un dict {(method, phase): LatencyHistogram} por thread
+_registry_lock = threading.Lock()
+_installed = False
+
+def _histograms():
+    hists = getattr(_local, "hists", None)
+    if hists is None:
+        hists = _local.hists = {}
+        with _registry_lock:
+            _registry.append(hists)
+    return hists
+
+def _current():
+    return getattr(_local, "request", None)
+
+def _add(phase, ns):
+    req = _current()
+    if req is not None:
+        req[phase] = req.get(phase, 0) + ns
+
+def _finish():
+    req = _current()
+    if req is None:
+        return
+    _local.request = None
+    end = now_ns()
+    total = end - req.pop("_start")
+    method = req.pop("_method")
+    headers_at = req.pop("_headers_at", None)
+    req["receive"] = end - headers_at if headers_at else 0
+    req["other"] = max(0, total - sum(req.values()))
+    hists = _histograms()
+    for phase in PHASES:
+        key = (method, phase)
+        hist = hists.get(key)
+        if hist is None:
+            hist = hists[key] = LatencyHistogram()
+        hist.record(req.get(phase, 0))
+    key = (method, "total")
+    if key not in hists:
+        hists[key] = LatencyHistogram()
+    hists[key].record(total)
+
+class ProfiledMinio(Minio):
+    def _url_open(self, method, region, *args, **kwargs):
+        if _current() is not None:
+            _finish()  # una respuesta en streaming que nunca devolvió su conexión
+        _local.request = {"_start": now_ns(), "_method": method}
+        # Con preload_content la conexión vuelve al pool (y se cierra el registro) dentro de
+        # urlopen; en streaming, cuando el llamador hace release_conn()
+        return super()._url_open(method, region, *args, **kwargs)
+
+    def _build_headers(self, *args, **kwargs):
+        start = now_ns()
+        try:
+            return super()._build_headers(*args, **kwargs)
+        finally:
+            _add("prepare", now_ns() - start)
+
+class _ProfiledConnectionMixin:
+    def connect(self):
+        start = now_ns()
+        try:
+            return super().connect()
+        finally:
+            _add("connect", now_ns() - start)
+
+    def request(self, *args, **kwargs):
+        start = now_ns()
+        connect_before = (_current() or {}).get("connect", 0)
+        try:
+            return super().request(*args, **kwargs)
+        finally:
+            # connect() ocurre dentro de request(): no se cuenta dos veces
+            connect = (_current() or {}).get("connect", 0) - connect_before
+            _add("send", now_ns() - start - connect)
+
+    def getresponse(self, *args, **kwargs):
+        start = now_ns()
+        try:
+            return super().getresponse(*args, **kwargs)
+        finally:
+            end = now_ns()
+            _add("wait", end - start)
+            req = _current()
+            if req is not None:
+                req["_headers_at"] = end
+
+class _ProfiledPoolMixin:
+    def _get_conn(self, timeout=None):
+        start = now_ns()
+        try:
+            return super()._get_conn(timeout)
+        finally:
+            _add("pool", now_ns() - start)
+
+    def _put_conn(self, conn):
+        try:
+            return super()._put_conn(conn)
+        finally:
+            _finish()
+
+def _profiled(pool_cls):
+    """Subclase instrumentada de una clase de pool (y de su ConnectionCls)."""
+    conn_cls = type("Profiled" + pool_cls.ConnectionCls.__name__,
+                    (_ProfiledConnectionMixin, pool_cls.ConnectionCls), {})
+    return type("Profiled" + pool_cls.__name__, (_ProfiledPoolMixin, pool_cls),
+                {"ConnectionCls": conn_cls, "_profiled": True})
+
+def _install_sign_hook():
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    original = minio.api.sign_v4_s3
+
+    def timed_sign(*args, **kwargs):
+        start = now_ns()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            _add("sign", now_ns() - start)
+
+    minio.api.sign_v4_s3 = timed_sign
+
+def instrument(http_client):
+    """Instrumenta las clases de pool de un urllib3.PoolManager (idempotente)."""
+    _install_sign_hook()
+    classes = dict(http_client.pool_classes_by_scheme)
+    for scheme, pool_cls in classes.items():
+        if not getattr(pool_cls, "_profiled", False):
+            classes[scheme] = _profiled(pool_cls)
+    http_client.pool_classes_by_scheme = classes
+    return http_client
+
+def merged():
+    """{method: {phase: LatencyHistogram}} de todos los threads."""
+    out = {}
+    with _registry_lock:
+        registry = list(_registry)
+    for hists in registry:
+        for (method, phase), hist in list(hists.items()):
+            target = out.setdefault(method, {}).setdefault(phase, LatencyHistogram())
+            target.merge(hist)
+    return out
+
+def report():
+    by_method = merged()
+    if not by_method:
+        return
+    print("\nClient phases (mean per request; share of request time):")
+    for method in sorted(by_method):
+        hists = by_method[method]
+        total = hists["total"]
+        if not total.count:
+            continue
+        parts = []
+        for phase in PHASES:
+            hist = hists.get(phase)
+            if hist is None or not hist.count:
+                continue
+            share = hist.mean() / total.mean() * 100 if total.mean() else 0.0
+            parts.append(f"{phase} {hist.mean()/1e6:.3f}ms ({share:.0f}%)")
+        print(f"  {method:<6} n={total.count} total {total.mean()/1e6:.3f}ms: " + ", ".join(parts))
+    client_side = ("prepare", "sign", "pool", "other")
+    for method in sorted(by_method):
+        hists = by_method[method]
+        total = hists["total"].mean()
+        if total:
+            own = sum(hists[p].mean() for p in client_side if p in hists)
+            print(f"  {method:<6} client-side overhead {own/1e6:.3f}ms = {own/total*100:.0f}% of request time")
+
+def rows():
+    """Filas PHASE-<METHOD>-<phase> para el results store (latencias en ms)."""
+    from results_store import histogram_row
+    out = []
+    for method, hists in sorted(merged().items()):
+        for phase in PHASES:
+            if phase in hists and hists[phase].count:
+                out.append(histogram_row(f"PHASE-{method}-{phase}", hists[phase]))
+    return out
+
+class SampledProfiler:
+    """cProfile sobre una fracción de las iteraciones, con un solo Profile para todo el proceso.
+
+    Desde Python 3.12 cProfile usa sys.monitoring y solo puede haber un profiler
+    activo: un segundo enable() concurrente lanza ValueError. Por eso se perfila
+    una iteración a la vez; si otra ya está bajo el profiler, la muestra se salta.
+    """
+    def __init__(self, rate, output="bench.prof", seed=0):
+        self.rate = rate
+        self.output = output
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._active = threading.Lock()
+        self._prof = cProfile.Profile()
+        self.sampled = 0
+        self.skipped = 0
+
+    @contextmanager
+    def maybe(self):
+        with self._lock:
+            take = self._rng.random() < self.rate
+        if take and not self._active.acquire(blocking=False):
+            with self._lock:
+                self.skipped += 1
+            take = False
+        if not take:
+            yield
+            return
+        with self._lock:
+            self.sampled += 1
+        try:
+            self._prof.enable()
+            try:
+                yield
+            finally:
+                self._prof.disable()
+        finally:
+            self._active.release()
+
+    def dump(self, top=15):
+        if not self.sampled:
+            return
+        stats = pstats.Stats(self._prof)
+        stats.dump_stats(self.output)
+        out = io.StringIO()
+        stats.stream = out
+        stats.sort_stats("cumulative").print_stats(top)
+        skipped = f", {self.skipped} skipped while another was profiled" if self.skipped else ""
+        print(f"\ncProfile: {self.sampled} sampled iterations{skipped}, stats in {self.output} "
+              f"(top {top} by cumulative time):")
+        print(out.getvalue().rstrip())
+
+def enabled(env):
+    return env.get("PROFILE_PHASES", "").lower() in ("1", "true", "yes", "on")
+
+def profiler_from_env(env):
+    rate = float(env.get("PROFILE_CPROFILE", "0") or 0)
+    if rate <= 0:
+        return None
+    return SampledProfiler(min(rate, 1.0), env.get("PROFILE_OUTPUT", "bench.prof"))
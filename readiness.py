@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+readiness.py — wait for MinIO to be really ready and measure its cold start.
+
+Instead of `sleep 5` or checking that port 9000 accepts connections, poll
+the health endpoints with adaptive backoff (5ms, growing x1.5 up to 250ms,
+back to 5ms whenever a phase advances):
+
+  listening  the port accepts HTTP
+  ready      GET /minio/health/ready   -> 200 (storage layer online)
+  cluster    GET /minio/health/cluster -> 200 (write quorum available)
+
+Times are measured from the MinIO process start (/proc/<pid>, --pid) or from
+when polling began. Time-to-ready goes to the results store as operation
+TIME-TO-READY (tool "minio-startup"), so regress.py can flag slower startups.
+
+Usage:
+  ./minio server /tmp/data &
+  python3 readiness.py --pid $! [--endpoint localhost:9000] [--timeout 60] [--version RELEASE...]
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import sys
+import time
+
+try:
+    from results_store import open_default
+except ImportError:  # la espera no depende del results store; record() queda sin efecto
+    open_default = None
+
+PHASES = ("listening", "ready", "cluster")
+HEALTH_PATHS = {"ready": "/minio/health/ready", "cluster": "/minio/health/cluster"}
+
+def process_start(pid):
+    """Hora (epoch) de arranque del proceso según /proc, o None fuera de Linux."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # comm puede tener espacios: los campos siguen al último ')'
+            fields = f.read().rsplit(")", 1)[1].split()
+        started = int(fields[19]) / os.sysconf("SC_CLK_TCK")  # segundos desde el boot
+        # btime de /proc/stat va en segundos enteros (hasta 1s de error por boot): se ancla con
+        # CLOCK_BOOTTIME, el mismo reloj que starttime
+        return time.time() - (time.clock_gettime(time.CLOCK_BOOTTIME) - started)
+    except (OSError, AttributeError, IndexError, ValueError):
+        return None
+
+def alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+class Backoff:
+    def __init__(self, initial=0.005, factor=1.5, maximum=0.25):
+        self.initial = initial
+        self.factor = factor
+        self.maximum = maximum
+        self.interval = initial
+
+    def sleep(self, deadline):
+        time.sleep(max(0.0, min(self.interval, deadline - time.time())))
+        self.interval = min(self.interval * self.factor, self.maximum)
+
+    def reset(self):
+        self.interval = self.initial
+
+class ReadyResult:
+    def __init__(self, endpoint, start):
+        self.endpoint = endpoint
+        self.start = start
+        self.phases = {}
+        self.probes = 0
+        self.error = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def time_to_ready(self):
+        """Segundos hasta la última fase alcanzada."""
+        return max(self.phases.values()) if self.phases else None
+
+    def line(self):
+        phases = ", ".join(f"{name} {secs:.3f}s" for name, secs in self.phases.items())
+        status = "ready" if self.ok else f"NOT ready ({self.error})"
+        return f"{self.endpoint} {status}: {phases or 'no phase reached'} ({self.probes} probes)"
+
+def _probe(host, port, path, timeout):
+    """Status HTTP de GET path; None si no hay conexión."""
+    conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        conn.request("GET", path)
+        resp = conn.getresponse()
+        resp.read()
+        return resp.status
+    except (OSError, http.client.HTTPException):
+        return None
+    finally:
+        conn.close()
+
+def wait_ready(endpoint="localhost:9000", timeout=60.0, cluster=True, pid=None, since=None, backoff=None):
+    """Espera las fases de PHASES (sin `cluster` si cluster=False) y devuelve un ReadyResult."""
+    host, _, port = endpoint.partition(":")
+    port = int(port or 80)
+    start = since or (process_start(pid) if pid else None) or time.time()
+    deadline = time.time() + timeout
+    backoff = backoff or Backoff()
+    result = ReadyResult(endpoint, start)
+    pending = [p for p in PHASES if cluster or p != "cluster"]
+
+    while pending:
+        if pid is not None and not alive(pid):
+            result.error = f"process {pid} exited"
+            return result
+        now = time.time()
+        if now >= deadline:
+            result.error = f"timeout after {timeout:g}s waiting for {pending[0]}"
+            return result
+        phase = pending[0]
+        result.probes += 1
+        status = _probe(host, port, HEALTH_PATHS.get(phase, HEALTH_PATHS["ready"]),
+                        timeout=max(0.05, min(1.0, deadline - now)))
+        if phase == "listening" and status is not None:
+            result.phases[phase] = time.time() - start
+            pending.pop(0)
+            backoff.reset()
+            # Sin esperar: el mismo probe puede haber sido ya un 200 de /ready
+            if status == 200:
+                result.phases["ready"] = result.phases[phase]
+                pending.pop(0)
+            continue
+        if status == 200:
+            result.phases[phase] = time.time() - start
+            pending.pop(0)
+            backoff.reset()
+            continue
+        backoff.sleep(deadline)
+    return result
+
+def wait_for_port(host, port, timeout=30.0, backoff=None):
+    """Espera a que un puerto TCP acepte conexiones (para procesos sin health endpoint)."""
+    deadline = time.time() + timeout
+    backoff = backoff or Backoff()
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=max(0.05, min(0.5, deadline - time.time()))):
+                return True
+        except OSError:
+            backoff.sleep(deadline)
+    return False
+
+def record(result, minio_version, disk_layout=None, session_id=None, params=None):
+    """Guarda TIME-TO-READY (ms, en p50/mean) y cada fase en el results store."""
+    if not result.ok:
+        return None
+    store = open_default() if open_default else None
+    if store is None:
+        return None
+    ms = result.time_to_ready * 1000
+    row = {"operation": "TIME-TO-READY", "ops": 1, "errors": 0, "mean_ms": ms, "min_ms": ms, "p50_ms": ms,
+           "max_ms": ms}
+    phase_rows = [{"operation": f"READY-{name.upper()}", "ops": 1, "mean_ms": secs * 1000,
+                   "p50_ms": secs * 1000} for name, secs in result.phases.items()]
+    try:
+        return store.record_run(
+            [row] + phase_rows, tool="minio-startup", minio_version=minio_version, mode="startup",
+            disk_layout=disk_layout or os.environ.get("DISK_LAYOUT"),
+            session_id=session_id or os.environ.get("BENCH_SESSION"),
+            params={"endpoint": result.endpoint, "probes": result.probes, **(params or {})},
+        )
+    finally:
+        store.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Wait until MinIO is ready and record its time-to-ready.")
+    parser.add_argument("--endpoint", default=os.environ.get("MINIO_ENDPOINT", "localhost:9000"))
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait (default: 60)")
+    parser.add_argument("--pid", type=int, help="MinIO pid: time from its start and fail fast if it dies")
+    parser.add_argument("--no-cluster", action="store_true", help="Do not wait for /minio/health/cluster")
+    parser.add_argument("--version", default=os.environ.get("MINIO_VERSION"),
+                        help="Record time-to-ready for this version in the results store")
+    args = parser.parse_args()
+
+    result = wait_ready(args.endpoint, args.timeout, cluster=not args.no_cluster, pid=args.pid)
+    print(result.line())
+    if not result.ok:
+        return 1
+    if args.version:
+        run_id = record(result, args.version)
+        if run_id:
+            print(f"Saved time-to-ready {result.time_to_ready:.3f}s for {args.version} (run {run_id})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
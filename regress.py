@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+regress.py — flag statistically significant regressions between consecutive MinIO releases.
+
+Samples come from the results store: every run is one sample of a series
+(tool, mode, disk layout, object size, concurrency, engine, host, operation).
+Only RELEASE.<date> versions are considered (not null-s3 or latest), and
+layout-matrix summaries and minio-startup runs only with an explicit --tool.
+Versions are ordered by their RELEASE.<date> tag and each consecutive pair
+is compared with
+
+  * a Mann-Whitney U test (exact for small samples without ties, normal
+    approximation otherwise), and
+  * a bootstrap 95% confidence interval of the relative change in medians.
+
+A step is a regression when p < --alpha, the whole CI lies on the bad side
+of zero and the median moved by at least --min-effect. Suspects are ranked
+by effect size. With very few samples no ordering can reach --alpha (3 vs 3
+gives at best p=0.1); such steps are reported as underpowered and decided
+by the CI and --min-effect alone.
+
+Usage:
+  python3 regress.py [--db results.db] [--metric mibps --metric p99_ms]
+                     [--min-samples 5] [--fail-on-regression]
+"""
+
+import argparse
+import math
+import random
+import re
+import statistics
+import sys
+from collections import defaultdict
+from functools import lru_cache
+
+from results_store import ResultsStore, default_path
+
+RELEASE_RE = re.compile(r"RELEASE\.(\d{4}-\d{2}-\d{2}T\d{2}-\d{2}-\d{2}Z)")
+HIGHER_IS_BETTER = {"mibps": True, "ops_per_sec": True,
+                    "mean_ms": False, "p50_ms": False, "p90_ms": False, "p99_ms": False, "max_ms": False}
+EXACT_LIMIT = 20
+# Resúmenes derivados (layout-matrix) y tiempos de arranque: solo con --tool explícito
+EXCLUDED_TOOLS = ("layout-matrix", "minio-startup")
+
+def release_key(version):
+    """Orden por fecha de release; lo que no tiene fecha queda al final."""
+    m = RELEASE_RE.search(version or "")
+    return (0, m.group(1)) if m else (1, version or "")
+
+@lru_cache(maxsize=None)
+def _u_count(m, n, u):
+    # Número de ordenamientos de m+n valores sin empates con estadístico U == u
+    if u < 0 or u > m * n:
+        return 0
+    if m == 0 or n == 0:
+        return 1 if u == 0 else 0
+    return _u_count(m - 1, n, u - n) + _u_count(m, n - 1, u)
+
+def mann_whitney(a, b):
+    """Prueba U bilateral. Devuelve (U de `a`, p-value)."""
+    m, n = len(a), len(b)
+    combined = sorted((v, i) for i, v in enumerate(list(a) + list(b)))
+    ranks = [0.0] * (m + n)
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        for k in range(i, j + 1):
+            ranks[combined[k][1]] = rank
+        t = j - i + 1
+        tie_term += t ** 3 - t
+        i = j + 1
+    u = sum(ranks[:m]) - m * (m + 1) / 2
+
+    if tie_term == 0 and m + n <= EXACT_LIMIT:
+        total = math.comb(m + n, m)
+        ui = int(round(u))
+        low = sum(_u_count(m, n, k) for k in range(0, ui + 1)) / total
+        high = sum(_u_count(m, n, k) for k in range(ui, m * n + 1)) / total
+        return u, min(1.0, 2 * min(low, high))
+
+    mean = m * n / 2
+    var = m * n / 12 * ((m + n + 1) - tie_term / ((m + n) * (m + n - 1)))
+    if var <= 0:
+        return u, 1.0
+    z = (abs(u - mean) - 0.5) / math.sqrt(var)
+    return u, min(1.0, math.erfc(max(z, 0) / math.sqrt(2)))
+
+def min_p(m, n):
+    """p-value bilateral más chico alcanzable con m y n muestras (separación total, sin empates)."""
+    return min(1.0, 2 / math.comb(m + n, m))
+
+def bootstrap_change(a, b, resamples=2000, seed=0):
+    """IC 95% bootstrap del cambio relativo de medianas (b vs a)."""
+    rng = random.Random(seed)
+    changes = []
+    for _ in range(resamples):
+        ma = statistics.median(rng.choices(a, k=len(a)))
+        mb = statistics.median(rng.choices(b, k=len(b)))
+        if ma:
+            changes.append((mb - ma) / ma)
+    changes.sort()
+    if not changes:
+        return float("nan"), float("nan")
+    return changes[int(0.025 * (len(changes) - 1))], changes[int(0.975 * (len(changes) - 1))]
+
+class Step:
+    def __init__(self, series, metric, before, after, a, b, alpha, min_effect, resamples):
+        self.series = series
+        self.metric = metric
+        self.before = before
+        self.after = after
+        self.n = (len(a), len(b))
+        self.median_before = statistics.median(a)
+        self.median_after = statistics.median(b)
+        self.change = ((self.median_after - self.median_before) / self.median_before
+                       if self.median_before else 0.0)
+        self.ci = bootstrap_change(a, b, resamples)
+        _, self.p = mann_whitney(a, b)
+        # Signo "malo": bajar throughput o subir latencia
+        bad = -1 if HIGHER_IS_BETTER.get(metric, True) else 1
+        self.badness = bad * self.change
+        ci_bad = bad * self.ci[0] > 0 and bad * self.ci[1] > 0
+        # Si el test no puede llegar a alpha con tan pocas muestras, decide el IC
+        self.underpowered = min_p(len(a), len(b)) >= alpha
+        significant = self.p < alpha or self.underpowered
+        self.regression = significant and ci_bad and self.badness >= min_effect
+
+    def line(self):
+        flag = "REGRESSION" if self.regression else ""
+        if self.underpowered:
+            flag = f"{flag} (underpowered: decided by CI)".strip()
+        return (f"  {self.before} -> {self.after}  {self.metric}: {self.median_before:.2f} -> "
+                f"{self.median_after:.2f} ({self.change*100:+.1f}%, 95% CI {self.ci[0]*100:+.1f}%.."
+                f"{self.ci[1]*100:+.1f}%)  p={self.p:.4f}  n={self.n[0]}/{self.n[1]}  {flag}")
+
+def load_series(store, metrics, tool=None, operation=None):
+    """{(series, metric): {version: [samples]}} desde el results store.
+
+    Solo versiones RELEASE.<fecha> (fuera null-s3, latest, ...). Engine y host son parte
+    de la serie: sync/async o máquinas distintas no se mezclan en una misma muestra.
+    """
+    sql = ("SELECT r.tool, r.mode, r.disk_layout, r.object_size, r.concurrency, r.engine, "
+           "json_extract(r.host, '$.hostname'), s.operation, r.minio_version, "
+           + ", ".join(f"s.{m}" for m in metrics) +
+           " FROM runs r JOIN results s ON s.run_id = r.run_id WHERE 1=1")
+    args = []
+    if tool:
+        sql += " AND r.tool = ?"
+        args.append(tool)
+    else:
+        sql += f" AND r.tool NOT IN ({', '.join('?' for _ in EXCLUDED_TOOLS)})"
+        args.extend(EXCLUDED_TOOLS)
+    if operation:
+        sql += " AND s.operation = ?"
+        args.append(operation)
+    series = defaultdict(lambda: defaultdict(list))
+    for row in store.conn.execute(sql, args):
+        shape, version, values = row[:8], row[8], row[9:]
+        if release_key(version)[0] != 0:
+            continue
+        label = "/".join(str(x) if x is not None else "-" for x in shape)
+        for metric, value in zip(metrics, values):
+            if value is not None:
+                series[(label, metric)][version].append(value)
+    return series
+
+def detect(series, min_samples, alpha, min_effect, resamples):
+    steps = []
+    for (label, metric), by_version in sorted(series.items()):
+        versions = sorted((v for v, s in by_version.items() if len(s) >= min_samples), key=release_key)
+        for before, after in zip(versions, versions[1:]):
+            steps.append(Step(label, metric, before, after, by_version[before], by_version[after],
+                              alpha, min_effect, resamples))
+    return steps
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect regressions between consecutive MinIO releases.")
+    parser.add_argument("--db", default=None, help="SQLite path (default: $RESULTS_DB or results.db)")
+    parser.add_argument("--metric", action="append", choices=sorted(HIGHER_IS_BETTER),
+                        help="Metric to compare (repeatable; default: mibps and p99_ms)")
+    parser.add_argument("--tool", help="Only runs from this tool (benchmark.py, warp, ...)")
+    parser.add_argument("--operation", help="Only this operation (PUT, GET, ...)")
+    parser.add_argument("--min-samples", type=int, default=5, help="Samples needed per version (default: 5)")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Significance level (default: 0.05)")
+    parser.add_argument("--min-effect", type=float, default=0.05,
+                        help="Smallest relative change worth flagging (default: 0.05 = 5%%)")
+    parser.add_argument("--resamples", type=int, default=2000, help="Bootstrap resamples (default: 2000)")
+    parser.add_argument("--verbose", action="store_true", help="Print every comparison, not only regressions")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if any regression is found")
+    args = parser.parse_args()
+
+    metrics = args.metric or ["mibps", "p99_ms"]
+    store = ResultsStore(args.db or default_path() or "results.db")
+    try:
+        series = load_series(store, metrics, args.tool, args.operation)
+    finally:
+        store.close()
+
+    steps = detect(series, args.min_samples, args.alpha, args.min_effect, args.resamples)
+    print(f"Compared {len(steps)} consecutive release pairs across {len(series)} series "
+          f"(alpha={args.alpha}, min effect {args.min_effect*100:g}%, {args.resamples} resamples)")
+
+    weak = sum(1 for s in steps if s.underpowered)
+    if weak:
+        print(f"Warning: {weak} comparison(s) have too few samples for p < {args.alpha} "
+              f"(3 vs 3 gives at best p=0.1); they are decided by the bootstrap CI only. "
+              f"Collect more samples (BENCH_REPEATS=5) for a real test.")
+
+    current = None
+    for step in steps:
+        if not (args.verbose or step.regression):
+            continue
+        if step.series != current:
+            current = step.series
+            print(f"\n{current}")
+        print(step.line())
+
+    suspects = sorted((s for s in steps if s.regression), key=lambda s: (-s.badness, s.p))
+    if not suspects:
+        print("\nNo significant regressions.")
+        return 0
+    print("\nRanked suspect releases:")
+    for i, s in enumerate(suspects, 1):
+        print(f"  {i}. {s.after} ({s.series}, {s.metric} {s.change*100:+.1f}% vs {s.before}, p={s.p:.4f})")
+    return 1 if args.fail_on_regression else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
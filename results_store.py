@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+results_store.py — one SQLite results store for benchmark.py and the warp harness.
+
+Schema:
+  runs     one row per benchmark run: run id, session, tool, MinIO version,
+           mode, disk layout, object size, concurrency, engine, host info, params
+  results  one row per (run, operation): ops, ops/s, MiB/s, errors, latency
+           percentiles in ms and the raw histogram (histogram.py to_dict JSON)
+
+Rows are written with executemany() inside one transaction per run. The
+database path comes from RESULTS_DB (default: results.db in the working
+directory; RESULTS_DB=none disables it).
+
+Usage:
+  python3 results_store.py list [--limit 20]
+  python3 results_store.py import-csv warp-testing-example/warp_results.csv [--tool warp]
+  python3 results_store.py export-jsonl > results.jsonl
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import re
+import socket
+import sqlite3
+import sys
+import uuid
+from datetime import datetime, timezone
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id        TEXT PRIMARY KEY,
+    session_id    TEXT,
+    started_at    TEXT NOT NULL,
+    tool          TEXT NOT NULL,
+    minio_version TEXT NOT NULL,
+    mode          TEXT,
+    disk_layout   TEXT,
+    object_size   INTEGER,
+    concurrency   INTEGER,
+    engine        TEXT,
+    host          TEXT,
+    params        TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id      TEXT NOT NULL REFERENCES runs(run_id),
+    operation   TEXT NOT NULL,
+    ops         INTEGER,
+    ops_per_sec REAL,
+    mibps       REAL,
+    errors      INTEGER DEFAULT 0,
+    mean_ms     REAL,
+    stddev_ms   REAL,
+    min_ms      REAL,
+    p50_ms      REAL,
+    p90_ms      REAL,
+    p99_ms      REAL,
+    p999_ms     REAL,
+    max_ms      REAL,
+    histogram   TEXT,
+    extra       TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_version ON runs(minio_version, started_at);
+CREATE INDEX IF NOT EXISTS runs_shape ON runs(mode, disk_layout, object_size, concurrency);
+CREATE INDEX IF NOT EXISTS runs_session ON runs(session_id);
+CREATE INDEX IF NOT EXISTS results_run_op ON results(run_id, operation);
+"""
+
+RESULT_COLUMNS = ("run_id", "operation", "ops", "ops_per_sec", "mibps", "errors", "mean_ms", "stddev_ms",
+                  "min_ms", "p50_ms", "p90_ms", "p99_ms", "p999_ms", "max_ms", "histogram", "extra")
+
+_ANY = object()  # samples(): sin filtro de disk_layout
+IMPORT_EPOCH = "1970-01-01T00:00:00+00:00"  # started_at de filas importadas sin fecha
+
+VERSION_RE = re.compile(r"RELEASE\.\d{4}-\d{2}-\d{2}T\d{2}-\d{2}-\d{2}Z")
+
+def default_path(env=os.environ):
+    path = env.get("RESULTS_DB", "results.db")
+    return None if path.lower() in ("", "none", "off") else path
+
+def disk_layout(env=os.environ):
+    """DISK_LAYOUT si está (layout_matrix.py lo pone por layout); si no, el MODE de benchmark.py."""
+    return env.get("DISK_LAYOUT") or env.get("MODE", "single-disk").lower()
+
+def host_info():
+    info = {
+        "hostname": socket.gethostname(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+    }
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    info["mem_kib"] = int(line.split()[1])
+                    break
+    except OSError:
+        pass
+    return info
+
+def now_iso():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+def histogram_row(operation, hist, wall=None, mibps=None, errors=0, extra=None):
+    """Fila de `results` a partir de un LatencyHistogram (run_id lo pone record_run)."""
+    s = hist.summary(percentiles=(50, 90, 99, 99.9))
+    return {
+        "operation": operation,
+        "ops": hist.count,
+        "ops_per_sec": hist.count / wall if wall else None,
+        "mibps": mibps,
+        "errors": errors,
+        "mean_ms": s["mean"], "stddev_ms": s["stddev"], "min_ms": s["min"],
+        "p50_ms": s["p50"], "p90_ms": s["p90"], "p99_ms": s["p99"], "p999_ms": s["p99.9"],
+        "max_ms": s["max"],
+        "histogram": json.dumps(hist.to_dict()),
+        "extra": json.dumps(extra) if extra else None,
+    }
+
+class ResultsStore:
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def new_run(self, tool, minio_version, mode=None, disk_layout=None, object_size=None,
+                concurrency=None, engine=None, params=None, session_id=None, started_at=None, host=None):
+        run_id = uuid.uuid4().hex
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, session_id, started_at or now_iso(), tool, minio_version, mode, disk_layout,
+                 object_size, concurrency, engine, json.dumps(host if host is not None else host_info()),
+                 json.dumps(params) if params else None),
+            )
+        return run_id
+
+    def add_results(self, rows):
+        """Inserta muchas filas de `results` en una sola transacción."""
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO results ({', '.join(RESULT_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in RESULT_COLUMNS)})",
+                [tuple(row.get(c) for c in RESULT_COLUMNS) for row in rows],
+            )
+
+    def record_run(self, rows, **run_fields):
+        run_id = self.new_run(**run_fields)
+        for row in rows:
+            row["run_id"] = run_id
+        self.add_results(rows)
+        return run_id
+
+    def recent_runs(self, limit=20):
+        cur = self.conn.execute(
+            "SELECT r.run_id, r.started_at, r.tool, r.minio_version, r.mode, r.disk_layout, r.object_size, "
+            "r.concurrency, s.operation, s.mibps, s.ops_per_sec, s.p50_ms, s.p99_ms "
+            "FROM runs r JOIN results s ON s.run_id = r.run_id "
+            "WHERE r.run_id IN (SELECT run_id FROM runs ORDER BY started_at DESC LIMIT ?) "
+            "ORDER BY r.started_at DESC, s.operation", (limit,))
+        return cur.fetchall()
+
+    def samples(self, tool, minio_version, operation, metric="mibps", mode=None, disk_layout=_ANY, hostname=None):
+        """Valores de `metric` de las corridas de una versión (para reusar mediciones).
+
+        `disk_layout` (None = sin layout) y `hostname` restringen a corridas comparables;
+        las importadas de CSV no tienen host y quedan fuera cuando se pide uno.
+        """
+        if metric not in RESULT_COLUMNS:
+            raise ValueError(f"unknown metric {metric!r}")
+        sql = (f"SELECT s.{metric} FROM runs r JOIN results s ON s.run_id = r.run_id "
+               "WHERE r.tool = ? AND r.minio_version = ? AND s.operation = ?")
+        args = [tool, minio_version, operation]
+        if mode:
+            sql += " AND r.mode = ?"
+            args.append(mode)
+        if disk_layout is not _ANY:
+            sql += " AND r.disk_layout IS ?"
+            args.append(disk_layout)
+        if hostname:
+            sql += " AND json_extract(r.host, '$.hostname') = ?"
+            args.append(hostname)
+        return [v for (v,) in self.conn.execute(sql, args) if v is not None]
+
+    def ceiling(self, object_size, concurrency, engine, version="null-s3"):
+        """{operation: (mibps, ops_per_sec)} de la última corrida contra el servidor nulo con esa forma."""
+        row = self.conn.execute(
+            "SELECT run_id FROM runs WHERE tool = 'benchmark.py' AND minio_version = ? AND object_size = ? "
+            "AND concurrency = ? AND engine = ? AND mode = 'loop' ORDER BY started_at DESC LIMIT 1",
+            (version, object_size, concurrency, engine)).fetchone()
+        if row is None:
+            return None
+        cur = self.conn.execute("SELECT operation, mibps, ops_per_sec FROM results WHERE run_id = ?", row)
+        return {op: (mibps, ops) for op, mibps, ops in cur}
+
+    def iter_rows(self, session_id=None):
+        where, args = ("WHERE r.session_id = ? ", (session_id,)) if session_id else ("", ())
+        cur = self.conn.execute(
+            "SELECT r.*, s.operation, s.ops, s.ops_per_sec, s.mibps, s.errors, s.mean_ms, s.stddev_ms, "
+            "s.min_ms, s.p50_ms, s.p90_ms, s.p99_ms, s.p999_ms, s.max_ms, s.histogram, s.extra "
+            "FROM runs r JOIN results s ON s.run_id = r.run_id " + where + "ORDER BY r.started_at", args)
+        names = [d[0] for d in cur.description]
+        for row in cur:
+            yield dict(zip(names, row))
+
+def open_default(env=os.environ):
+    """ResultsStore en RESULTS_DB, o None si está desactivado."""
+    path = default_path(env)
+    return ResultsStore(path) if path else None
+
+def import_csv(store, path, tool):
+    """Importa los CSV históricos ([version, MiBps] sin schema).
+
+    warp_results.csv mezcla timestamps y nombres de release en la primera
+    columna: los timestamps pasan a started_at con versión UNKNOWN. Las filas
+    sin timestamp van con IMPORT_EPOCH para no quedar como las corridas más
+    recientes (ceiling() y regress.py ordenan por started_at). Los timestamps
+    del CSV son hora local sin zona: se pasan a UTC con el formato de now_iso()
+    para que ordenen bien junto a las corridas nuevas.
+    """
+    rows = []
+    with open(path, newline="") as f:
+        for rec in csv.reader(f):
+            if len(rec) < 2 or rec[0] == "version":
+                continue
+            first, mibps = rec[0].strip(), float(rec[1])
+            if VERSION_RE.fullmatch(first) or first == "latest":
+                version, started = first, None
+            else:
+                try:
+                    started = (datetime.strptime(first, "%Y-%m-%d %H:%M:%S").astimezone(timezone.utc)
+                               .isoformat(timespec="seconds"))
+                    version = "UNKNOWN"
+                except ValueError:
+                    version, started = first, None
+            rows.append((version, started, mibps))
+
+    session = uuid.uuid4().hex
+    runs, results = [], []
+    for version, started, mibps in rows:
+        run_id = uuid.uuid4().hex
+        runs.append((run_id, session, started or IMPORT_EPOCH, tool, version, "warp-put", None, None, None,
+                     None, None, json.dumps({"imported_from": os.path.basename(path)})))
+        results.append((run_id, "PUT", mibps))
+    with store.conn:
+        store.conn.executemany("INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", runs)
+        store.conn.executemany("INSERT INTO results (run_id, operation, mibps) VALUES (?, ?, ?)", results)
+    return len(rows)
+
+def _fmt(value):
+    return f"{value:.1f}" if value is not None else "-"
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and feed the benchmark results store.")
+    parser.add_argument("--db", default=None, help="SQLite path (default: $RESULTS_DB or results.db)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_list = sub.add_parser("list", help="Show the most recent runs")
+    p_list.add_argument("--limit", type=int, default=20)
+    p_imp = sub.add_parser("import-csv", help="Import a legacy version,MiBps CSV")
+    p_imp.add_argument("csv")
+    p_imp.add_argument("--tool", default="warp")
+    sub.add_parser("export-jsonl", help="Dump every run/result row as JSON lines")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.db or default_path() or "results.db")
+    if args.cmd == "list":
+        for row in store.recent_runs(args.limit):
+            run_id, started, tool, version, mode, layout, size, conc, op, mibps, opss, p50, p99 = row
+            print(f"{run_id[:8]} {started} {tool:<12} {version:<30} {mode or '-':<10} {layout or '-':<12} "
+                  f"size={size or '-'} c={conc or '-'} {op:<8} {_fmt(mibps)} MiB/s "
+                  f"{_fmt(opss)} ops/s p50={_fmt(p50)}ms p99={_fmt(p99)}ms")
+    elif args.cmd == "import-csv":
+        n = import_csv(store, args.csv, args.tool)
+        print(f"Imported {n} rows from {args.csv} into {store.path}")
+    elif args.cmd == "export-jsonl":
+        for row in store.iter_rows():
+            sys.stdout.write(json.dumps(row) + "\n")
+    store.close()
+
+if __name__ == "__main__":
+    main()
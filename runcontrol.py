@@ -0,0 +1,204 @@
+"""
+runcontrol.py — decides how long a benchmark loop runs.
+
+FixedIterations is the classic behaviour (iteration_map). AdaptiveRun:
+  1. warmup: iterations run but are discarded until RUN_WARMUP has passed
+     and the last RUN_WINDOW iteration throughputs are steady
+     (coefficient of variation <= RUN_STEADY_CV). Warmup gives up waiting
+     for steady state after a third of RUN_DURATION.
+  2. measure: iterations are recorded until the 95% confidence interval of
+     the mean throughput is within ±RUN_TARGET_CI of the mean (after
+     RUN_MIN_DURATION and RUN_MIN_SAMPLES), or RUN_DURATION is reached.
+
+Both are shared by all workers; next() says whether to run another
+iteration and whether it counts, record() feeds back its throughput.
+"""
+
+import math
+import threading
+from collections import deque
+
+from histogram import now_ns
+from units import parse_duration
+
+# t de Student bilateral al 95% para df = 1..30; de ahí en adelante ~ normal
+_T95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+
+def t95(df):
+    return _T95[df - 1] if 1 <= df <= len(_T95) else 1.96
+
+class FixedIterations:
+    def __init__(self, iterations):
+        self.iterations = iterations
+        self._done = {}
+        self._lock = threading.Lock()
+
+    def next(self, worker_id):
+        """None = parar; True = iteración medida; False = iteración de warmup."""
+        with self._lock:
+            n = self._done.get(worker_id, 0)
+            if n >= self.iterations:
+                return None
+            self._done[worker_id] = n + 1
+            return True
+
+    def record(self, measured, nbytes, elapsed_ns):
+        pass
+
+    def label(self, i, measured=True):
+        return f"[{i+1}/{self.iterations}]"
+
+    def describe(self):
+        return f"{self.iterations} iterations per worker"
+
+    def measured_wall(self, total_wall):
+        return total_wall
+
+    def measured_window(self):
+        """(inicio, fin) en ns de la parte medida; None = toda la corrida."""
+        return None
+
+    def summary(self):
+        return None
+
+class AdaptiveRun:
+    def __init__(self, warmup=5.0, min_duration=5.0, max_duration=120.0, target_ci=0.05,
+                 window=3, steady_cv=0.10, min_samples=5):
+        self.warmup = warmup
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.target_ci = target_ci
+        self.steady_cv = steady_cv
+        self.min_samples = max(2, min_samples)
+        self._window = deque(maxlen=max(2, window))
+        self._lock = threading.Lock()
+        self.phase = "warmup"
+        self.reason = None
+        self.steady = False
+        self._start = None
+        self._measure_start = None
+        self._end = None
+        # Welford: media y varianza del throughput sin guardar las muestras
+        self.n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.discarded = 0
+
+    @classmethod
+    def from_env(cls, env):
+        return cls(
+            warmup=parse_duration(env.get("RUN_WARMUP", "5s")),
+            min_duration=parse_duration(env.get("RUN_MIN_DURATION", "5s")),
+            max_duration=parse_duration(env.get("RUN_DURATION", "120s")),
+            target_ci=float(env.get("RUN_TARGET_CI", "0.05")),
+            window=int(env.get("RUN_WINDOW", "3")),
+            steady_cv=float(env.get("RUN_STEADY_CV", "0.10")),
+            min_samples=int(env.get("RUN_MIN_SAMPLES", "5")),
+        )
+
+    def _elapsed(self, now):
+        return (now - self._start) / 1e9
+
+    def _finish(self, now, reason):
+        self.phase = "done"
+        self.reason = reason
+        self._end = now
+
+    def _start_measuring(self, now, steady):
+        self.phase = "measure"
+        self.steady = steady
+        self._measure_start = now
+
+    def next(self, worker_id):
+        with self._lock:
+            now = now_ns()
+            if self._start is None:
+                self._start = now
+            if self.phase == "done":
+                return None
+            if self._elapsed(now) >= self.max_duration:
+                self._finish(now, "max duration reached")
+                return None
+            if self.phase == "warmup" and self._elapsed(now) >= max(self.warmup, self.max_duration / 3):
+                self._start_measuring(now, steady=False)
+            if self.phase == "measure" and self._converged(now):
+                self._finish(now, f"CI ±{self.relative_ci()*100:.1f}% reached")
+                return None
+            return self.phase == "measure"
+
+    def record(self, measured, nbytes, elapsed_ns):
+        if elapsed_ns <= 0:
+            return
+        rate = nbytes / (elapsed_ns / 1e9)
+        with self._lock:
+            self._window.append(rate)
+            if self.phase == "warmup":
+                self.discarded += 1
+                now = now_ns()
+                if self._elapsed(now) >= self.warmup and self._is_steady():
+                    self._start_measuring(now, steady=True)
+            elif measured:
+                # También cuentan las iteraciones medidas que terminan después de parar
+                self.n += 1
+                delta = rate - self._mean
+                self._mean += delta / self.n
+                self._m2 += delta * (rate - self._mean)
+            else:
+                self.discarded += 1
+
+    def _is_steady(self):
+        if len(self._window) < self._window.maxlen:
+            return False
+        mean = sum(self._window) / len(self._window)
+        if mean <= 0:
+            return False
+        var = sum((x - mean) ** 2 for x in self._window) / (len(self._window) - 1)
+        return math.sqrt(var) / mean <= self.steady_cv
+
+    def relative_ci(self):
+        if self.n < 2 or self._mean <= 0:
+            return float("inf")
+        stderr = math.sqrt(self._m2 / (self.n - 1)) / math.sqrt(self.n)
+        return t95(self.n - 1) * stderr / self._mean
+
+    def _converged(self, now):
+        if self.n < self.min_samples:
+            return False
+        if (now - self._measure_start) / 1e9 < self.min_duration:
+            return False
+        return self.relative_ci() <= self.target_ci
+
+    def label(self, i, measured=True):
+        return f"[{i+1}]" if measured else f"[{i+1} warmup]"
+
+    def describe(self):
+        return (f"adaptive: warmup {self.warmup:g}s, until ±{self.target_ci*100:g}% CI "
+                f"(min {self.min_duration:g}s/{self.min_samples} samples, max {self.max_duration:g}s)")
+
+    def measured_wall(self, total_wall):
+        if self._measure_start is None:
+            return total_wall
+        end = self._end or now_ns()
+        return (end - self._measure_start) / 1e9
+
+    def measured_window(self):
+        if self._measure_start is None:
+            return None
+        return self._measure_start, self._end or now_ns()
+
+    def summary(self):
+        warm = (self._measure_start - self._start) / 1e9 if self._measure_start else 0.0
+        steady = "steady state detected" if self.steady else "steady state NOT detected"
+        ci = self.relative_ci()
+        ci_text = f"±{ci*100:.1f}%" if math.isfinite(ci) else "n/a"
+        return (f"Run control: {self.reason or 'stopped'}; warmup {warm:.1f}s ({steady}, "
+                f"{self.discarded} iterations discarded); {self.n} measured samples, "
+                f"mean {self._mean / 1024 / 1024:.1f} MiB/s per iteration, 95% CI {ci_text}")
+
+def controller_from_env(env, iterations):
+    """RUN_DURATION (o RUN_TARGET_CI) activa el modo adaptativo; si no, iteraciones fijas."""
+    if env.get("RUN_DURATION") or env.get("RUN_TARGET_CI"):
+        return AdaptiveRun.from_env(env)
+    return FixedIterations(iterations)
@@ -0,0 +1,83 @@
+"""
+sigv4.py — minimal AWS Signature V4 header signing for S3 path-style requests.
+
+Bodies are sent as UNSIGNED-PAYLOAD so signing cost does not grow with the
+object size; the derived signing key is cached per day.
+"""
+
+import hashlib
+import hmac
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+
+def _hmac(key, msg):
+    return hmac.new(key, msg.encode(), hashlib.sha256).digest()
+
+class Signer:
+    def __init__(self, access_key, secret_key, region="us-east-1", service="s3"):
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.service = service
+        self._key_date = None
+        self._key = None
+
+    def _signing_key(self, date):
+        if date != self._key_date:
+            k = _hmac(("AWS4" + self.secret_key).encode(), date)
+            k = _hmac(k, self.region)
+            k = _hmac(k, self.service)
+            self._key = _hmac(k, "aws4_request")
+            self._key_date = date
+        return self._key
+
+    def sign(self, method, host, path, query=None, headers=None, now=None):
+        """Devuelve los headers firmados (incluye Host, x-amz-date y Authorization).
+
+        `path` ya debe venir codificado (ver encode_path); `query` es un dict.
+        """
+        now = now or datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        date = amz_date[:8]
+
+        signed = {k.lower(): str(v).strip() for k, v in (headers or {}).items()}
+        signed["host"] = host
+        signed["x-amz-date"] = amz_date
+        signed.setdefault("x-amz-content-sha256", UNSIGNED_PAYLOAD)
+        names = sorted(signed)
+
+        canonical_query = encode_query(query)
+        canonical_request = "\n".join([
+            method,
+            path,
+            canonical_query,
+            "".join(f"{n}:{signed[n]}\n" for n in names),
+            ";".join(names),
+            signed["x-amz-content-sha256"],
+        ])
+        scope = f"{date}/{self.region}/{self.service}/aws4_request"
+        string_to_sign = "\n".join([
+            "AWS4-HMAC-SHA256",
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode()).hexdigest(),
+        ])
+        signature = hmac.new(self._signing_key(date), string_to_sign.encode(), hashlib.sha256).hexdigest()
+        signed["authorization"] = (
+            f"AWS4-HMAC-SHA256 Credential={self.access_key}/{scope}, "
+            f"SignedHeaders={';'.join(names)}, Signature={signature}"
+        )
+        return signed
+
+def encode_path(bucket, key=""):
+    path = "/" + bucket
+    if key:
+        path += "/" + key
+    return quote(path, safe="/-_.~")
+
+def encode_query(query):
+    """Query string canónica (SigV4): claves ordenadas, todo codificado salvo -_.~"""
+    return "&".join(f"{quote(k, safe='-_.~')}={quote(str(v), safe='-_.~')}"
+                    for k, v in sorted((query or {}).items()))
@@ -0,0 +1,155 @@
+"""
+sizesweep.py — object-size sweep (SWEEP=sizes): throughput and latency vs. size in one server session.
+
+Sizes are log-spaced (SWEEP_SIZES="4KiB:1GiB:x4" -> 4KiB, 16KiB, ..., 1GiB)
+or an explicit list ("4KiB,1MiB,64MiB"). Each size runs PUT/GET/DELETE with
+CONCURRENCY workers for SWEEP_SIZE_TIME (default 5s), but never fewer than
+SWEEP_MIN_ITERATIONS nor more than SWEEP_MAX_ITERATIONS per worker, so tiny
+objects get thousands of samples and huge ones a few.
+
+The curve marks where the client switches to multipart (minio.helpers
+.get_part_info) and flags superlinear latency steps: latency growing more
+than the size did between two neighbours is where the server changes
+behaviour (inline data in xl.meta, multipart, erasure block boundaries).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from minio.helpers import get_part_info
+
+from histogram import LatencyHistogram, now_ns
+from units import MIB, format_size, parse_size, parse_size_list
+
+def parse_sizes(text):
+    """"4KiB:1GiB:x4" (rango log, factor 4 por defecto) o lista separada por comas."""
+    text = str(text).strip()
+    if ":" not in text:
+        return parse_size_list(text)
+    parts = text.split(":")
+    lo, hi = parse_size(parts[0]), parse_size(parts[1])
+    factor = float(parts[2].lstrip("xX")) if len(parts) > 2 else 4.0
+    if lo <= 0 or hi < lo or factor <= 1:
+        raise ValueError(f"bad size range {text!r}")
+    sizes = []
+    size = float(lo)
+    while size <= hi * 1.0001:
+        sizes.append(int(round(size)))
+        size *= factor
+    return sizes
+
+def auto_iterations(size, scale=1.0):
+    """Iteraciones para un tamaño fuera de size_map: ~50 a 1MiB, más para objetos pequeños, menos para grandes."""
+    return max(2, min(100, round(50 * scale * (MIB / size) ** (1 / 3))))
+
+class SizeResult:
+    def __init__(self, size):
+        self.size = size
+        self.put = LatencyHistogram()
+        self.get = LatencyHistogram()
+        self.ttfb = LatencyHistogram()
+        self.delete = LatencyHistogram()
+        self.wall = 0.0
+        self.multipart = get_part_info(size, 0)[1] > 1
+
+    def merge(self, other):
+        self.put.merge(other.put)
+        self.get.merge(other.get)
+        self.ttfb.merge(other.ttfb)
+        self.delete.merge(other.delete)
+
+    def mibps(self, hist):
+        # Throughput agregado: bytes de todos los workers sobre el tiempo de pared
+        return self.size * hist.count / MIB / self.wall if self.wall else 0.0
+
+def _size_worker(client, bucket, worker_id, size, payload, download, chunk_size, deadline, min_iter, max_iter):
+    result = SizeResult(size)
+    object_name = f"sizesweep-{format_size(size)}-w{worker_id}"
+    view = memoryview(bytearray(chunk_size))
+    i = 0
+    while i < max_iter and (i < min_iter or now_ns() < deadline):
+        start = now_ns()
+        client.put_object(bucket, object_name, payload.stream(size), size)
+        result.put.record_since(start)
+
+        start = now_ns()
+        _, first_byte = download(client, object_name, view)
+        result.get.record_since(start)
+        if first_byte is not None:
+            result.ttfb.record(first_byte - start)
+
+        start = now_ns()
+        client.remove_object(bucket, object_name)
+        result.delete.record_since(start)
+        i += 1
+    return result
+
+def run_size_sweep(make_client, bucket, sizes, payload, download, concurrency, budget,
+                   min_iter=3, max_iter=10000, chunk_size=MIB):
+    print(f"Size sweep: {len(sizes)} sizes from {format_size(sizes[0])} to {format_size(sizes[-1])}, "
+          f"{budget:g}s per size, {concurrency} workers, {min_iter}..{max_iter} iterations per worker\n")
+    client = make_client()
+    results = []
+    for size in sizes:
+        deadline = now_ns() + int(budget * 1e9)
+        start = now_ns()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [pool.submit(_size_worker, client, bucket, w, size, payload, download, chunk_size,
+                                   deadline, min_iter, max_iter) for w in range(concurrency)]
+            per_worker = [f.result() for f in futures]
+        total = SizeResult(size)
+        for r in per_worker:
+            total.merge(r)
+        total.wall = (now_ns() - start) / 1e9
+        results.append(total)
+        print(f"  {format_size(size):>8}: {total.put.count:>6} iterations, PUT {total.mibps(total.put):8.1f} MiB/s "
+              f"p50 {total.put.percentile(50)/1e6:8.2f}ms, GET {total.mibps(total.get):8.1f} MiB/s "
+              f"p50 {total.get.percentile(50)/1e6:8.2f}ms")
+    print_size_curve(results)
+    return results
+
+def steps(results, attr):
+    """Índices donde la latencia p50 creció más que el tamaño respecto del vecino anterior."""
+    flagged = {}
+    for prev, cur in zip(results, results[1:]):
+        a, b = getattr(prev, attr).percentile(50), getattr(cur, attr).percentile(50)
+        if a and b / a > cur.size / prev.size:
+            flagged[cur.size] = (b / a, cur.size / prev.size)
+    return flagged
+
+def print_size_curve(results):
+    put_steps, get_steps = steps(results, "put"), steps(results, "get")
+    print("\nThroughput / latency vs. object size (p50 latency, aggregate MiB/s):")
+    print(f"{'size':>9} {'iters':>7} {'PUT MiB/s':>10} {'PUT p50':>9} {'PUT p99':>9} "
+          f"{'GET MiB/s':>10} {'GET p50':>9} {'TTFB p50':>9} {'ops/s':>9}  notes")
+    for r in results:
+        notes = []
+        if r.multipart:
+            notes.append("multipart")
+        if r.size in put_steps:
+            growth, ratio = put_steps[r.size]
+            notes.append(f"PUT step x{growth:.1f} for x{ratio:g} size")
+        if r.size in get_steps:
+            growth, ratio = get_steps[r.size]
+            notes.append(f"GET step x{growth:.1f} for x{ratio:g} size")
+        ops = (r.put.count + r.get.count + r.delete.count) / r.wall if r.wall else 0.0
+        print(f"{format_size(r.size):>9} {r.put.count:>7} {r.mibps(r.put):>10.1f} "
+              f"{r.put.percentile(50)/1e6:>7.2f}ms {r.put.percentile(99)/1e6:>7.2f}ms "
+              f"{r.mibps(r.get):>10.1f} {r.get.percentile(50)/1e6:>7.2f}ms "
+              f"{r.ttfb.percentile(50)/1e6:>7.2f}ms {ops:>9.1f}  {', '.join(notes)}")
+    first_multipart = next((r.size for r in results if r.multipart), None)
+    if first_multipart:
+        print(f"\nClient switches to multipart at {format_size(first_multipart)} "
+              f"(part size {format_size(get_part_info(first_multipart, 0)[0])})")
+    if put_steps or get_steps:
+        print("Superlinear latency steps mark where the server changes behaviour between two sizes.")
+
+def size_rows(results, histogram_row):
+    """Filas PUT@<size>, GET@<size>, GET-TTFB@<size>: cada tamaño es su propia serie en regress.py."""
+    rows = []
+    for r in results:
+        label = format_size(r.size)
+        extra = {"object_size": r.size, "multipart": r.multipart}
+        rows.append(histogram_row(f"PUT@{label}", r.put, r.wall, r.mibps(r.put), extra=extra))
+        rows.append(histogram_row(f"GET@{label}", r.get, r.wall, r.mibps(r.get), extra=extra))
+        rows.append(histogram_row(f"GET-TTFB@{label}", r.ttfb, r.wall))
+    return rows
@@ -0,0 +1,47 @@
+"""
+sweep.py — multipart upload sweep: part_size × num_parallel_uploads for large objects.
+
+Each cell uploads the object `iterations` times with the given multipart
+configuration and reports MiB/s; the best cell is named at the end.
+"""
+
+from histogram import LatencyHistogram, now_ns
+from payload import payload_from_env
+from units import MIB, format_size
+
+def run_multipart_sweep(make_client, env, bucket, object_size, part_sizes, parallels, iterations):
+    print(f"Multipart sweep: {format_size(object_size)} object, "
+          f"{len(part_sizes)}x{len(parallels)} cells, {iterations} iterations per cell\n")
+
+    # Un pool HTTP con espacio para todas las partes en vuelo
+    client = make_client(pool_size=max(parallels))
+    cells = {}
+    for part_size in part_sizes:
+        # El buffer de subida se dimensiona al tamaño de parte de esta fila
+        payload = payload_from_env(env, object_size, part_size)
+        for parallel in parallels:
+            hist = LatencyHistogram()
+            object_name = f"sweep-{format_size(part_size)}-p{parallel}"
+            for _ in range(iterations):
+                start = now_ns()
+                client.put_object(bucket, object_name, payload.stream(object_size), object_size,
+                                  part_size=part_size, num_parallel_uploads=parallel)
+                hist.record_since(start)
+                client.remove_object(bucket, object_name)
+            rate = (object_size * hist.count / MIB) / (hist.total / 1e9)
+            cells[(part_size, parallel)] = (rate, hist)
+            print(f"  part_size={format_size(part_size):>7} parallel={parallel:<3} "
+                  f"{rate:8.1f} MiB/s  {hist.format()}")
+
+    print_sweep_table(cells, part_sizes, parallels)
+    return cells
+
+def print_sweep_table(cells, part_sizes, parallels):
+    print("\nMiB/s (rows: part_size, columns: parallel parts)")
+    print(f"{'':>10}" + "".join(f"{p:>10}" for p in parallels))
+    for part_size in part_sizes:
+        row = "".join(f"{cells[(part_size, p)][0]:>10.1f}" for p in parallels)
+        print(f"{format_size(part_size):>10}{row}")
+    (best_part, best_parallel), (best_rate, best_hist) = max(cells.items(), key=lambda kv: kv[1][0])
+    print(f"\nBest: part_size={format_size(best_part)}, num_parallel_uploads={best_parallel} "
+          f"-> {best_rate:.1f} MiB/s (p99 {best_hist.percentile(99)/1e6:.1f}ms)")
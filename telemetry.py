@@ -0,0 +1,229 @@
+"""
+telemetry.py — low-overhead /proc sampler for the MinIO server process.
+
+A daemon thread reads, every TELEMETRY_INTERVAL (default 0.5s):
+  /proc/<pid>/stat    utime + stime (CPU seconds), threads
+  /proc/<pid>/io      read_bytes / write_bytes that reached the block layer
+  /proc/<pid>/status  VmRSS, voluntary/involuntary context switches
+  /proc/diskstats     sectors read/written and busy time of the physical disks
+  /proc/stat          system-wide iowait
+
+The summary is restricted to the measured window and relates server cost to
+client traffic: CPU-seconds per GiB transferred and bytes written per byte
+PUT (write amplification: erasure parity, metadata, journaling).
+
+The pid comes from TELEMETRY_PID, MINIO_PID or /tmp/minio_pid.txt (written
+by execute_minio.py and the workflow) and must belong to a MinIO process; a
+stale pid file pointing at something else disables telemetry with a warning.
+TELEMETRY=off disables it. Linux only.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+from histogram import now_ns
+
+PID_FILE = Path("/tmp/minio_pid.txt")
+GIB = 1024 ** 3
+SECTOR = 512
+CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _physical_disks():
+    # Discos enteros; loop/ram/zram contarían doble lo que ya pasa por el disco real
+    try:
+        names = os.listdir("/sys/block")
+    except OSError:
+        return None
+    return {n for n in names if not n.startswith(("loop", "ram", "zram"))}
+
+def read_sample(pid, disks):
+    """Una muestra como tupla plana (barata de guardar); None si el proceso ya no existe."""
+    stat = _read(f"/proc/{pid}/stat")
+    if stat is None:
+        return None
+    fields = stat.rsplit(")", 1)[1].split()
+    cpu_ticks = int(fields[11]) + int(fields[12])
+    threads = int(fields[17])
+
+    read_bytes = write_bytes = 0
+    io = _read(f"/proc/{pid}/io")
+    if io:
+        for line in io.splitlines():
+            key, _, value = line.partition(":")
+            if key == "read_bytes":
+                read_bytes = int(value)
+            elif key == "write_bytes":
+                write_bytes = int(value)
+
+    rss_kib = ctx = 0
+    status = _read(f"/proc/{pid}/status") or ""
+    for line in status.splitlines():
+        if line.startswith("VmRSS:"):
+            rss_kib = int(line.split()[1])
+        elif line.startswith(("voluntary_ctxt_switches:", "nonvoluntary_ctxt_switches:")):
+            ctx += int(line.split()[1])
+
+    sectors_read = sectors_written = io_ms = 0
+    for line in (_read("/proc/diskstats") or "").splitlines():
+        parts = line.split()
+        if len(parts) < 13 or (disks is not None and parts[2] not in disks):
+            continue
+        sectors_read += int(parts[5])
+        sectors_written += int(parts[9])
+        io_ms += int(parts[12])
+
+    iowait = total = 0
+    cpu = (_read("/proc/stat") or "").split("\n", 1)[0].split()
+    if cpu and cpu[0] == "cpu":
+        ticks = [int(x) for x in cpu[1:]]
+        iowait, total = ticks[4], sum(ticks[:8])
+
+    return (now_ns(), cpu_ticks, threads, read_bytes, write_bytes, rss_kib, ctx,
+            sectors_read, sectors_written, io_ms, iowait, total)
+
+class Sampler:
+    def __init__(self, pid, interval=0.5, disks=None):
+        self.pid = pid
+        self.interval = interval
+        self.disks = disks if disks is not None else _physical_disks()
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="telemetry", daemon=True)
+
+    def _loop(self):
+        while True:
+            sample = read_sample(self.pid, self.disks)
+            if sample is None:
+                break
+            self.samples.append(sample)
+            if self._stop.wait(self.interval):
+                break
+        # Última muestra al parar, para cerrar la ventana
+        sample = read_sample(self.pid, self.disks)
+        if sample is not None:
+            self.samples.append(sample)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def summary(self, bytes_put=None, bytes_total=None, window=None):
+        """Deltas entre la primera y la última muestra dentro de `window` (ns, ns)."""
+        samples = self.samples
+        if window:
+            start, end = window
+            inside = [s for s in samples if start <= s[0] <= end]
+            samples = inside if len(inside) >= 2 else samples
+        if len(samples) < 2:
+            return None
+        first, last = samples[0], samples[-1]
+        secs = (last[0] - first[0]) / 1e9
+        cpu_s = (last[1] - first[1]) / CLK_TCK
+        written = last[4] - first[4]
+        disk_ms = last[9] - first[9]
+        ticks = last[11] - first[11]
+        s = {
+            "pid": self.pid,
+            "seconds": secs,
+            "samples": len(samples),
+            "cpu_seconds": cpu_s,
+            "cpu_cores": cpu_s / secs if secs else 0.0,
+            "read_bytes": last[3] - first[3],
+            "write_bytes": written,
+            "peak_rss_mib": max(x[5] for x in samples) / 1024,
+            "max_threads": max(x[2] for x in samples),
+            "ctx_switches": last[6] - first[6],
+            "disk_read_bytes": (last[7] - first[7]) * SECTOR,
+            "disk_write_bytes": (last[8] - first[8]) * SECTOR,
+            "disk_busy_pct": min(100.0, disk_ms / (secs * 1000) * 100) if secs else 0.0,
+            "iowait_pct": (last[10] - first[10]) / ticks * 100 if ticks else 0.0,
+        }
+        if bytes_total:
+            s["cpu_s_per_gib"] = cpu_s / (bytes_total / GIB)
+        if bytes_put:
+            s["write_amplification"] = written / bytes_put
+        return s
+
+    def series(self):
+        """[t_s, cpu cores, rss MiB, write MiB/s, read MiB/s, disk busy %] por intervalo."""
+        out = []
+        t0 = self.samples[0][0] if self.samples else 0
+        for a, b in zip(self.samples, self.samples[1:]):
+            dt = (b[0] - a[0]) / 1e9
+            if dt <= 0:
+                continue
+            out.append([round((b[0] - t0) / 1e9, 2),
+                        round((b[1] - a[1]) / CLK_TCK / dt, 3),
+                        round(b[5] / 1024, 1),
+                        round((b[4] - a[4]) / 1048576 / dt, 2),
+                        round((b[3] - a[3]) / 1048576 / dt, 2),
+                        round(min(100.0, (b[9] - a[9]) / (dt * 10)), 1)])
+        return out
+
+def format_summary(s):
+    lines = [f"Server telemetry (pid {s['pid']}, {s['samples']} samples over {s['seconds']:.1f}s):",
+             f"  CPU: {s['cpu_seconds']:.2f}s ({s['cpu_cores']:.2f} cores), peak RSS {s['peak_rss_mib']:.0f} MiB, "
+             f"{s['max_threads']} threads, {s['ctx_switches']} context switches",
+             f"  I/O: wrote {s['write_bytes'] / 1048576:.1f} MiB, read {s['read_bytes'] / 1048576:.1f} MiB; "
+             f"disks busy {s['disk_busy_pct']:.0f}%, iowait {s['iowait_pct']:.1f}%"]
+    ratios = []
+    if "cpu_s_per_gib" in s:
+        ratios.append(f"{s['cpu_s_per_gib']:.3f} CPU-s per GiB transferred")
+    if "write_amplification" in s:
+        ratios.append(f"{s['write_amplification']:.2f} bytes written per byte PUT")
+    if ratios:
+        lines.append("  " + ", ".join(ratios))
+    return "\n".join(lines)
+
+def telemetry_row(sampler, summary):
+    """Fila SERVER para el results store: el resumen y la serie por intervalo en `extra`."""
+    return {
+        "operation": "SERVER",
+        "ops": summary["samples"],
+        "extra": json.dumps({"summary": summary, "series": sampler.series()}),
+    }
+
+def is_minio(pid):
+    """El proceso es MinIO: comm o argv[0] dicen minio, o se lanzó como `<binario> server ...`.
+    Los binarios guardados con el nombre de la versión (RELEASE...) entran por el `server`."""
+    comm = (_read(f"/proc/{pid}/comm") or "").strip().lower()
+    argv = (_read(f"/proc/{pid}/cmdline") or "").split("\0")
+    return "minio" in comm or "minio" in os.path.basename(argv[0]).lower() or argv[1:2] == ["server"]
+
+def pid_from_env(env=os.environ):
+    if env.get("TELEMETRY", "").lower() in ("0", "off", "no", "none"):
+        return None
+    for source, value in (("TELEMETRY_PID", env.get("TELEMETRY_PID")), ("MINIO_PID", env.get("MINIO_PID")),
+                          (str(PID_FILE), _read(PID_FILE))):
+        if value and value.strip().isdigit():
+            pid = int(value.strip())
+            if not os.path.exists(f"/proc/{pid}/stat"):
+                continue
+            # Un /tmp/minio_pid.txt viejo puede apuntar a un pid reutilizado por otro proceso
+            if not is_minio(pid):
+                comm = (_read(f"/proc/{pid}/comm") or "?").strip()
+                print(f"Warning: pid {pid} from {source} is {comm!r}, not MinIO; telemetry disabled")
+                return None
+            return pid
+    return None
+
+def sampler_from_env(env=os.environ):
+    """Sampler para el pid de MinIO, o None si no hay proceso que observar."""
+    pid = pid_from_env(env)
+    if pid is None:
+        return None
+    return Sampler(pid, float(env.get("TELEMETRY_INTERVAL", "0.5")))
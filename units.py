@@ -0,0 +1,43 @@
+"""
+units.py — parse and format the sizes ("128KB", "5MiB", "1GiB") and durations ("30s") used across the harness.
+
+KB/MB/GB are treated as binary units, like size_map in benchmark.py always did.
+"""
+
+KIB = 1024
+MIB = 1024 * KIB
+GIB = 1024 * MIB
+
+_UNITS = [("KIB", KIB), ("MIB", MIB), ("GIB", GIB), ("TIB", 1024 * GIB),
+          ("KB", KIB), ("MB", MIB), ("GB", GIB), ("TB", 1024 * GIB),
+          ("K", KIB), ("M", MIB), ("G", GIB), ("B", 1)]
+
+def parse_size(text):
+    t = str(text).strip().upper()
+    for suffix, mult in _UNITS:
+        if t.endswith(suffix):
+            return int(float(t[:-len(suffix)]) * mult)
+    return int(t)
+
+def parse_size_list(text):
+    return [parse_size(x) for x in str(text).split(",") if x.strip()]
+
+def parse_int_list(text):
+    return [int(x) for x in str(text).split(",") if x.strip()]
+
+def format_size(n):
+    for suffix, mult in (("GiB", GIB), ("MiB", MIB), ("KiB", KIB)):
+        if n >= mult and n % mult == 0:
+            return f"{n // mult}{suffix}"
+    for suffix, mult in (("GiB", GIB), ("MiB", MIB), ("KiB", KIB)):
+        if n >= mult:
+            return f"{n / mult:.1f}{suffix}"
+    return f"{n}B"
+
+def parse_duration(text):
+    """Segundos a partir de "90", "30s", "5m", "1h" o "500ms"."""
+    t = str(text).strip().lower()
+    for suffix, mult in (("ms", 0.001), ("s", 1), ("m", 60), ("h", 3600)):
+        if t.endswith(suffix):
+            return float(t[:-len(suffix)]) * mult
+    return float(t)
@@ -1,16 +1,41 @@
 #!/usr/bin/env python3
 # bench_all_versions.py
-import os, subprocess, time, socket, re, csv
+import os, subprocess, time, socket, re, csv, uuid, sys, argparse, statistics
 from pathlib import Path
 
+# results_store.py / regress.py viven en la raíz del repo
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# Cada módulo por separado: que falte uno no debe apagar los demás
+try:
+    from results_store import open_default
+except ImportError as e:
+    print(f"⚠️ results store desactivado: {e}")
+    open_default = None
+try:
+    from regress import release_key
+except ImportError:
+    def release_key(version):
+        m = re.search(r"RELEASE\.(\S+)", version)
+        return (0, m.group(1)) if m else (1, version)
+try:
+    import readiness
+except ImportError as e:
+    print(f"⚠️ readiness.py no disponible, solo se espera el puerto: {e}")
+    readiness = None
+
 BASE = Path(os.path.expanduser("~/minio_versions"))
 EXEC_MINIO = "/Users/cniackz/bash-config/execute_minio.py"
 EXEC_WARP  = "/Users/cniackz/bash-config/execute_warp.py"
 HOST = "127.0.0.1"
 PORT = 9000
+PID_FILE = Path("/tmp/minio_pid.txt")  # lo escribe execute_minio.py al lanzar el binario
 CSV_OUT = "versions_speeds.csv"
+# Corridas de warp por versión; regress.py necesita varias muestras para separar ruido de regresión
+REPEATS = int(os.environ.get("BENCH_REPEATS", "5"))
 
 AVG_RE = re.compile(r"^\s*\*\s*Average:\s*([\d.]+)\s*MiB/s", re.MULTILINE)
+# execute_warp.py imprime esto cuando pudo ingerir el log completo de operaciones de warp
+INGESTED_RE = re.compile(r"^ingested PUT:\s*([\d.]+)\s*MiB/s", re.MULTILINE)
 
 # Ajusta aquí si quieres asegurar las credenciales del server
 ENV = os.environ.copy()
@@ -19,8 +44,11 @@ ENV.setdefault("MINIO_ROOT_PASSWORD", "minio123")
 # Y del cliente warp (por si tu execute_warp no las fija)
 ENV.setdefault("WARP_ACCESS_KEY", "minio")
 ENV.setdefault("WARP_SECRET_KEY", "minio123")
+# Agrupa en el results store todas las corridas de este barrido
+ENV.setdefault("BENCH_SESSION", uuid.uuid4().hex)
 
 def wait_for_port(host, port, timeout=30):
+    # Respaldo si readiness.py no está disponible: solo comprueba el puerto
     end = time.time() + timeout
     while time.time() < end:
         try:
@@ -50,9 +78,31 @@ def discover_versions(base: Path):
             versions.append(name)
     return versions
 
+def minio_pid(timeout=10):
+    """PID que dejó execute_minio.py (ya pasó kill + limpieza de volúmenes)."""
+    end = time.time() + timeout
+    backoff = readiness.Backoff()
+    while time.time() < end:
+        try:
+            return int(PID_FILE.read_text().strip())
+        except (OSError, ValueError):
+            backoff.sleep(end)
+    return None
+
+def wait_minio_ready(version: str, timeout=40):
+    """Health endpoints en vez de solo el puerto; guarda el time-to-ready de la versión."""
+    if readiness is None:
+        return wait_for_port(HOST, PORT, timeout=timeout)
+    result = readiness.wait_ready(f"{HOST}:{PORT}", timeout=timeout, pid=minio_pid())
+    print(f"⏱️  {result.line()}")
+    if result.ok:
+        readiness.record(result, version, session_id=ENV["BENCH_SESSION"])
+    return result.ok
+
 def run_minio(version: str):
     cmd = ["python3", EXEC_MINIO, version]
     print(f"\n▶️  Launching MinIO {version}…")
+    PID_FILE.unlink(missing_ok=True)
     proc = subprocess.Popen(
         cmd,
         env=ENV,
@@ -62,8 +112,8 @@ def run_minio(version: str):
         bufsize=1
     )
     # espera readiness del puerto SIN bloquear al orquestador
-    if not wait_for_port(HOST, PORT, timeout=40):
-        print("❌ MinIO no abrió :9000 a tiempo")
+    if not wait_minio_ready(version, timeout=40):
+        print("❌ MinIO no quedó listo en :9000 a tiempo")
         # opcional: muestra algo de la salida de execute_minio
         try:
             tail = "".join((proc.stdout.read() or "")[-2000:])
@@ -98,7 +148,7 @@ def run_warp_and_get_avg():
         collected.append(line)
     proc.wait()
     out = "".join(collected)
-    m = AVG_RE.search(out)
+    m = INGESTED_RE.search(out) or AVG_RE.search(out)
     if not m:
         return None
     return float(m.group(1))
@@ -111,32 +161,127 @@ def append_csv_row(version: str, avg: float):
             w.writerow(["version", "MiBps"])
         w.writerow([version, avg])
 
+def benchmark_version(v: str):
+    """Lanza MinIO `v`, toma REPEATS muestras de warp y lo detiene. Devuelve las MiB/s."""
+    samples = []
+    minio_proc = None
+    try:
+        minio_proc = run_minio(v)
+        if not minio_proc:
+            return samples
+        for i in range(REPEATS):
+            print(f"📊 {v}: muestra {i+1}/{REPEATS}")
+            avg = run_warp_and_get_avg()
+            # execute_warp.py ya guarda la corrida en el results store (misma BENCH_SESSION)
+            if avg is not None:
+                append_csv_row(v, avg)
+                samples.append(avg)
+    finally:
+        print("🛑 Deteniendo MinIO…")
+        stop_minio()
+        if minio_proc:
+            try:
+                minio_proc.terminate()
+                minio_proc.wait(timeout=5)
+            except Exception:
+                pass
+        time.sleep(1)
+    return samples
+
+class Measurements:
+    """Mediana de MiB/s por versión, reutilizando lo que ya está en el results store."""
+    def __init__(self):
+        self.cache = {}
+        self.launches = 0
+
+    def stored(self, v: str):
+        # Solo corridas de este host y este layout de discos: las de otra máquina o CSV importados no sirven
+        store = open_default() if open_default else None
+        if store is None:
+            return []
+        try:
+            return store.samples("warp", v, "PUT", mode="warp-put", disk_layout=ENV.get("DISK_LAYOUT"),
+                                 hostname=socket.gethostname())
+        finally:
+            store.close()
+
+    def median(self, v: str):
+        if v not in self.cache:
+            samples = self.stored(v)
+            if len(samples) >= REPEATS:
+                print(f"♻️  {v}: {len(samples)} muestras ya medidas")
+            else:
+                self.launches += 1
+                samples = benchmark_version(v)
+            self.cache[v] = statistics.median(samples) if samples else None
+        return self.cache[v]
+
+def bisect_versions(versions, good: str, bad: str, threshold=None, drop=0.05):
+    """Búsqueda binaria por fecha de release de la primera versión bajo el umbral."""
+    ordered = sorted(versions, key=release_key)
+    for v in (good, bad):
+        if v not in ordered:
+            print(f"❌ {v} no está en {BASE}")
+            return None
+    lo, hi = ordered.index(good), ordered.index(bad)
+    if lo >= hi:
+        print(f"❌ {good} debe ser anterior a {bad}")
+        return None
+
+    m = Measurements()
+    if threshold is None:
+        good_mib = m.median(good)
+        if good_mib is None:
+            print(f"❌ No se pudo medir {good}")
+            return None
+        threshold = good_mib * (1 - drop)
+    print(f"🔎 Bisect entre {good} y {bad} ({hi - lo - 1} versiones intermedias), umbral {threshold:.1f} MiB/s")
+
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        v = ordered[mid]
+        mib = m.median(v)
+        if mib is None:
+            # Si no arranca, se descarta y se sigue con el resto del rango
+            print(f"⚠️  {v} no se pudo medir; se descarta")
+            del ordered[mid]
+            hi -= 1
+            continue
+        verdict = "bad" if mib < threshold else "good"
+        print(f"   {v}: {mib:.1f} MiB/s -> {verdict}")
+        if mib < threshold:
+            hi = mid
+        else:
+            lo = mid
+
+    first_bad = ordered[hi]
+    print(f"\n🎯 Primera versión bajo {threshold:.1f} MiB/s: {first_bad} (última buena: {ordered[lo]})")
+    print(f"   {m.launches} lanzamientos de MinIO para {len(ordered)} versiones")
+    return first_bad
+
 def main():
+    parser = argparse.ArgumentParser(description="Benchmark every MinIO version, or bisect a regression.")
+    parser.add_argument("--bisect", nargs=2, metavar=("GOOD", "BAD"),
+                        help="Binary-search between a known-good and a known-bad release")
+    parser.add_argument("--threshold", type=float, help="MiB/s below which a version is bad")
+    parser.add_argument("--drop", type=float, default=0.05,
+                        help="Without --threshold: bad = more than this fraction below GOOD (default: 0.05)")
+    args = parser.parse_args()
+
     versions = discover_versions(BASE)
     if not versions:
         print(f"No encontré versiones en {BASE}")
         return
 
     print(f"Encontré {len(versions)} versiones:\n- " + "\n- ".join(versions))
+    print(f"Sesión en results store: {ENV['BENCH_SESSION']}")
+
+    if args.bisect:
+        bisect_versions(versions, args.bisect[0], args.bisect[1], args.threshold, args.drop)
+        return
 
     for v in versions:
-        minio_proc = None
-        try:
-            minio_proc = run_minio(v)
-            if not minio_proc:
-                continue
-            avg = run_warp_and_get_avg()
-            ...
-        finally:
-            print("🛑 Deteniendo MinIO…")
-            stop_minio()
-            if minio_proc:
-                try:
-                    minio_proc.terminate()
-                    minio_proc.wait(timeout=5)
-                except Exception:
-                    pass
-            time.sleep(1)
+        benchmark_version(v)
 
 if __name__ == "__main__":
     main()
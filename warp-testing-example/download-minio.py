@@ -1,17 +1,51 @@
-# save as download_minio_binaries.py
+#!/usr/bin/env python3
+"""
+download-minio.py — fetch every archived MinIO binary into ~/minio_versions/<version>/minio.
+
+  * bounded thread pool (--workers)
+  * resumes interrupted downloads from <dest>/<version>/minio.part with HTTP Range
+  * SHA-256 computed while streaming and checked against <file>.sha256sum
+  * manifest.json in the destination: re-runs skip binaries already fetched
+
+Usage:
+  python3 download-minio.py [--base-url URL] [--platform linux-amd64] [--dest ~/minio_versions]
+                            [--workers 4] [--match RELEASE.2025-] [--verify]
+  python3 download-minio.py --self-test     # against a local HTTP stand-in server
+"""
+
+import argparse
+import hashlib
+import json
 import os
+import platform
 import re
 import stat
-import urllib.request
+import sys
+import threading
 import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-BASE_URL = "https://dl.min.io/aistor/minio/release/darwin-arm64/archive/"
-DEST_DIR = "/Users/cniackz/minio_versions"
+BASE_URL = os.environ.get("MINIO_DOWNLOAD_URL", "https://dl.min.io/aistor/minio/release")
+DEST_DIR = os.path.expanduser(os.environ.get("MINIO_VERSIONS_DIR", "~/minio_versions"))
+CHUNK = 1024 * 1024
 
 EXCLUDE_SUFFIXES = (".asc", ".minisig", ".sha256sum")
 
-def list_index_files():
-    req = urllib.request.Request(BASE_URL)
+class ChecksumError(Exception):
+    pass
+
+def default_platform():
+    system = platform.system().lower()
+    machine = platform.machine().lower()
+    arch = {"x86_64": "amd64", "aarch64": "arm64"}.get(machine, machine)
+    return f"{system}-{arch}"
+
+def archive_url(base_url, plat):
+    return f"{base_url.rstrip('/')}/{plat}/archive/"
+
+def list_index_files(index_url):
+    req = urllib.request.Request(index_url)
     with urllib.request.urlopen(req, timeout=60) as resp:
         html = resp.read().decode("utf-8", errors="ignore")
     # Extrae todos los href del índice
@@ -24,69 +58,264 @@ def list_index_files():
         # Solo archivos que empiezan con "minio"
         if not href.startswith("minio"):
             continue
-        # Excluir firmas/sumas
+        # Excluir firmas/sumas (la .sha256sum se baja aparte, junto a su binario)
         if href.endswith(EXCLUDE_SUFFIXES):
             continue
         files.append(href)
     return sorted(set(files))
 
-def dest_for(filename: str) -> str:
-    """
-    filename: 'minio' o 'minio.RELEASE.2025-07-30T15-53-03Z'
-    Devuelve la ruta de carpeta destino y el path final del binario.
-    """
+def version_for(filename: str) -> str:
+    """'minio' -> latest, 'minio.RELEASE.2025-07-30T15-53-03Z' -> RELEASE.2025-07-30T15-53-03Z."""
     if filename == "minio":
-        folder = os.path.join(DEST_DIR, "latest")
-    elif filename.startswith("minio.RELEASE."):
-        version = filename[len("minio."):].strip()
-        folder = os.path.join(DEST_DIR, version)
-    else:
-        # fallback: carpeta con el nombre del archivo
-        folder = os.path.join(DEST_DIR, filename)
-    os.makedirs(folder, exist_ok=True)
+        return "latest"
+    if filename.startswith("minio."):
+        return filename[len("minio."):].strip()
+    return filename
+
+def dest_for(dest_dir: str, filename: str):
+    folder = os.path.join(dest_dir, version_for(filename))
     return folder, os.path.join(folder, "minio")
 
-def download_file(url: str, out_path: str):
+class Manifest:
+    """manifest.json: {archivo: {version, sha256, size, verified}}; escrituras atómicas."""
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        try:
+            with open(path) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, filename):
+        with self.lock:
+            return self.entries.get(filename)
+
+    def put(self, filename, entry):
+        with self.lock:
+            self.entries[filename] = entry
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.entries, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+
+def fetch_checksum(url):
+    """Hex SHA-256 publicado en <url>.sha256sum, o None si no existe."""
+    try:
+        with urllib.request.urlopen(url + ".sha256sum", timeout=60) as r:
+            text = r.read().decode("utf-8", errors="ignore")
+    except urllib.error.HTTPError as e:
+        if e.code == 404:
+            return None
+        raise
+    m = re.search(r"\b([0-9a-fA-F]{64})\b", text)
+    return m.group(1).lower() if m else None
+
+def hash_file(path, digest=None):
+    digest = digest or hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(CHUNK)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest
+
+def download_file(url: str, out_path: str, expected=None):
+    """Descarga con reanudación desde out_path.part; devuelve (sha256, bytes, bytes reanudados)."""
     tmp_path = out_path + ".part"
+    have = os.path.getsize(tmp_path) if os.path.exists(tmp_path) else 0
+    req = urllib.request.Request(url)
+    if have:
+        req.add_header("Range", f"bytes={have}-")
     try:
-        with urllib.request.urlopen(url, timeout=300) as r, open(tmp_path, "wb") as f:
+        r = urllib.request.urlopen(req, timeout=300)
+    except urllib.error.HTTPError as e:
+        if e.code != 416:
+            raise
+        # El .part ya está completo (o es más largo que el archivo): se decide por checksum
+        digest = hash_file(tmp_path)
+        if expected and digest.hexdigest() != expected:
+            os.remove(tmp_path)
+            return download_file(url, out_path, expected)
+        os.replace(tmp_path, out_path)
+        return digest.hexdigest(), have, have
+
+    with r:
+        if have and r.status == 206:
+            digest = hash_file(tmp_path)
+            mode = "ab"
+        else:
+            digest, have, mode = hashlib.sha256(), 0, "wb"
+        size = have
+        with open(tmp_path, mode) as f:
             while True:
-                chunk = r.read(1024 * 1024)
+                chunk = r.read(CHUNK)
                 if not chunk:
                     break
+                digest.update(chunk)
                 f.write(chunk)
-        os.replace(tmp_path, out_path)
-    except Exception:
-        try:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
-        finally:
-            raise
+                size += len(chunk)
+        length = r.headers.get("Content-Length")
+        if length is not None and size - have != int(length):
+            # Queda el .part para reanudar en la próxima corrida
+            raise IOError(f"truncated download: {size - have} of {length} bytes")
 
-def main():
-    os.makedirs(DEST_DIR, exist_ok=True)
-    files = list_index_files()
+    sha = digest.hexdigest()
+    if expected and sha != expected:
+        os.remove(tmp_path)
+        raise ChecksumError(f"sha256 mismatch: got {sha}, expected {expected}")
+    os.replace(tmp_path, out_path)
+    return sha, size, have
+
+def fetch_one(index_url, dest_dir, fname, manifest, verify=False):
+    """Devuelve (estado, mensaje); estado en ok/skip/error."""
+    folder, bin_path = dest_for(dest_dir, fname)
+    entry = manifest.get(fname)
+    if entry and os.path.exists(bin_path) and os.path.getsize(bin_path) == entry.get("size"):
+        if not verify or hash_file(bin_path).hexdigest() == entry.get("sha256"):
+            return "skip", f"✅ Ya existe: {bin_path}"
+
+    url = index_url + fname
+    try:
+        expected = fetch_checksum(url)
+        os.makedirs(folder, exist_ok=True)
+        if os.path.exists(bin_path) and not entry:
+            # Binario de una versión anterior del script: se verifica en vez de bajarlo otra vez
+            sha = hash_file(bin_path).hexdigest()
+            if expected is None or sha == expected:
+                manifest.put(fname, {"version": version_for(fname), "sha256": sha,
+                                     "size": os.path.getsize(bin_path), "verified": expected is not None})
+                return "skip", f"✅ Ya existe (verificado): {bin_path}"
+            os.remove(bin_path)
+        sha, size, resumed = download_file(url, bin_path, expected)
+        # chmod +x
+        os.chmod(bin_path, os.stat(bin_path).st_mode | stat.S_IEXEC)
+        manifest.put(fname, {"version": version_for(fname), "sha256": sha, "size": size,
+                             "verified": expected is not None})
+        note = f", reanudado desde {resumed} bytes" if resumed else ""
+        check = "sha256 OK" if expected else "sin .sha256sum"
+        return "ok", f"✔ Listo: {bin_path} ({size} bytes, {check}{note})"
+    except urllib.error.HTTPError as e:
+        return "error", f"❌ HTTP {e.code} al descargar {fname}"
+    except Exception as e:
+        return "error", f"❌ Error con {fname}: {e}"
+
+def download_all(base_url, plat, dest_dir, workers=4, match=None, verify=False):
+    os.makedirs(dest_dir, exist_ok=True)
+    index_url = archive_url(base_url, plat)
+    files = [f for f in list_index_files(index_url) if not match or match in f]
     if not files:
         print("No se encontraron archivos válidos en el índice.")
-        return
-    print(f"Encontrados {len(files)} binarios para descargar.")
+        return {}
+    print(f"Encontrados {len(files)} binarios en {index_url}")
 
-    for fname in files:
-        folder, bin_path = dest_for(fname)
-        if os.path.exists(bin_path):
-            print(f"✅ Ya existe: {bin_path}")
-            continue
-        url = BASE_URL + fname
-        print(f"⬇️ {fname} → {bin_path}")
-        try:
-            download_file(url, bin_path)
-            # chmod +x
-            os.chmod(bin_path, os.stat(bin_path).st_mode | stat.S_IEXEC)
-            print(f"✔ Listo: {bin_path}")
-        except urllib.error.HTTPError as e:
-            print(f"❌ HTTP {e.code} al descargar {fname}")
-        except Exception as e:
-            print(f"❌ Error con {fname}: {e}")
+    manifest = Manifest(os.path.join(dest_dir, "manifest.json"))
+    counts = {"ok": 0, "skip": 0, "error": 0}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fetch_one, index_url, dest_dir, f, manifest, verify) for f in files]
+        for fut in as_completed(futures):
+            status, msg = fut.result()
+            counts[status] += 1
+            print(msg)
+    print(f"\nDescargados {counts['ok']}, ya presentes {counts['skip']}, errores {counts['error']}")
+    return counts
+
+def self_test():
+    """Sirve un índice falso con soporte de Range y comprueba descarga, reanudación, checksum y manifest."""
+    import shutil
+    import tempfile
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+    class RangeHandler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def send_head(self):
+            path = self.translate_path(self.path)
+            rng = self.headers.get("Range")
+            if not rng or os.path.isdir(path) or not os.path.exists(path):
+                return super().send_head()
+            size = os.path.getsize(path)
+            start = int(rng.split("=")[1].split("-")[0])
+            if start >= size:
+                self.send_error(416)
+                return None
+            f = open(path, "rb")
+            f.seek(start)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{size - 1}/{size}")
+            self.send_header("Content-Length", str(size - start))
+            self.end_headers()
+            return f
+
+    root = tempfile.mkdtemp()
+    dest = tempfile.mkdtemp()
+    try:
+        archive = os.path.join(root, "test-plat", "archive")
+        os.makedirs(archive)
+        blobs = {"minio.RELEASE.2025-01-01T00-00-00Z": os.urandom(3 * CHUNK + 123),
+                 "minio.RELEASE.2025-02-01T00-00-00Z": os.urandom(CHUNK // 2),
+                 "minio.RELEASE.2025-03-01T00-00-00Z": os.urandom(1000)}
+        links = []
+        for name, data in blobs.items():
+            with open(os.path.join(archive, name), "wb") as f:
+                f.write(data)
+            sha = hashlib.sha256(data).hexdigest()
+            if name.endswith("03-01T00-00-00Z"):
+                sha = "0" * 64  # checksum publicado incorrecto
+            with open(os.path.join(archive, name + ".sha256sum"), "w") as f:
+                f.write(f"{sha}  {name}\n")
+            links += [name, name + ".sha256sum"]
+        with open(os.path.join(archive, "index.html"), "w") as f:
+            f.write("".join(f'<a href="{n}">{n}</a>\n' for n in ["../"] + links))
+
+        handler = lambda *a, **kw: RangeHandler(*a, directory=root, **kw)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+
+        # .part a medias de una descarga previa
+        first = "minio.RELEASE.2025-01-01T00-00-00Z"
+        folder, bin_path = dest_for(dest, first)
+        os.makedirs(folder)
+        with open(bin_path + ".part", "wb") as f:
+            f.write(blobs[first][:CHUNK + 7])
+
+        checks = []
+        counts = download_all(base, "test-plat", dest, workers=3)
+        checks.append(("first run downloads 2, rejects bad checksum", counts == {"ok": 2, "skip": 0, "error": 1}))
+        ok = all(open(dest_for(dest, n)[1], "rb").read() == blobs[n] for n in list(blobs)[:2])
+        checks.append(("resumed and fresh binaries match", ok))
+        checks.append(("bad checksum leaves no binary", not os.path.exists(dest_for(dest, list(blobs)[2])[1])))
+        counts = download_all(base, "test-plat", dest, workers=3, verify=True)
+        checks.append(("re-run skips what the manifest has", counts["skip"] == 2 and counts["ok"] == 0))
+        server.shutdown()
+
+        print()
+        for name, passed in checks:
+            print(f"{'PASS' if passed else 'FAIL'}  {name}")
+        return 0 if all(p for _, p in checks) else 1
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+        shutil.rmtree(dest, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Download archived MinIO binaries (parallel, resumable, verified).")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"Release URL without platform (default: {BASE_URL})")
+    parser.add_argument("--platform", default=default_platform(), help="e.g. linux-amd64, darwin-arm64 (default: this host)")
+    parser.add_argument("--dest", default=DEST_DIR, help=f"Destination directory (default: {DEST_DIR})")
+    parser.add_argument("--workers", type=int, default=4, help="Parallel downloads (default: 4)")
+    parser.add_argument("--match", help="Only files whose name contains this string")
+    parser.add_argument("--verify", action="store_true", help="Re-hash binaries already in the manifest")
+    parser.add_argument("--self-test", action="store_true", help="Run against a local stand-in HTTP server")
+    args = parser.parse_args()
+
+    if args.self_test:
+        return self_test()
+    counts = download_all(args.base_url, args.platform, os.path.expanduser(args.dest),
+                          args.workers, args.match, args.verify)
+    return 1 if counts.get("error") else 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
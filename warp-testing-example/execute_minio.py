@@ -7,6 +7,7 @@ and launch the requested binary.
 Usage:
   python3 execute_minio.py <MINIO_VERSION> [--base ~/minio_versions] [--no-clean]
                            [--clean-cmd 'clean_minio_vols'] [--daemon]
+                           [--drives '/mnt/data{1...4}'] [--reset parallel|rename|tmpfs|loopback|serial]
                            [--dry-run] [--] [MINIO_ARGS ...]
 
 Examples:
@@ -19,6 +20,8 @@ Notes:
     b) an executable file itself (named exactly like the version, or 'minio').
 - It tries to kill existing MinIO processes with multiple strategies (pkill/pgrep/kill).
 - It runs a shell command called 'clean_minio_vols' unless you pass --no-clean or change it with --clean-cmd.
+  'clean_minio_vols' resets --drives (default $MINIO_DRIVES) with volumes.py and records the reset time;
+  pass the same drives to MinIO if you give MINIO_ARGS yourself.
 """
 
 import argparse
@@ -110,61 +113,47 @@ def kill_minio(verbose: bool = True) -> None:
     if verbose:
         print("Kill attempts complete.")
 
-# --- helpers de limpieza en Python ---
-from pathlib import Path
-import shutil
+# --- limpieza de volúmenes: ver volumes.py (estrategias serial/parallel/rename/tmpfs/loopback) ---
+import volumes
 
-DATA_DIRS = [Path(f"/Volumes/data{i}") for i in range(1, 5)]
+# results_store.py vive en la raíz del repo
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+try:
+    from results_store import open_default
+except ImportError:
+    open_default = None
 
-def _safe_clear_dir(dir_path: Path):
-    """Borra TODO el contenido del directorio (archivos, carpetas, enlaces),
-    pero NO borra el directorio root en sí."""
-    if not dir_path.exists():
-        dir_path.mkdir(parents=True, exist_ok=True)
+def record_reset(version: str, strategy: str, drives: List[Path], secs: float) -> None:
+    store = open_default() if open_default else None
+    if store is None:
         return
-    # Recorre contenido y elimina cada entrada
-    for entry in dir_path.iterdir():
-        try:
-            if entry.is_symlink() or entry.is_file():
-                entry.unlink(missing_ok=True)
-            elif entry.is_dir():
-                shutil.rmtree(entry, ignore_errors=True)
-            else:
-                # fallback
-                entry.unlink(missing_ok=True)
-        except Exception:
-            # no detenemos el proceso por errores individuales
-            pass
-
-def python_clean_minio_vols():
-    # 1) Borra contenido normal
-    for d in DATA_DIRS:
-        _safe_clear_dir(d)
-    # 2) Asegura que no quede .minio.sys (si existe como carpeta/archivo)
-    for d in DATA_DIRS:
-        msys = d / ".minio.sys"
-        if msys.exists():
-            try:
-                if msys.is_dir():
-                    shutil.rmtree(msys, ignore_errors=True)
-                else:
-                    msys.unlink(missing_ok=True)
-            except Exception:
-                pass
-
-# --- reemplaza tu run_clean por este ---
-def run_clean(clean_cmd: Optional[str], dry_run: bool = False) -> None:
-    """Si el clean_cmd es 'clean_minio_vols', usa la versión Python.
+    try:
+        ms = secs * 1000
+        store.record_run(
+            [{"operation": "VOLUME-RESET", "ops": 1, "mean_ms": ms, "p50_ms": ms}],
+            tool="minio-reset", minio_version=version, mode=strategy,
+            disk_layout=os.environ.get("DISK_LAYOUT") or f"{len(drives)}-drive",
+            session_id=os.environ.get("BENCH_SESSION"),
+            params={"drives": [str(d) for d in drives]},
+        )
+    finally:
+        store.close()
+
+def run_clean(clean_cmd: Optional[str], args, version: str, dry_run: bool = False) -> None:
+    """Si el clean_cmd es 'clean_minio_vols', resetea los drives con volumes.py (--reset).
     Si no, ejecuta el comando tal cual (compatibilidad)."""
     if not clean_cmd:
         return
 
     if clean_cmd.strip() == "clean_minio_vols":
-        if dry_run:
-            print("[dry-run] Would run python_clean_minio_vols()")
-            return
-        print("Running clean (Python): clean_minio_vols")
-        python_clean_minio_vols()
+        drives = volumes.expand_drives(args.drives)
+        try:
+            secs = volumes.reset_from_args(args, dry_run=dry_run)
+        except (RuntimeError, ValueError, subprocess.CalledProcessError) as e:
+            print(f"Warning: volume reset '{args.reset}' failed ({e}); clearing in parallel")
+            secs = volumes.reset_volumes(drives, "parallel", dry_run=dry_run)
+        if not dry_run:
+            record_reset(version, args.reset, drives, secs)
         return
 
     # Fallback: comando externo (cuando quieras otra cosa explícita)
@@ -178,16 +167,24 @@ def run_clean(clean_cmd: Optional[str], dry_run: bool = False) -> None:
     if proc.returncode != 0:
         print(f"Warning: clean command exited with code {proc.returncode}")
 
-def launch_minio(binary: Path, args: List[str], dry_run: bool) -> int:
+def launch_minio(binary: Path, args: List[str], dry_run: bool, daemon: bool = False) -> int:
     ensure_exec(binary)
     cmd = [str(binary)] + args
     if dry_run:
         print(f"[dry-run] Would execute: {' '.join(shlex.quote(c) for c in cmd)}")
         return 0
 
+    if daemon:
+        proc = subprocess.Popen(cmd, start_new_session=True)
+        Path("/tmp/minio_pid.txt").write_text(str(proc.pid))
+        print(f"Started MinIO in background (pid {proc.pid}): {' '.join(shlex.quote(c) for c in cmd)}")
+        return 0
+
     print(f"Starting MinIO (foreground): {' '.join(shlex.quote(c) for c in cmd)}")
     print(f"[DEBUG] Launching foreground command: {' '.join(shlex.quote(c) for c in cmd)}")
     proc = subprocess.Popen(cmd)
+    # PID del binario (no de este wrapper) para que readiness.py mida el arranque real
+    Path("/tmp/minio_pid.txt").write_text(str(proc.pid))
     try:
         proc.wait()
         return proc.returncode
@@ -205,9 +202,15 @@ def main():
     parser.add_argument("--no-clean", action="store_true", help="Skip running clean command before start")
     parser.add_argument("--clean-cmd", default="clean_minio_vols", help="Shell command/function to clean disks (default: clean_minio_vols)")
     parser.add_argument("--dry-run", action="store_true", help="Print what would happen without doing it")
-    parser.add_argument("--", dest="sep", nargs="*", help=argparse.SUPPRESS)  # accept bare --
-    parser.add_argument("minio_args", nargs=argparse.REMAINDER, help="Arguments passed to MinIO after --")
-    args = parser.parse_args()
+    parser.add_argument("--daemon", action="store_true", help="Start MinIO in the background and return")
+    volumes.add_arguments(parser)
+    # Lo que va después de "--" es para MinIO; un REMAINDER se tragaba también --base y compañía
+    argv = sys.argv[1:]
+    minio_args = []
+    if "--" in argv:
+        i = argv.index("--")
+        argv, minio_args = argv[:i], argv[i + 1:]
+    args = parser.parse_args(argv)
 
     base = Path(os.path.expanduser(args.base))
     version = args.version.strip()
@@ -226,31 +229,22 @@ def main():
     kill_minio(verbose=True)
     # 2) Clean
     if not args.no_clean:
-        run_clean(args.clean_cmd, dry_run=args.dry_run)
+        run_clean(args.clean_cmd, args, version, dry_run=args.dry_run)
     else:
         print("Skipping clean command (--no-clean).")
 
     # 3) Launch
-    # Remove leading '--' if present in args.minio_args
-
-
     DEFAULT_MINIO_ARGS = [
         "server",
-        "/Volumes/data{1...4}",
+        *args.drives.split(),
         "--address", ":9000",
         "--console-address", ":9001",
         "--license", "/usr/local/bin/minio.license"
     ]
 
-    # inside main()
-    passed_args = args.minio_args
-    if passed_args and passed_args[0] == "--":
-        passed_args = passed_args[1:]
-
-    if not passed_args:
-        passed_args = DEFAULT_MINIO_ARGS
+    passed_args = minio_args or DEFAULT_MINIO_ARGS
 
-    code = launch_minio(binary, passed_args, dry_run=args.dry_run)
+    code = launch_minio(binary, passed_args, dry_run=args.dry_run, daemon=args.daemon)
     print(f"MinIO exited with code {code}")
     sys.exit(0 if args.daemon or code == 0 else code)
 
@@ -4,9 +4,34 @@ import time
 import os
 import csv
 import re
+import sys
 from datetime import datetime
 from pathlib import Path
 
+# results_store.py y compañía viven en la raíz del repo; cada uno es opcional por separado
+# (que falte uno no debe apagar los demás)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+try:
+    from results_store import open_default
+except ImportError as e:
+    print(f"⚠️ results store desactivado: {e}")
+    open_default = None
+try:
+    from readiness import wait_for_port
+except ImportError as e:
+    print(f"⚠️ readiness.py no disponible, se usa una espera fija: {e}")
+    wait_for_port = None
+try:
+    import telemetry
+except ImportError as e:
+    print(f"⚠️ telemetría desactivada: {e}")
+    telemetry = None
+try:
+    import warp_ingest
+except ImportError as e:
+    print(f"⚠️ ingesta del log de warp desactivada: {e}")
+    warp_ingest = None
+
 # Configuración de credenciales para warp
 os.environ["WARP_ACCESS_KEY"] = "minio"
 os.environ["WARP_SECRET_KEY"] = "minio123"
@@ -22,23 +47,58 @@ client_proc = subprocess.Popen(
     stderr=subprocess.PIPE
 )
 
-# Espera unos segundos para que el cliente arranque
-time.sleep(3)
+# Espera a que el cliente escuche (antes: sleep fijo de 3s)
+if wait_for_port is not None:
+    host, port = warp_client_addr.rsplit(":", 1)
+    if not wait_for_port(host, int(port), timeout=15):
+        print(f"⚠️ warp client no escucha en {warp_client_addr}")
+else:
+    time.sleep(3)
 
 AVG_RE = re.compile(r"^\s*\*\s*Average:\s*([\d.]+)\s*MiB/s", re.MULTILINE)  # <-- NUEVO
 
+# Log completo de operaciones de warp (se ingiere con warp_ingest.py); warp le agrega .csv.zst
+benchdata = f"warp-put-{datetime.now():%Y%m%d-%H%M%S}"
+# Las versiones nuevas de warp solo guardan el agregado JSON salvo con --full
+extra_args = ["--full"] if os.environ.get("WARP_FULL") == "1" else []
+
+def find_benchdata(prefix):
+    for suffix in (".csv.zst", ".csv.gz", ".csv"):
+        if Path(prefix + suffix).exists():
+            return prefix + suffix
+    return None
+
+# Get MinIO Version
+version_file = Path("/tmp/minio_version.txt")
+if version_file.exists():
+    minio_version = version_file.read_text().strip()
+else:
+    minio_version = "UNKNOWN"
+
+# Muestreo /proc del servidor durante la corrida de warp (pid de execute_minio.py)
+sampler = telemetry.sampler_from_env() if telemetry else None
+
 # Ejecuta la prueba de warp
 try:
-    run = subprocess.run([
-        "warp", "put",
-        "--warp-client", warp_client_addr,
-        "--host", minio_host,
-        "--bucket", "warp-test",
-        "--duration", "20s",
-        "--obj.size", "1MiB",
-        "--concurrent", "32",
-        "--noclear",
-    ], check=True, text=True, capture_output=True)
+    if sampler:
+        sampler.start()
+    try:
+        run = subprocess.run([
+            "warp", "put",
+            "--warp-client", warp_client_addr,
+            "--host", minio_host,
+            "--bucket", "warp-test",
+            "--duration", "20s",
+            "--obj.size", "1MiB",
+            "--concurrent", "32",
+            "--noclear",
+            "--benchdata", benchdata,
+            *extra_args,
+        ], check=True, text=True, capture_output=True)
+    finally:
+        # También si warp falla (CalledProcessError): el hilo del sampler no debe quedar vivo
+        if sampler:
+            sampler.stop()
 
     # Muestra la salida normal en consola como antes
     if run.stdout:
@@ -46,26 +106,62 @@ try:
     if run.stderr:
         print(run.stderr, end="")
 
-    # Extrae el Average MiB/s y guarda CSV
-    m = AVG_RE.search(run.stdout or "")
-    if m:
-        avg_mib = float(m.group(1))
+    # Ingiere el log completo de operaciones; "Average:" queda como respaldo
+    ops = None
+    path = find_benchdata(benchdata)
+    if path and warp_ingest is not None:
+        try:
+            ops, lines = warp_ingest.ingest(path)
+        except (OSError, ValueError) as e:
+            print(f"\n⚠️ No se pudo leer {path}: {e}")
+    avg_mib = None
+    if ops and "PUT" in ops:
+        warp_ingest.print_summary(ops, 1.0)
+        avg_mib = round(ops["PUT"].mibps(), 2)
+        print(f"\ningested PUT: {avg_mib} MiB/s ({lines} operations from {path})")
+    else:
+        m = AVG_RE.search(run.stdout or "")
+        if m:
+            avg_mib = float(m.group(1))
 
-        # Get MinIO Version
-        version_file = Path("/tmp/minio_version.txt")
-        if version_file.exists():
-            minio_version = version_file.read_text().strip()
-        else:
-            minio_version = "UNKNOWN"
+    server_rows = []
+    if sampler:
+        put_bytes = ops["PUT"].bytes if ops and "PUT" in ops else None
+        summary = sampler.summary(put_bytes, put_bytes)
+        if summary:
+            print("\n" + telemetry.format_summary(summary))
+            server_rows.append(telemetry.telemetry_row(sampler, summary))
 
+    if avg_mib is not None:
         row = [minio_version, avg_mib]
 
         with open("warp_results.csv", "a", newline="") as f:
             writer = csv.writer(f)
             writer.writerow(row)
         print(f"\n✅ Guardado en warp_results.csv: {row}")
+
+        params = {"duration": "20s", "host": minio_host, "bucket": "warp-test"}
+        if ops:
+            run_id = warp_ingest.save(ops, 1.0, minio_version, path, object_size=1024 * 1024,
+                                      concurrency=32, params=params, extra_rows=server_rows)
+            if run_id:
+                print(f"✅ Guardado en el results store: run {run_id}")
+        else:
+            store = open_default() if open_default else None
+            if store is not None:
+                try:
+                    run_id = store.record_run(
+                        [{"operation": "PUT", "mibps": avg_mib}] + server_rows,
+                        tool="warp", minio_version=minio_version, mode="warp-put",
+                        disk_layout=os.environ.get("DISK_LAYOUT"), object_size=1024 * 1024, concurrency=32,
+                        session_id=os.environ.get("BENCH_SESSION"),
+                        params=params,
+                    )
+                    print(f"✅ Guardado en {store.path}: run {run_id}")
+                finally:
+                    store.close()
     else:
-        print("\n⚠️ No se encontró la línea de 'Average' en la salida de warp.")
+        print("\n⚠️ No se encontró el log de operaciones ni la línea de 'Average' en la salida de warp.")
 
 finally:
     # Mata el cliente al terminar la prueba
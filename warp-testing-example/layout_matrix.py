@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+layout_matrix.py — run one MinIO version over several drive layouts and record how throughput scales.
+
+For every drive count (--drive-counts 1,4,8,16) and erasure set size
+(--set-sizes auto,4,8; MINIO_ERASURE_SET_DRIVE_COUNT, skipped when it does
+not divide the drive count) it:
+  1. creates N fresh drives under --root with volumes.py (--backend tmpfs, loopback or dir)
+  2. starts MinIO on its own port and data dirs (--port-base, +2 per layout, console on +1)
+  3. waits until it is ready (readiness.py, recorded as TIME-TO-READY)
+  4. runs the workload (default: benchmark.py with the current env: OBJECT_SIZE, CONCURRENCY, ...)
+     with MINIO_ENDPOINT, TELEMETRY_PID and DISK_LAYOUT pointing at this layout
+  5. stops MinIO and releases the drives
+
+All runs share a fresh BENCH_SESSION (an inherited one is only kept as
+parent_session in the summary). At the end the session is read back from
+the results store and summarised as PUT/GET MiB/s per layout, the speed-up
+over the smallest layout and the per-drive efficiency. The summary is stored
+as tool "layout-matrix" (operations PUT@<layout>, GET@<layout>).
+
+Usage:
+  sudo -E python3 layout_matrix.py RELEASE.2025-07-29T06-52-30Z --drive-counts 1,4,8,16 --backend tmpfs
+  python3 layout_matrix.py latest --backend dir --drive-counts 1,4 -- python3 benchmark.py   # workload runs from the repo root
+"""
+
+import argparse
+import json
+import os
+import shlex
+import subprocess
+import sys
+import uuid
+from pathlib import Path
+
+import volumes
+from execute_minio import ensure_exec, find_minio_binary
+
+# results_store.py y readiness.py viven en la raíz del repo
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+# Sin readiness.py no se corre: el workload iría contra un MinIO que nadie esperó
+import readiness
+try:
+    from results_store import open_default
+except ImportError as e:
+    print(f"Warning: results store disabled, no summary will be stored: {e}")
+    open_default = None
+
+BACKENDS = {"tmpfs": "tmpfs", "loopback": "loopback", "dir": "parallel"}
+
+class Layout:
+    def __init__(self, drives, set_size, index, root, port_base):
+        self.drives = drives
+        self.set_size = set_size
+        self.name = f"{drives}-drive" + (f"-set{set_size}" if set_size else "")
+        self.dir = Path(root) / self.name
+        self.paths = [self.dir / f"d{i}" for i in range(1, drives + 1)]
+        self.port = port_base + 2 * index
+
+    def server_args(self):
+        # Un solo drive: modo single-drive; varios: sintaxis de elipsis de MinIO
+        data = [str(self.paths[0])] if self.drives == 1 else [f"{self.dir}/d{{1...{self.drives}}}"]
+        return ["server", *data, "--address", f"127.0.0.1:{self.port}",
+                "--console-address", f"127.0.0.1:{self.port + 1}"]
+
+def layouts_for(counts, set_sizes, root, port_base):
+    out = []
+    for n in counts:
+        for s in set_sizes:
+            if s and (n % s or s > n):
+                print(f"Skipping {n} drives with erasure set size {s} (must divide the drive count)")
+                continue
+            out.append(Layout(n, s, len(out), root, port_base))
+    return out
+
+def start_minio(binary, layout, extra_args, env):
+    menv = {**env, "MINIO_ROOT_USER": env.get("MINIO_ACCESS_KEY", "minioadmin"),
+            "MINIO_ROOT_PASSWORD": env.get("MINIO_SECRET_KEY", "minioadmin")}
+    if layout.set_size:
+        menv["MINIO_ERASURE_SET_DRIVE_COUNT"] = str(layout.set_size)
+    cmd = [str(binary), *layout.server_args(), *extra_args]
+    print(f"Starting MinIO: {' '.join(shlex.quote(c) for c in cmd)}")
+    # El hijo hereda su propia copia del descriptor: el nuestro se cierra enseguida
+    with open(layout.dir.parent / f"{layout.name}.log", "w") as log:
+        return subprocess.Popen(cmd, env=menv, stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+
+def stop_minio(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+def run_layout(binary, version, layout, args, workload, session):
+    layout.dir.mkdir(parents=True, exist_ok=True)
+    secs = volumes.reset_volumes(layout.paths, BACKENDS[args.backend], size=args.volume_size,
+                                 image_dir=str(Path(args.root) / "images"))
+    print(f"{layout.name}: {len(layout.paths)} drive(s) ready in {secs:.2f}s")
+    proc = start_minio(binary, layout, args.minio_arg, os.environ)
+    try:
+        endpoint = f"127.0.0.1:{layout.port}"
+        result = readiness.wait_ready(endpoint, args.timeout, pid=proc.pid)
+        print(result.line())
+        if not result.ok:
+            raise RuntimeError(f"MinIO did not become ready for {layout.name} (see {layout.dir.parent}/{layout.name}.log)")
+        readiness.record(result, version, disk_layout=layout.name, session_id=session)
+        # MODE no se toca: mismo número de iteraciones en todos los layouts
+        env = {**os.environ, "MINIO_ENDPOINT": endpoint, "MINIO_VERSION": version, "TELEMETRY_PID": str(proc.pid),
+               "DISK_LAYOUT": layout.name, "BENCH_SESSION": session}
+        print(f"Running workload on {layout.name}: {' '.join(shlex.quote(c) for c in workload)}")
+        code = subprocess.run(workload, env=env, cwd=ROOT_DIR).returncode
+        if code != 0:
+            print(f"Warning: workload exited with code {code} on {layout.name}")
+    finally:
+        stop_minio(proc)
+        if args.backend != "dir":
+            volumes.release_volumes(layout.paths)
+
+def summarize(session, layouts, version, parent_session=None):
+    """Lee la sesión del results store: MiB/s de PUT/GET por layout y escalado."""
+    store = open_default() if open_default else None
+    if store is None:
+        print("No results store (RESULTS_DB): nothing to summarize")
+        return
+    try:
+        by_layout = {}
+        for row in store.iter_rows(session_id=session):
+            if row["tool"] == "benchmark.py" and row["operation"] in ("PUT", "GET") and row["mibps"]:
+                by_layout.setdefault(row["disk_layout"], {}).setdefault(row["operation"], []).append(row["mibps"])
+        done = [l for l in layouts if l.name in by_layout]
+        if not done:
+            print("No PUT/GET results recorded for this session")
+            return
+        base = done[0]
+        print(f"\nDrive-layout scaling for {version} (session {session}):")
+        print(f"{'layout':<18} {'drives':>6} {'set':>5} {'PUT MiB/s':>10} {'x':>6} {'eff':>5} "
+              f"{'GET MiB/s':>10} {'x':>6} {'eff':>5}")
+        rows = []
+
+        def mean(layout, op):
+            values = by_layout[layout.name].get(op, [])
+            return sum(values) / len(values) if values else 0.0
+
+        for l in done:
+            cells = []
+            for op in ("PUT", "GET"):
+                rate, ref = mean(l, op), mean(base, op)
+                speedup = rate / ref if ref else 0.0
+                # Eficiencia por drive: 100% = escala lineal con el número de drives
+                eff = speedup / (l.drives / base.drives) * 100
+                cells.append(f"{rate:>10.1f} {speedup:>5.2f}x {eff:>4.0f}%")
+                rows.append({"operation": f"{op}@{l.name}", "ops": len(by_layout[l.name].get(op, [])),
+                             "mibps": rate, "extra": json.dumps({"drives": l.drives, "set_size": l.set_size or "auto",
+                                                                 "speedup": speedup, "efficiency": eff / 100})})
+            print(f"{l.name:<18} {l.drives:>6} {l.set_size or 'auto':>5} {cells[0]} {cells[1]}")
+        store.record_run(rows, tool="layout-matrix", minio_version=version, mode="scaling",
+                         session_id=session, params={"layouts": [l.name for l in done],
+                                                     "parent_session": parent_session})
+    finally:
+        store.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a MinIO version over a matrix of drive layouts.")
+    parser.add_argument("version", help="Version folder/file under --base (e.g. latest or RELEASE...)")
+    parser.add_argument("--base", default="~/minio_versions", help="Base directory containing versions")
+    parser.add_argument("--drive-counts", default="1,4,8,16", help="Drive counts to test (default: 1,4,8,16)")
+    parser.add_argument("--set-sizes", default="auto",
+                        help="Erasure set sizes (MINIO_ERASURE_SET_DRIVE_COUNT), 'auto' = MinIO's choice")
+    parser.add_argument("--backend", default="tmpfs", choices=sorted(BACKENDS),
+                        help="tmpfs / loopback (Linux, root) or plain directories (default: tmpfs)")
+    parser.add_argument("--volume-size", default=os.environ.get("MINIO_VOLUME_SIZE", "2G"),
+                        help="Size of each tmpfs/loopback drive (default: 2G)")
+    parser.add_argument("--root", default="/tmp/minio-matrix", help="Where drives live (default: /tmp/minio-matrix)")
+    parser.add_argument("--port-base", type=int, default=9200, help="First layout's API port (default: 9200)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds to wait for readiness (default: 120)")
+    parser.add_argument("--minio-arg", action="append", default=[],
+                        help="Extra MinIO server argument, repeatable (e.g. --minio-arg=--license --minio-arg=/path)")
+    parser.add_argument("--dry-run", action="store_true", help="Only print the layouts")
+    # Lo que va después de "--" es el comando del workload
+    argv = sys.argv[1:]
+    workload = [sys.executable, str(ROOT_DIR / "benchmark.py")]
+    if "--" in argv:
+        i = argv.index("--")
+        argv, workload = argv[:i], argv[i + 1:] or workload
+    args = parser.parse_args(argv)
+
+    counts = [int(x) for x in args.drive_counts.split(",") if x.strip()]
+    set_sizes = [None if s.strip() == "auto" else int(s) for s in args.set_sizes.split(",") if s.strip()]
+    layouts = layouts_for(counts, set_sizes, args.root, args.port_base)
+    if args.dry_run:
+        for l in layouts:
+            print(f"{l.name}: port {l.port}, {' '.join(l.server_args())}")
+        return 0
+
+    try:
+        binary = find_minio_binary(Path(os.path.expanduser(args.base)), args.version)
+    except FileNotFoundError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    ensure_exec(binary)
+    # Sesión siempre nueva: summarize() promedia todo lo de la sesión y una heredada traería corridas viejas
+    parent_session = os.environ.get("BENCH_SESSION")
+    session = f"layout-{uuid.uuid4().hex[:8]}"
+    print(f"Using MinIO binary: {binary}; {len(layouts)} layouts, session {session}")
+
+    failed = []
+    for layout in layouts:
+        print(f"\n=== {layout.name} ===")
+        try:
+            run_layout(binary, args.version, layout, args, workload, session)
+        except (RuntimeError, ValueError, subprocess.CalledProcessError) as e:
+            print(f"Layout {layout.name} failed: {e}", file=sys.stderr)
+            failed.append(layout.name)
+    summarize(session, layouts, args.version, parent_session)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+volumes.py — reset MinIO data drives between runs.
+
+Strategies (--reset / MINIO_RESET):
+  serial    delete every entry drive by drive (old clean_minio_vols)
+  parallel  delete top-level and second-level entries of all drives in a thread pool
+  rename    rename each drive dir aside, recreate it empty and delete the old
+            tree in a detached background process (next version starts at once)
+  tmpfs     unmount + mount a fresh tmpfs on every drive (Linux, root)
+  loopback  unmount, mkfs and loop-mount one image file per drive (Linux, root)
+
+Drives come from MINIO_DRIVES / --drives in MinIO's ellipsis syntax
+(`/mnt/data{1...4}`). Every reset reports how long it took.
+
+Usage:
+  python3 volumes.py --drives '/tmp/data{1...4}' --reset parallel
+"""
+
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+STRATEGIES = ("serial", "parallel", "rename", "tmpfs", "loopback")
+DEFAULT_DRIVES = "/Volumes/data{1...4}" if sys.platform == "darwin" else "/tmp/minio-data{1...4}"
+ELLIPSIS_RE = re.compile(r"\{(\d+)\.\.\.(\d+)\}")
+
+def drives_pattern(env=os.environ):
+    return env.get("MINIO_DRIVES", DEFAULT_DRIVES)
+
+def expand_drives(pattern):
+    """'/mnt/d{1...4}' -> [/mnt/d1, ..., /mnt/d4]; admite varios patrones separados por espacios."""
+    out = []
+    for part in pattern.split():
+        m = ELLIPSIS_RE.search(part)
+        if not m:
+            out.append(Path(part))
+            continue
+        lo, hi = int(m.group(1)), int(m.group(2))
+        for i in range(lo, hi + 1):
+            out.extend(expand_drives(part[:m.start()] + str(i) + part[m.end():]))
+    return out
+
+def _remove(entry: Path):
+    try:
+        if entry.is_symlink() or not entry.is_dir():
+            entry.unlink(missing_ok=True)
+        else:
+            shutil.rmtree(entry, ignore_errors=True)
+    except OSError:
+        # no detenemos el proceso por errores individuales
+        pass
+
+def _safe_clear_dir(dir_path: Path):
+    """Borra TODO el contenido del directorio, pero NO el directorio en sí."""
+    if not dir_path.exists():
+        dir_path.mkdir(parents=True, exist_ok=True)
+        return
+    for entry in dir_path.iterdir():
+        _remove(entry)
+
+def reset_serial(drives, **_):
+    for d in drives:
+        _safe_clear_dir(d)
+
+def reset_parallel(drives, workers=None, **_):
+    # Un bucket grande por drive no paraleliza con solo el primer nivel: se baja al segundo
+    tops, leaves = [], []
+    for d in drives:
+        if not d.exists():
+            d.mkdir(parents=True, exist_ok=True)
+            continue
+        for entry in d.iterdir():
+            if entry.is_dir() and not entry.is_symlink():
+                tops.append(entry)
+                leaves.extend(entry.iterdir())
+            else:
+                leaves.append(entry)
+    with ThreadPoolExecutor(max_workers=workers or min(32, 4 * (os.cpu_count() or 1))) as pool:
+        list(pool.map(_remove, leaves))
+        list(pool.map(_remove, tops))
+
+def _is_mount(path: Path):
+    return path.exists() and os.path.ismount(path)
+
+def reset_rename(drives, **_):
+    trash = []
+    rest = []
+    stamp = f"{time.time_ns()}"
+    for d in drives:
+        if not d.exists():
+            d.mkdir(parents=True, exist_ok=True)
+            continue
+        if _is_mount(d):
+            rest.append(d)  # un punto de montaje no se puede renombrar
+            continue
+        old = d.with_name(f".{d.name}.trash-{stamp}")
+        os.rename(d, old)
+        d.mkdir()
+        trash.append(str(old))
+    if trash:
+        # Proceso aparte y en su propia sesión: sobrevive a este script y no lo bloquea
+        cmd = ["rm", "-rf", *trash]
+        if shutil.which("ionice"):
+            cmd = ["ionice", "-c", "3", *cmd]
+        if shutil.which("nice"):
+            cmd = ["nice", "-n", "19", *cmd]
+        subprocess.Popen(cmd, start_new_session=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        print(f"Background delete of {len(trash)} renamed drive(s) started")
+    if rest:
+        print(f"{len(rest)} drive(s) are mount points, clearing them in parallel instead")
+        reset_parallel(rest)
+
+def _require_linux_root(strategy):
+    if not sys.platform.startswith("linux") or os.geteuid() != 0:
+        raise RuntimeError(f"--reset {strategy} needs Linux and root")
+
+def _umount(path: Path):
+    if _is_mount(path):
+        subprocess.run(["umount", str(path)], check=True)
+
+def reset_tmpfs(drives, size="8G", **_):
+    _require_linux_root("tmpfs")
+    for d in drives:
+        _umount(d)
+        d.mkdir(parents=True, exist_ok=True)
+        subprocess.run(["mount", "-t", "tmpfs", "-o", f"size={size}", "tmpfs", str(d)], check=True)
+
+def reset_loopback(drives, size="8G", image_dir="/var/tmp/minio-images", fs="xfs", **_):
+    _require_linux_root("loopback")
+    os.makedirs(image_dir, exist_ok=True)
+    mkfs = ["mkfs.xfs", "-f", "-q"] if fs == "xfs" else [f"mkfs.{fs}", "-F", "-q"]
+    for d in drives:
+        _umount(d)
+        image = Path(image_dir) / (d.as_posix().strip("/").replace("/", "_") + ".img")
+        if not image.exists():
+            subprocess.run(["truncate", "-s", size, str(image)], check=True)
+        subprocess.run(mkfs + [str(image)], check=True, stdout=subprocess.DEVNULL)
+        d.mkdir(parents=True, exist_ok=True)
+        subprocess.run(["mount", "-o", "loop,noatime", str(image), str(d)], check=True)
+
+def release_volumes(drives):
+    """Desmonta los drives tmpfs/loopback (el loop device se libera con el umount)."""
+    for d in map(Path, drives):
+        _umount(d)
+
+RESETTERS = {
+    "serial": reset_serial,
+    "parallel": reset_parallel,
+    "rename": reset_rename,
+    "tmpfs": reset_tmpfs,
+    "loopback": reset_loopback,
+}
+
+def reset_volumes(drives, strategy="parallel", dry_run=False, **opts):
+    """Deja los drives vacíos con la estrategia pedida; devuelve los segundos que tardó."""
+    if strategy not in RESETTERS:
+        raise ValueError(f"unknown reset strategy {strategy!r} (choose from {', '.join(STRATEGIES)})")
+    drives = [Path(d) for d in drives]
+    if dry_run:
+        print(f"[dry-run] Would reset {len(drives)} drive(s) with '{strategy}': {', '.join(map(str, drives))}")
+        return 0.0
+    start = time.perf_counter()
+    RESETTERS[strategy](drives, **opts)
+    secs = time.perf_counter() - start
+    print(f"Volume reset ({strategy}): {len(drives)} drive(s) in {secs:.3f}s")
+    return secs
+
+def add_arguments(parser):
+    parser.add_argument("--drives", default=drives_pattern(),
+                        help=f"Drive paths, MinIO ellipsis syntax (default: $MINIO_DRIVES or {DEFAULT_DRIVES})")
+    parser.add_argument("--reset", default=os.environ.get("MINIO_RESET", "parallel"), choices=STRATEGIES,
+                        help="Volume reset strategy (default: $MINIO_RESET or parallel)")
+    parser.add_argument("--volume-size", default=os.environ.get("MINIO_VOLUME_SIZE", "8G"),
+                        help="Size of each tmpfs/loopback drive (default: 8G)")
+    parser.add_argument("--image-dir", default=os.environ.get("MINIO_IMAGE_DIR", "/var/tmp/minio-images"),
+                        help="Where loopback images live (default: /var/tmp/minio-images)")
+
+def reset_from_args(args, dry_run=False):
+    return reset_volumes(expand_drives(args.drives), args.reset, dry_run=dry_run,
+                         size=args.volume_size, image_dir=args.image_dir)
+
+def main():
+    parser = argparse.ArgumentParser(description="Reset MinIO data drives and time it.")
+    add_arguments(parser)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    try:
+        reset_from_args(args, args.dry_run)
+    except (RuntimeError, ValueError, subprocess.CalledProcessError) as e:
+        print(f"Reset failed: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
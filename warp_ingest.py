@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+warp_ingest.py — stream warp's benchmark data (operation log) into histograms and the results store.
+
+warp writes every operation to `<benchdata>.csv.zst` (tab separated: op,
+bytes, endpoint, error, start, first_byte, end, duration_ns, ...). The file
+is read line by line, so memory stays constant no matter how many millions
+of operations it holds:
+
+  * per operation type: duration and time-to-first-byte histograms, bytes, errors
+  * per endpoint (host): duration histogram and bytes
+  * time series: ops and bytes per --segment (default 1s) of wall time
+
+.zst needs the `zstandard` module or the `zstd` binary; .gz and plain .csv
+also work. New warp versions only keep aggregated JSON unless run with --full.
+
+Usage:
+  python3 warp_ingest.py warp-put-2025-08-13[...].csv.zst [--version RELEASE...] [--no-store]
+"""
+
+import argparse
+import calendar
+import gzip
+import io
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from histogram import LatencyHistogram
+from results_store import histogram_row, open_default
+
+MIB = 1024 * 1024
+
+def open_benchdata(path):
+    """Iterador de líneas de texto, descomprimiendo en streaming."""
+    if path.endswith(".zst"):
+        try:
+            import zstandard
+            raw = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+            return io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        except ImportError:
+            pass
+        try:
+            from compression import zstd  # Python 3.14+
+            return zstd.open(path, "rt", encoding="utf-8", newline="")
+        except ImportError:
+            pass
+        proc = subprocess.Popen(["zstd", "-dc", path], stdout=subprocess.PIPE)
+        return io.TextIOWrapper(proc.stdout, encoding="utf-8", newline="")
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+class _Timestamps:
+    """RFC3339 con nanosegundos -> ns epoch; cachea la parte de segundos."""
+    def __init__(self):
+        self._cache = {}
+
+    def ns(self, text):
+        if not text:
+            return None
+        base, tz = text[:19], ""
+        frac = 0
+        rest = text[19:]
+        if rest.startswith("."):
+            i = 1
+            while i < len(rest) and rest[i].isdigit():
+                i += 1
+            digits = rest[1:i]
+            frac = int(digits.ljust(9, "0")[:9]) if digits else 0
+            tz = rest[i:]
+        else:
+            tz = rest
+        key = (base, tz)
+        sec = self._cache.get(key)
+        if sec is None:
+            sec = calendar.timegm(time.strptime(base, "%Y-%m-%dT%H:%M:%S"))
+            if tz and tz not in ("Z", "z"):
+                sign = 1 if tz[0] == "+" else -1
+                hh, mm = tz[1:].split(":")
+                sec -= sign * (int(hh) * 3600 + int(mm) * 60)
+            if len(self._cache) > 100000:
+                self._cache.clear()
+            self._cache[key] = sec
+        return sec * 1_000_000_000 + frac
+
+class OpSummary:
+    def __init__(self):
+        self.duration = LatencyHistogram()
+        self.ttfb = LatencyHistogram()
+        self.bytes = 0
+        self.errors = 0
+        self.first_start = None
+        self.last_end = None
+        self.by_endpoint = defaultdict(LatencyHistogram)
+        self.bytes_by_endpoint = defaultdict(int)
+        self.segments = defaultdict(lambda: [0, 0])  # segundo -> [ops, bytes]
+
+    def wall(self):
+        if self.first_start is None or self.last_end is None:
+            return 0.0
+        return (self.last_end - self.first_start) / 1e9
+
+    def mibps(self):
+        wall = self.wall()
+        return self.bytes / MIB / wall if wall else 0.0
+
+    def segment_rates(self, segment_ns, origin):
+        """[(offset_s, ops/s, MiB/s)] sin el primer y último segmento (parciales)."""
+        keys = sorted(self.segments)
+        secs = segment_ns / 1e9
+        out = [((k * segment_ns - origin) / 1e9, self.segments[k][0] / secs, self.segments[k][1] / MIB / secs)
+               for k in keys]
+        return out[1:-1] if len(out) > 2 else out
+
+def ingest(path, segment=1.0):
+    """Lee el operation log de warp y devuelve {op: OpSummary}."""
+    segment_ns = int(segment * 1e9)
+    ts = _Timestamps()
+    ops = {}
+    cols = None
+    lines = 0
+    with open_benchdata(path) as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            fields = line.rstrip("\r\n").split("\t")
+            if cols is None:
+                cols = {name: i for i, name in enumerate(fields)}
+                missing = {"op", "bytes", "start", "end"} - set(cols)
+                if missing:
+                    raise ValueError(f"{path}: not a warp operation log (missing columns {sorted(missing)})")
+                c_op, c_bytes, c_start, c_end = cols["op"], cols["bytes"], cols["start"], cols["end"]
+                c_fb, c_err = cols.get("first_byte"), cols.get("error")
+                c_ep, c_dur = cols.get("endpoint"), cols.get("duration_ns")
+                continue
+            lines += 1
+            op = fields[c_op]
+            s = ops.get(op)
+            if s is None:
+                s = ops[op] = OpSummary()
+            if c_err is not None and fields[c_err]:
+                s.errors += 1
+                continue
+            start = ts.ns(fields[c_start])
+            end = ts.ns(fields[c_end])
+            dur = int(fields[c_dur]) if c_dur is not None and fields[c_dur] else end - start
+            nbytes = int(fields[c_bytes] or 0)
+            s.duration.record(dur)
+            if c_fb is not None and fields[c_fb]:
+                s.ttfb.record(ts.ns(fields[c_fb]) - start)
+            s.bytes += nbytes
+            if s.first_start is None or start < s.first_start:
+                s.first_start = start
+            if s.last_end is None or end > s.last_end:
+                s.last_end = end
+            if c_ep is not None:
+                ep = fields[c_ep]
+                s.by_endpoint[ep].record(dur)
+                s.bytes_by_endpoint[ep] += nbytes
+            seg = s.segments[end // segment_ns]
+            seg[0] += 1
+            seg[1] += nbytes
+    return ops, lines
+
+def print_summary(ops, segment):
+    for op, s in sorted(ops.items()):
+        wall = s.wall()
+        print(f"\n{op}: {s.duration.count} ops in {wall:.2f}s, {s.duration.count / wall if wall else 0:.1f} ops/s, "
+              f"{s.mibps():.2f} MiB/s, errors {s.errors}")
+        print(f"  duration: {s.duration.format()}")
+        if s.ttfb.count:
+            print(f"  TTFB:     {s.ttfb.format()}")
+        rates = [r[2] for r in s.segment_rates(int(segment * 1e9), s.first_start or 0)]
+        if rates:
+            rates.sort()
+            print(f"  {segment:g}s segments: {len(rates)}, MiB/s min {rates[0]:.1f}, "
+                  f"median {rates[len(rates)//2]:.1f}, max {rates[-1]:.1f}")
+        for ep, hist in sorted(s.by_endpoint.items()):
+            print(f"  {ep}: {s.bytes_by_endpoint[ep] / MIB / wall if wall else 0:.1f} MiB/s, {hist.format()}")
+
+def store_rows(ops, segment):
+    rows = []
+    for op, s in sorted(ops.items()):
+        wall = s.wall()
+        segs = s.segment_rates(int(segment * 1e9), s.first_start or 0)
+        rows.append(histogram_row(op, s.duration, wall, s.mibps(), s.errors, extra={
+            "segment_s": segment,
+            "segments": [[round(t, 3), round(o, 2), round(m, 3)] for t, o, m in segs],
+            "endpoints": {ep: {"mibps": s.bytes_by_endpoint[ep] / MIB / wall if wall else 0,
+                               "p50_ms": h.percentile(50) / 1e6, "p99_ms": h.percentile(99) / 1e6}
+                          for ep, h in s.by_endpoint.items()},
+        }))
+        if s.ttfb.count:
+            rows.append(histogram_row(f"{op}-TTFB", s.ttfb, wall))
+    return rows
+
+def save(ops, segment, version, path, object_size=None, concurrency=None, params=None, extra_rows=()):
+    store = open_default()
+    if store is None:
+        return None
+    try:
+        run_id = store.record_run(
+            store_rows(ops, segment) + list(extra_rows), tool="warp", minio_version=version,
+            mode="warp-" + "-".join(sorted(op.lower() for op in ops)),
+            disk_layout=os.environ.get("DISK_LAYOUT"), object_size=object_size, concurrency=concurrency,
+            session_id=os.environ.get("BENCH_SESSION"),
+            params={"benchdata": os.path.basename(path), **(params or {})},
+        )
+    finally:
+        store.close()
+    return run_id
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest a warp operation log (.csv.zst) into the results store.")
+    parser.add_argument("benchdata", help="warp benchmark data file (.csv.zst, .csv.gz or .csv)")
+    parser.add_argument("--version", default=os.environ.get("MINIO_VERSION", "UNKNOWN"),
+                        help="MinIO version to record (default: $MINIO_VERSION)")
+    parser.add_argument("--segment", type=float, default=1.0, help="Time-series segment, seconds (default: 1)")
+    parser.add_argument("--no-store", action="store_true", help="Only print, do not write the results store")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    ops, lines = ingest(args.benchdata, args.segment)
+    secs = time.perf_counter() - start
+    print(f"Ingested {lines} operations from {args.benchdata} in {secs:.2f}s ({lines / secs if secs else 0:.0f} ops/s)")
+    print_summary(ops, args.segment)
+    if not args.no_store:
+        run_id = save(ops, args.segment, args.version, args.benchdata)
+        if run_id:
+            print(f"\nSaved run {run_id}")
+
+if __name__ == "__main__":
+    sys.exit(main())